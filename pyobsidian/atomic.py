@@ -0,0 +1,146 @@
+"""Crash-safe file writes: write a temporary file, fsync it, rename it over."""
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Set, Union
+
+# Suffix of the temporary files, which are left behind only by a crash
+TEMP_SUFFIX = ".pyobsidian-tmp"
+
+
+def _read_umask() -> int:
+    """Get the process umask, which can only be read by setting it."""
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# Read once, at import, as reading it briefly changes it for every thread
+_UMASK = _read_umask()
+
+
+def fsync_directory(path: Union[str, Path]) -> None:
+    """Flush a directory entry to disk, so renames in it survive a crash.
+
+    Platforms that cannot open directories, such as Windows, are skipped.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class AtomicWriter:
+    """Writes files so that a crash leaves either the old or the new content.
+
+    Each write goes to a temporary file in the target's directory, which is
+    flushed with ``fsync`` and renamed over the target with ``os.replace``.
+    The rename itself is made durable by an ``fsync`` of the directory:
+    immediately by default, or once per directory at :meth:`commit` in
+    group-commit mode, so a bulk edit of thousands of notes in a few
+    folders pays a few directory syncs instead of one per note.
+
+    The writer can be shared by threads.
+    """
+
+    def __init__(self, durable: bool = True, group: bool = False) -> None:
+        """Initialize the writer.
+
+        Args:
+            durable: Flush data to disk; without it, writes are still atomic
+                but may be lost, whole, on power failure.
+            group: Defer directory syncs to :meth:`commit`.
+        """
+        self.durable = durable
+        self.group = group
+        self._pending: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def write(self, path: Union[str, Path], content: str) -> None:
+        """Atomically replace a file's content with UTF-8 text.
+
+        A symlink is followed, so the file it points to is replaced and the
+        link kept. A file with several hard links cannot be renamed over
+        without detaching it from its other names, so it is rewritten in
+        place instead: the links are kept, but a crash can leave it partly
+        written.
+
+        Args:
+            path: The file to write; its permissions are kept if it exists.
+            content: The new content.
+
+        Raises:
+            OSError: If the file could not be written; it is then unchanged,
+                unless it has several hard links.
+        """
+        path = os.path.realpath(path)
+        directory = os.path.dirname(path)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        else:
+            mode = stat.st_mode & 0o777
+            if stat.st_nlink > 1:
+                self._write_in_place(path, content)
+                return
+        fd, temp_path = tempfile.mkstemp(
+            dir=directory, prefix=f".{os.path.basename(path)}.", suffix=TEMP_SUFFIX
+        )
+        try:
+            with open(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+                f.flush()
+                if self.durable:
+                    os.fsync(f.fileno())
+            os.chmod(temp_path, mode)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+        if not self.durable:
+            return
+        if self.group:
+            with self._lock:
+                self._pending.add(directory)
+        else:
+            fsync_directory(directory)
+
+    def _write_in_place(self, path: str, content: str) -> None:
+        """Overwrite a file through its existing inode, keeping its hard links."""
+        with open(path, "r+", encoding="utf-8") as f:
+            f.write(content)
+            f.truncate()
+            f.flush()
+            if self.durable:
+                os.fsync(f.fileno())
+
+    def commit(self) -> int:
+        """Sync the directories of the writes made since the last commit.
+
+        Returns:
+            The number of directories synced.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, set()
+        for directory in sorted(pending):
+            fsync_directory(directory)
+        return len(pending)
+
+    def __enter__(self) -> "AtomicWriter":
+        """Start a group of writes."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Commit the group of writes, including after an error."""
+        self.commit()
@@ -0,0 +1,21 @@
+"""On-disk cache for indexes derived from a vault."""
+from pathlib import Path
+from typing import Union
+
+# Directory, inside the vault, holding pyobsidian's caches and indexes
+CACHE_DIR_NAME = ".pyobsidian"
+
+
+def cache_path(vault_path: Union[str, Path], name: str) -> Path:
+    """Get the path of a cache file, creating the cache directory if needed.
+
+    Args:
+        vault_path: The root of the vault.
+        name: The file name inside the cache directory.
+
+    Returns:
+        The full path of the cache file.
+    """
+    directory = Path(vault_path) / CACHE_DIR_NAME
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / name
@@ -0,0 +1,50 @@
+"""Command to list the notes changed or created in a date range."""
+from datetime import datetime
+from typing import Optional
+
+import click
+
+from ..core import obsidian_context
+from ..ui_handler import display_table
+
+# Accepted formats of --since and --until
+DATE_FORMATS = ["%Y-%m-%d", "%Y-%m-%dT%H:%M", "%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M:%S"]
+
+
+def _format_time(timestamp: Optional[float]) -> str:
+    """Format a timestamp for display, or a dash if unknown."""
+    if timestamp is None:
+        return "-"
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M")
+
+
+@click.command()
+@click.option('--since', type=click.DateTime(DATE_FORMATS), required=True,
+              help='Start of the range (YYYY-MM-DD[THH:MM])')
+@click.option('--until', type=click.DateTime(DATE_FORMATS), default=None,
+              help='End of the range, exclusive (default: now)')
+@click.option('--created', is_flag=True,
+              help='List notes created in the range instead of modified')
+def changed(since: datetime, until: Optional[datetime], created: bool) -> None:
+    """List the notes modified (or created) since a date, newest first."""
+    timeline = obsidian_context.vault.get_timeline()
+    start, end = since.timestamp(), until.timestamp() if until else None
+    if created:
+        entries = timeline.created_between(start, end)
+    else:
+        entries = timeline.modified_between(start, end)
+
+    rows = [
+        [path, _format_time(timeline.modified(path)), _format_time(timeline.created(path))]
+        for _, path in reversed(entries)
+    ]
+    what = "created" if created else "modified"
+    display_table(
+        rows, ["Note", "Modified", "Created"],
+        title=f"{len(rows)} notes {what} since {since:%Y-%m-%d %H:%M}",
+    )
+
+
+def register_command(cli: click.Group) -> None:
+    """Register the changed command to the CLI group."""
+    cli.add_command(changed)
@@ -1,9 +1,10 @@
 """Command for analyzing daily writing statistics."""
-from typing import Dict, List
+from typing import Dict
 from datetime import datetime, timedelta
 import click
 
 from ..core import obsidian_context
+from ..history import record_history
 from ..ui_handler import display_table
 
 @click.command()
@@ -14,7 +15,13 @@ def daily_stats(days: int) -> None:
     _display_stats(stats)
 
 def _collect_daily_stats(days: int) -> Dict[str, Dict[str, int]]:
-    """Collect writing statistics for the specified number of days."""
+    """Collect writing statistics for the specified number of days.
+
+    The vault records a snapshot in its word count history each time it
+    loads its notes; one more is taken first, so the statistics are true
+    per-day deltas between snapshots rather than the current size of
+    recently modified notes.
+    """
     stats = {}
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days)
@@ -24,41 +31,38 @@ def _collect_daily_stats(days: int) -> Dict[str, Dict[str, int]]:
     while current_date <= end_date:
         date_str = current_date.strftime("%Y-%m-%d")
         stats[date_str] = {
-            "words": 0,
-            "notes": 0,
-            "links": 0
+            "added": 0,
+            "removed": 0,
+            "created": 0,
+            "modified": 0,
+            "deleted": 0,
         }
         current_date += timedelta(days=1)
 
-    # Collect stats for each note
-    for note in obsidian_context.vault.get_all_notes():
-        # Get note's modification date from metadata
-        try:
-            mod_date = datetime.fromtimestamp(note.path.stat().st_mtime)
-            date_str = mod_date.strftime("%Y-%m-%d")
-            if date_str in stats:  # Only count if within our date range
-                stats[date_str]["words"] += note.word_count
-                stats[date_str]["notes"] += 1
-                stats[date_str]["links"] += len(note.links)
-        except (OSError, AttributeError):
-            # Skip if we can't get modification date
-            continue
+    # Only the history records of the range are visited, found by bisection
+    history = record_history(obsidian_context.vault)
+    start = datetime.combine(start_date.date(), datetime.min.time()).timestamp()
+    for date_str, day_stats in history.daily_stats(start).items():
+        if date_str in stats:
+            stats[date_str] = day_stats
 
     return stats
 
 def _display_stats(stats: Dict[str, Dict[str, int]]) -> None:
     """Display the collected statistics."""
-    headers = ["Date", "Words Written", "Notes Modified", "Links Created"]
+    headers = ["Date", "Words Written", "Removed", "Notes Modified", "Created", "Deleted"]
     rows = []
     for date, day_stats in sorted(stats.items(), reverse=True):
         rows.append([
             date,
-            str(day_stats["words"]),
-            str(day_stats["notes"]),
-            str(day_stats["links"])
+            str(day_stats["added"]),
+            str(day_stats["removed"]),
+            str(day_stats["modified"]),
+            str(day_stats["created"]),
+            str(day_stats["deleted"]),
         ])
     display_table(rows, headers, "Daily Writing Statistics")
 
 def register_command(cli: click.Group) -> None:
     """Register the daily-stats command."""
-    cli.add_command(daily_stats, name="daily-stats") 
\ No newline at end of file
+    cli.add_command(daily_stats, name="daily-stats") 
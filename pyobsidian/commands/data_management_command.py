@@ -6,6 +6,7 @@ from datetime import datetime
 import click
 
 from ..core import obsidian_context
+from ..metadata import vault_aggregates, verify_aggregates
 from ..ui_handler import display_success, display_error
 from .base_command import BaseCommand
 
@@ -18,26 +19,29 @@ def create_backup() -> None:
 
 
 @click.command(cls=BaseCommand, name="vault-stats")
-def vault_stats() -> None:
+@click.option("--verify", is_flag=True, help="Recount every note and check the cached aggregates")
+def vault_stats(verify: bool) -> None:
     """Display vault statistics."""
     vault = obsidian_context.vault
-    notes = vault.get_all_notes()
-    
-    total_notes = len(notes)
-    total_words = sum(note.word_count for note in notes)
-    total_links = sum(len(note.links) for note in notes)
-    
-    all_tags = set()
-    for note in notes:
-        all_tags.update(note.tags)
-    total_tags = len(all_tags)
+    # Aggregates are maintained in the metadata index; a warm cache answers
+    # without counting any note
+    if verify:
+        aggregates, mismatches = verify_aggregates(vault)
+    else:
+        aggregates, mismatches = vault_aggregates(vault), []
+    totals = aggregates["totals"]
     
     # Use display_success for each line to ensure proper output handling
     display_success("Vault Statistics:")
-    display_success(f"Total notes: {total_notes}")
-    display_success(f"Total words: {total_words}")
-    display_success(f"Total links: {total_links}")
-    display_success(f"Total tags: {total_tags}")
+    display_success(f"Total notes: {totals['notes']}")
+    display_success(f"Total words: {totals['words']}")
+    display_success(f"Total links: {totals['links']}")
+    display_success(f"Total tags: {len(aggregates['tags'])}")
+    if verify:
+        if mismatches:
+            display_error(f"Cached aggregates were out of date and have been rebuilt: {', '.join(mismatches)}")
+        else:
+            display_success("Cached aggregates verified.")
 
 
 @click.command(cls=BaseCommand, name="export-notes")
@@ -0,0 +1,74 @@
+"""Command to find duplicate and near-duplicate notes."""
+from typing import List
+
+import click
+
+from ..cache import cache_path
+from ..core import Vault, obsidian_context
+from ..hashindex import HASH_INDEX_NAME, HashIndex
+from ..minhash import MinHasher, SignatureCache, find_duplicates
+from ..ui_handler import display_duplicate_clusters, display_error
+
+# Cache file, inside the cache directory, holding the MinHash signatures
+SIGNATURES_CACHE_NAME = "minhash.npz"
+
+
+def _exact_duplicates(vault: Vault, attachments: bool) -> List[List[str]]:
+    """Group notes, and optionally attachments, with identical content.
+
+    Note digests come from the vault, which computes them while loading;
+    attachment digests are kept in .pyobsidian/hashes.json and only
+    recomputed for files whose mtime or size changed.
+    """
+    known = vault.get_file_digests()
+    paths = list(known) + (vault.get_attachments() if attachments else [])
+    path = cache_path(vault.vault_path, HASH_INDEX_NAME)
+    index = HashIndex.load(path)
+    index.refresh(vault.vault_path, paths, known)
+    if attachments:
+        # Only a full refresh keeps the attachment digests worth saving
+        index.save(path)
+    return index.duplicates()
+
+
+@click.command()
+@click.option('--exact', is_flag=True, help='Only report files with identical content.')
+@click.option('--attachments/--no-attachments', default=True,
+              help='With --exact, also compare attachments.')
+@click.option('--threshold', default=0.8, help='Minimum estimated Jaccard similarity (0-1).')
+@click.option('--shingle-size', default=5, help='Number of words per shingle.')
+def duplicates(exact: bool, attachments: bool, threshold: float, shingle_size: int) -> None:
+    """Find clusters of duplicate or near-duplicate notes.
+
+    Notes are compared by the word shingles they share, estimated with
+    MinHash signatures that are cached by content hash in .pyobsidian, so
+    only new or edited notes are hashed again on later runs. With --exact,
+    files are instead grouped by content digest.
+    """
+    vault = obsidian_context.vault
+    if exact:
+        groups = _exact_duplicates(vault, attachments)
+        display_duplicate_clusters([[(path, 1.0) for path in group] for group in groups])
+        return
+
+    if not 0 < threshold <= 1:
+        display_error("Threshold must be between 0 and 1.")
+        return
+    if shingle_size < 1:
+        display_error("Shingle size must be at least 1.")
+        return
+
+    cache = SignatureCache(cache_path(vault.vault_path, SIGNATURES_CACHE_NAME), MinHasher(), shingle_size)
+
+    notes = vault.get_all_notes()
+    # The vault hashed the notes while loading them
+    digests = {path: digest for path, (_, _, digest) in vault.get_file_digests().items()}
+    clusters = find_duplicates(notes, threshold, cache, digests)
+    cache.save(keep=notes, digests=digests)
+    display_duplicate_clusters(clusters)
+
+
+def register_command(cli: click.Group) -> None:
+    """Register the duplicates command, and its dupes alias, to the CLI group."""
+    cli.add_command(duplicates)
+    cli.add_command(duplicates, name="dupes")
@@ -1,32 +1,45 @@
 """Empty folders command for PyObsidian."""
-import os
-from typing import List
+import re
+from pathlib import Path
+from typing import List, Pattern, Tuple
 
 import click
 
-from ..core import obsidian_context
-from ..ui_handler import display_folders
+from ..core import Config, ConfigError, obsidian_context
+from ..ui_handler import display_error, display_folders
 from .base_command import BaseCommand
 
+# Config file, at the root of the vault, whose excluded_files are skipped
+CONFIG_NAME = "config.yaml"
 
-def get_empty_folders(vault_path: str) -> List[str]:
-    """Get all empty folders in the vault."""
-    empty_folders = []
-    for root, dirs, files in os.walk(vault_path):
-        # Filter out hidden directories
-        dirs[:] = [d for d in dirs if not d.startswith(".")]
-        
-        # Check if directory is empty (no files and no subdirectories)
-        if not dirs and not files:
-            empty_folders.append(os.path.relpath(root, vault_path))
-    
-    return empty_folders
+
+def _config_patterns(vault_path: Path) -> List[Pattern]:
+    """Get the ``excluded_files`` patterns of the vault's config, if it has one."""
+    try:
+        return list(Config(str(Path(vault_path) / CONFIG_NAME)).excluded_patterns)
+    except ConfigError:
+        # No config file in the vault, or not a valid one
+        return []
 
 
 @click.command(cls=BaseCommand)
-def empty_folders() -> None:
+@click.option("--exclude", multiple=True, help="Regex of paths to ignore, on top of excluded_files")
+@click.option("--recursive", is_flag=True,
+              help="Also list folders holding only empty folders or ignored files")
+def empty_folders(exclude: Tuple[str, ...], recursive: bool) -> None:
     """List all empty folders in the vault."""
-    folders = obsidian_context.vault.get_empty_folders()
+    vault = obsidian_context.vault
+    try:
+        excluded = _config_patterns(vault.vault_path)
+    except re.error as e:
+        display_error(f"Invalid excluded_files pattern in {CONFIG_NAME}: {e}")
+        return
+    try:
+        excluded += [re.compile(pattern) for pattern in exclude]
+    except re.error as e:
+        display_error(f"Invalid --exclude pattern: {e}")
+        return
+    folders = vault.get_empty_folders(excluded=excluded, recursive=recursive)
     display_folders(folders)
 
 
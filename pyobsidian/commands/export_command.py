@@ -1,23 +1,57 @@
 """Export command for PyObsidian."""
+from typing import Optional
+
 import click
 
 from ..core import obsidian_context
 from ..ui_handler import display_success, display_error
 from .base_command import BaseCommand
 
+# Shown when the PDF dependencies cannot be imported
+PDF_INSTALL_HINT = (
+    "Install the PDF dependencies with `pip install weasyprint pypdf`; "
+    "WeasyPrint also needs the Pango and Cairo libraries, see its installation guide."
+)
+
 
 @click.command(cls=BaseCommand, name="export")
-@click.option("--format", type=click.Choice(["markdown", "html"]), default="markdown", help="Export format")
-@click.option("--output", default="export", help="Output directory")
-def export_notes(format: str, output: str) -> None:
+@click.option("--format", type=click.Choice(["markdown", "html", "pdf", "sqlite"]), default="markdown", help="Export format")
+@click.option("--output", default=None, help="Output directory, or database file with --format sqlite")
+@click.option("--force", is_flag=True, help="Render every note again, not only the changed ones")
+@click.option("--jobs", type=int, default=None, help="Worker processes for large vaults (default: CPU count)")
+@click.option("--book", is_flag=True, help="With --format pdf, combine all notes into a single book.pdf")
+def export_notes(format: str, output: Optional[str], force: bool, jobs: Optional[int], book: bool) -> None:
     """Export notes to the specified format."""
+    output = output or ("vault.db" if format == "sqlite" else "export")
     try:
         if format == "markdown":
             obsidian_context.vault.export_to_markdown(output)
             display_success(f"Notes exported to markdown in {output}")
+        elif format == "pdf":
+            try:
+                # Imported here to report missing PDF dependencies cleanly
+                from .. import pdf  # noqa: F401
+            except (ImportError, OSError) as e:  # WeasyPrint raises OSError without its system libraries
+                display_error(f"PDF export is unavailable: {e}. {PDF_INSTALL_HINT}")
+                return
+            counts = obsidian_context.vault.export_to_pdf(output, book=book, jobs=jobs, force=force)
+            if book:
+                what = "an unchanged book" if counts["unchanged"] else "a book"
+            else:
+                what = f"{counts['files']} files ({counts['unchanged']} unchanged, {counts['removed']} removed)"
+            display_success(f"{counts['notes']} notes exported to PDF as {what} in {output}")
+        elif format == "sqlite":
+            counts = obsidian_context.vault.export_to_sqlite(output, force=force)
+            display_success(
+                f"Notes exported to {output}: {counts['added']} added, {counts['updated']} updated, "
+                f"{counts['deleted']} deleted, {counts['unchanged']} unchanged"
+            )
         else:
-            obsidian_context.vault.export_to_html(output)
-            display_success(f"Notes exported to HTML in {output}")
+            counts = obsidian_context.vault.export_to_html(output, force=force, jobs=jobs)
+            display_success(
+                f"Notes exported to HTML in {output}: {counts['rendered']} rendered, "
+                f"{counts['unchanged']} unchanged, {counts['removed']} removed"
+            )
     except Exception as e:
         display_error(f"Failed to export notes: {str(e)}")
 
@@ -0,0 +1,58 @@
+"""Command to report note statistics per folder."""
+from typing import Optional
+
+import click
+
+from ..core import obsidian_context
+from ..folders import find_orphans, folder_report
+from ..metadata import load_metadata_index
+from ..ui_handler import display_error, display_folder_report
+
+# Columns --sort accepts, largest first except for the folder path
+SORT_KEYS = ["path", "notes", "bytes", "words", "links", "orphans", "modified"]
+
+
+@click.command()
+@click.option('--depth', type=int, default=1, show_default=True,
+              help='Deepest folder level to show; deeper folders roll up into it')
+@click.option('--sort', 'sort_key', type=click.Choice(SORT_KEYS), default='path',
+              show_default=True, help='Order of the folders')
+@click.option('--limit', type=int, default=None, help='Maximum number of folders to show')
+@click.option('--histogram', is_flag=True, help='Add a word count histogram per folder')
+def folders(depth: int, sort_key: str, limit: Optional[int], histogram: bool) -> None:
+    """Show notes, size, words, links, orphans and activity per folder."""
+    if depth < 0:
+        display_error("--depth must be at least 0")
+        return
+    vault = obsidian_context.vault
+    notes = vault.get_all_notes()
+
+    # Word and link counts come from the metadata index, sizes from the
+    # stats taken while loading, so no note is counted or encoded again
+    index = load_metadata_index(vault)
+    stats = vault.get_file_digests()
+    timeline = vault.get_timeline()
+    orphans = find_orphans({note.path: [link.target for link in note.links] for note in notes})
+
+    paths = [note.path.replace("\\", "/") for note in notes]
+    rows = folder_report(
+        paths,
+        [stats[note.path][1] if note.path in stats else len(note.content.encode("utf-8")) for note in notes],
+        [index.entries[note.path][1] for note in notes],
+        [index.entries[note.path][2] for note in notes],
+        [note.path in orphans for note in notes],
+        [timeline.modified(note.path) for note in notes],
+        max_depth=depth,
+    )
+    if sort_key == "modified":
+        rows.sort(key=lambda row: row["modified"] or 0, reverse=True)
+    elif sort_key != "path":
+        rows.sort(key=lambda row: row[sort_key], reverse=True)
+    display_folder_report(
+        rows[:limit] if limit else rows, title=f"Folders (depth {depth})", histogram=histogram
+    )
+
+
+def register_command(cli: click.Group) -> None:
+    """Register the folders command to the CLI group."""
+    cli.add_command(folders)
@@ -0,0 +1,59 @@
+"""Commands to inspect, resume or roll back an interrupted bulk edit."""
+from datetime import datetime
+
+import click
+
+from ..core import obsidian_context
+from ..ui_handler import display_success, display_table
+
+
+@click.group()
+def journal() -> None:
+    """Inspect, resume or roll back an interrupted bulk edit."""
+    pass
+
+
+@journal.command()
+def status() -> None:
+    """Show the interrupted edit, if any, and the state of its notes."""
+    vault = obsidian_context.vault
+    pending = vault.get_journal()
+    if pending is None:
+        display_success("No interrupted edit.")
+        return
+    started = datetime.fromtimestamp(pending.started).strftime("%Y-%m-%d %H:%M")
+    if not pending.complete:
+        display_success(f"Edit '{pending.name}' of {started} was interrupted before any note was written.")
+        return
+    states = pending.states(vault.vault_path)
+    rows = [[entry.path, state] for state, entries in states.items() for entry in entries]
+    display_table(
+        sorted(rows), ["Note", "State"],
+        title=f"Edit '{pending.name}' of {started}: {len(pending.applied)} of {len(pending.entries)} recorded as applied",
+    )
+
+
+@journal.command()
+def resume() -> None:
+    """Finish the interrupted edit."""
+    counts = obsidian_context.vault.resume_journal()
+    display_success(
+        f"Applied {counts['applied']} edits, {counts['done']} were already applied, "
+        f"{counts['elided']} already held their new content, "
+        f"{counts['conflicts']} notes changed since were left alone."
+    )
+
+
+@journal.command()
+def rollback() -> None:
+    """Undo the applied part of the interrupted edit."""
+    counts = obsidian_context.vault.rollback_journal()
+    display_success(
+        f"Reverted {counts['reverted']} edits, {counts['pending']} were not applied, "
+        f"{counts['conflicts']} notes changed since were left alone."
+    )
+
+
+def register_command(cli: click.Group) -> None:
+    """Register the journal commands to the CLI group."""
+    cli.add_command(journal)
@@ -1,8 +1,11 @@
 import re
+from datetime import datetime
 import click
-from typing import List, Optional
+from typing import List, Optional, TextIO
 from ..core import obsidian_context
-from ..ui_handler import display_table, display_success
+from ..metadata import vault_aggregates
+from ..records import FIELDS, export_records, parse_fields
+from ..ui_handler import display_table, display_success, display_error
 
 def _remove_tag(note_path: str, tag: str) -> None:
     """Remove a tag from a note."""
@@ -71,20 +74,23 @@ def remove_tag(note_path: str, tag: str) -> None:
         display_success(f"Note {note_path} not found.")
         return
         
+    before = note.content
     note.remove_tag(tag)
+    if note.content == before:
+        display_success(f"Note {note_path} has no tag #{tag}.")
+        return
     obsidian_context.vault.update_note(note_path, note.content)
     display_success(f"Removed tag #{tag} from {note_path}")
 
 @manage.command()
 def visualization() -> None:
     """Generate a visualization of the vault."""
-    notes = obsidian_context.vault.get_all_notes()
-    
-    # Collect statistics
-    total_notes = len(notes)
-    total_words = sum(note.word_count for note in notes)
-    total_links = sum(len(note.links) for note in notes)
-    total_tags = sum(len(note.tags) for note in notes)
+    # Collect statistics from the metadata index
+    aggregates = vault_aggregates(obsidian_context.vault)
+    total_notes = aggregates["totals"]["notes"]
+    total_words = aggregates["totals"]["words"]
+    total_links = aggregates["totals"]["links"]
+    total_tags = sum(aggregates["tags"].values())
     
     # Display statistics
     rows = [
@@ -97,54 +103,56 @@ def visualization() -> None:
     display_table(rows, ["Metric", "Value"], title="Vault Statistics")
 
 @manage.command()
-def data() -> None:
+@click.option('--sort', 'sort_key', type=click.Choice(['size', 'modified']), default='size',
+              help='Show the largest or the most recently modified notes first')
+@click.option('--limit', type=int, default=None, help='Maximum number of notes to show')
+def data(sort_key: str, limit: Optional[int]) -> None:
     """Show data management information."""
-    notes = obsidian_context.vault.get_all_notes()
-    
-    # Collect statistics about note sizes
-    sizes = []
-    for note in notes:
-        size = len(note.content.encode('utf-8'))
-        sizes.append([note.path, str(size), str(note.word_count)])
-    
-    # Sort by size
-    sizes.sort(key=lambda x: int(x[1]), reverse=True)
-    
-    display_table(sizes, ["Note", "Size (bytes)", "Words"], title="Note Sizes")
+    # Sizes and dates come from one walk of the vault; no note is read
+    table = obsidian_context.vault.get_stat_table()
+    rows = table.largest(limit) if sort_key == 'size' else table.newest(limit)
+    sizes = [[table.paths[i], int(table.sizes[i]), int(table.mtimes[i]) / 1e9] for i in rows]
+
+    rows = [
+        [path, str(size), datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M") if mtime else "-"]
+        for path, size, mtime in sizes[:limit]
+    ]
+    display_table(rows, ["Note", "Size (bytes)", "Modified"], title="Note Sizes")
 
 @manage.command()
-@click.argument('format', type=click.Choice(['json', 'markdown']))
-def export(format: str) -> None:
-    """Export vault data in various formats."""
+@click.argument('format', type=click.Choice(['json', 'ndjson', 'csv', 'markdown']))
+@click.option('--fields', default=None,
+              help=f"Comma-separated fields to export (default: all of {', '.join(FIELDS)})")
+@click.option('--output', '-o', type=click.File('w', encoding='utf-8', lazy=True), default='-',
+              help='File to write to (default: standard output)')
+def export(format: str, fields: Optional[str], output: TextIO) -> None:
+    """Export vault data in various formats.
+
+    Records are written one note at a time, so output starts at once and
+    memory does not grow with the vault; only the requested fields are
+    computed.
+    """
     notes = obsidian_context.vault.get_all_notes()
-    
-    if format == 'json':
-        import json
-        data = {
-            'notes': [
-                {
-                    'path': note.path,
-                    'title': note.title,
-                    'tags': note.tags,
-                    'links': [{'target': link.target, 'alias': link.alias} for link in note.links],
-                    'word_count': note.word_count
-                }
-                for note in notes
-            ]
-        }
-        click.echo(json.dumps(data, indent=2))
-    else:  # markdown
+
+    if format != 'markdown':
+        try:
+            selected = parse_fields(fields)
+        except ValueError as e:
+            display_error(str(e))
+            return
+        export_records(notes, output, format, selected)
+    else:
         for note in notes:
-            click.echo(f"# {note.title}")
-            click.echo(f"Path: {note.path}")
+            click.echo(f"# {note.title}", file=output)
+            click.echo(f"Path: {note.path}", file=output)
             if note.tags:
-                click.echo(f"Tags: {', '.join(note.tags)}")
+                click.echo(f"Tags: {', '.join(note.tags)}", file=output)
             if note.links:
-                click.echo("Links:")
+                click.echo("Links:", file=output)
                 for link in note.links:
-                    click.echo(f"- {link.target}")
-            click.echo(f"Word count: {note.word_count}")
-            click.echo("---")
+                    click.echo(f"- {link.target}", file=output)
+            click.echo(f"Word count: {note.word_count}", file=output)
+            click.echo("---", file=output)
 
 def register_commands(cli: click.Group) -> None:
     """Register management commands to the CLI group."""
@@ -0,0 +1,40 @@
+"""Command to publish notes as a static site."""
+from typing import Optional
+
+import click
+
+from ..core import obsidian_context
+from ..query import QueryError, select_notes
+from ..ui_handler import display_error, display_success
+
+
+@click.command()
+@click.option('--output', default='site', help='Output directory')
+@click.option('--where', default=None, help='Query selecting the notes to publish (default: all notes).')
+@click.option('--force', is_flag=True, help='Render every page and rebuild the search index.')
+@click.option('--jobs', type=int, default=None, help='Worker processes for large vaults (default: CPU count)')
+def publish(output: str, where: Optional[str], force: bool, jobs: Optional[int]) -> None:
+    """Publish notes as a static site with backlinks, tag pages and search.
+
+    Rebuilding into the same directory only renders the pages whose note,
+    links or backlinks changed.
+    """
+    vault = obsidian_context.vault
+    try:
+        notes = select_notes(vault.get_all_notes(), where) if where else None
+        counts = vault.publish_site(output, notes, force=force, jobs=jobs)
+    except QueryError as e:
+        display_error(str(e))
+        return
+    except Exception as e:
+        display_error(f"Failed to publish notes: {str(e)}")
+        return
+    display_success(
+        f"Site published in {output}: {counts['rendered']} pages rendered, {counts['unchanged']} unchanged, "
+        f"{counts['removed']} removed, {counts['indexed']} notes indexed"
+    )
+
+
+def register_command(cli: click.Group) -> None:
+    """Register the publish command to the CLI group."""
+    cli.add_command(publish)
@@ -0,0 +1,91 @@
+"""Command to find the related notes of one note or of the whole vault."""
+from typing import Dict, List, Optional, Tuple
+
+import click
+
+from ..cache import cache_path
+from ..core import Vault, obsidian_context
+from ..frontmatter import set_frontmatter_field
+from ..related import load_related, related_notes, save_related
+from ..tfidf import CACHE_NAME, load_tfidf_index
+from ..ui_handler import display_error, display_success, display_table
+
+# Cache file, inside the cache directory, holding the all-pairs results
+RELATED_CACHE_NAME = "related.json"
+
+
+def _link_text(path: str) -> str:
+    """Get the wikilink pointing to a note path."""
+    return f"[[{path[:-3] if path.endswith('.md') else path}]]"
+
+
+def _write_frontmatter(vault: Vault, related: Dict[str, List[Tuple[str, float]]]) -> int:
+    """Store related notes in the ``related`` frontmatter field of each note.
+
+    Returns:
+        The number of notes whose content changed.
+    """
+    changed = []
+    for path, pairs in related.items():
+        note = vault.get_note(path)
+        if note is None:
+            continue
+        content = set_frontmatter_field(
+            note.content, "related", [_link_text(p) for p, _ in pairs] or None
+        )
+        if content != note.content:
+            note.update_content(content)
+            changed.append(note)
+    return vault.save_notes(changed) if changed else 0
+
+
+@click.command()
+@click.argument('note_path', required=False)
+@click.option('--all', 'all_notes', is_flag=True, help='Compute related notes for every note.')
+@click.option('--limit', default=10, help='Number of related notes per note.')
+@click.option('--min-similarity', default=0.1, help='Minimum similarity threshold.')
+@click.option('--jobs', type=int, default=None, help='Worker processes for --all (default: CPU count).')
+@click.option('--frontmatter', is_flag=True, help='With --all, write results to each note\'s frontmatter.')
+def related(
+    note_path: Optional[str], all_notes: bool, limit: int, min_similarity: float,
+    jobs: Optional[int], frontmatter: bool
+) -> None:
+    """Show the notes related to a note, or precompute them for the vault.
+
+    With --all, the top related notes of every note are computed in one
+    batch and cached in .pyobsidian/related.json, where later lookups of a
+    single note read them from.
+    """
+    vault = obsidian_context.vault
+    if not note_path and not all_notes:
+        display_error("Provide a note path or use --all.")
+        return
+
+    generation = vault.generation
+    cache_file = cache_path(vault.vault_path, RELATED_CACHE_NAME)
+
+    if not all_notes:
+        cached = load_related(cache_file, generation)
+        if cached is not None and note_path in cached:
+            pairs = [(p, s) for p, s in cached[note_path] if s >= min_similarity][:limit]
+        else:
+            pairs = load_tfidf_index(vault).similar(note_path, limit, min_similarity)
+        rows = [[path, f"{similarity * 100:.1f}%"] for path, similarity in pairs]
+        display_table(rows, ["Path", "Similarity"], title=f"Notes related to {note_path}")
+        return
+
+    index = load_tfidf_index(vault)
+    directory = cache_path(vault.vault_path, CACHE_NAME)
+    results = related_notes(index, limit, min_similarity, directory=directory, jobs=jobs)
+
+    message = f"Computed related notes for {len(results)} notes"
+    if frontmatter:
+        message += f"; updated the frontmatter of {_write_frontmatter(vault, results)} notes"
+    # Read the generation again, as writing the frontmatter changed it
+    save_related(cache_file, results, vault.generation)
+    display_success(message)
+
+
+def register_command(cli: click.Group) -> None:
+    """Register the related command to the CLI group."""
+    cli.add_command(related)
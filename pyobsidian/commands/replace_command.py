@@ -0,0 +1,77 @@
+"""Command to find and replace a regular expression across the vault."""
+import re
+from typing import Optional
+
+import click
+
+from ..core import obsidian_context
+from ..journal import JournalError
+from ..query import QueryError, select_notes
+from ..replace import find_replacements, unified_diff
+from ..ui_handler import display_diff, display_error, display_success
+
+
+@click.command()
+@click.argument('pattern')
+@click.argument('repl')
+@click.option('--where', default=None, help='Query selecting the notes to edit (default: all notes).')
+@click.option('--dry-run', is_flag=True, help='Show the diffs without writing anything.')
+@click.option('--ignore-case', '-i', is_flag=True, help='Match case-insensitively.')
+@click.option('--skip-code', is_flag=True, help='Leave fenced code blocks and inline code alone.')
+@click.option('--skip-frontmatter', is_flag=True, help='Leave the frontmatter block alone.')
+@click.option('--quiet', '-q', is_flag=True, help='Do not show the diffs.')
+@click.option('--jobs', type=int, default=None, help='Worker processes for large vaults (default: CPU count)')
+def replace(pattern: str, repl: str, where: Optional[str], dry_run: bool, ignore_case: bool,
+            skip_code: bool, skip_frontmatter: bool, quiet: bool, jobs: Optional[int]) -> None:
+    """Replace PATTERN, a regular expression, with REPL in every note.
+
+    REPL may refer to groups as in Python's re.sub, e.g. \\1 or \\g<name>.
+    Diffs are shown as notes are processed; the notes are then written
+    together, atomically and through the vault's journal.
+    """
+    vault = obsidian_context.vault
+    flags = re.IGNORECASE if ignore_case else 0
+    try:
+        re.compile(pattern, flags)
+        notes = select_notes(vault.get_all_notes(), where) if where else vault.get_all_notes()
+    except re.error as e:
+        display_error(f"Invalid pattern: {e}")
+        return
+    except QueryError as e:
+        display_error(str(e))
+        return
+
+    contents = {note.path: note.content for note in notes}
+    changes = {}
+    matches = 0
+    try:
+        for path, content, count in find_replacements(
+            notes, pattern, repl, flags, skip_code, skip_frontmatter, jobs
+        ):
+            if not quiet:
+                display_diff(unified_diff(path, contents[path], content))
+            changes[path] = content
+            matches += count
+    except re.error as e:
+        display_error(f"Invalid replacement: {e}")
+        return
+
+    if dry_run or not changes:
+        verb = "Would replace" if dry_run else "Replaced"
+        display_success(f"{verb} {matches} matches in {len(changes)} notes")
+        return
+    try:
+        with vault.batch(journal=f"replace {pattern!r} {repl!r}") as batch:
+            for path, content in changes.items():
+                vault.update_note(path, content)
+    except JournalError as e:
+        display_error(str(e))
+        return
+    display_success(
+        f"Replaced {matches} matches in {len(changes)} notes, {batch.elided} already up to date on disk"
+    )
+
+
+def register_command(cli: click.Group) -> None:
+    """Register the replace command to the CLI group."""
+    cli.add_command(replace)
@@ -0,0 +1,248 @@
+"""Command to suggest tags for notes from their terms and links."""
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import click
+import numpy as np
+
+from ..core import Note, obsidian_context
+from ..link import build_link_index, resolve_link
+from ..sparse import CSRMatrix
+from ..text import tokenize
+from ..ui_handler import display_error, display_tag_suggestions
+
+# Relative weight of each source of evidence when ranking candidate tags
+TERM_WEIGHT = 1.0
+LINK_WEIGHT = 0.6
+COOCCURRENCE_WEIGHT = 0.3
+
+
+class TagModel:
+    """Tag statistics of a vault, computed in a single pass over its notes.
+
+    Attributes:
+        tags: Tag names, indexed by tag id.
+        tag_counts: Number of notes carrying each tag.
+        cooccurrence: Tag x tag matrix with the share of notes of the column
+            tag that also carry the row tag. The diagonal is left empty.
+        term_tags: Term x tag matrix whose columns are the unit-length
+            TF-IDF profiles of the notes carrying each tag.
+    """
+
+    def __init__(
+        self,
+        tags: List[str],
+        tag_counts: np.ndarray,
+        vocabulary: Dict[str, int],
+        idf: np.ndarray,
+        cooccurrence: CSRMatrix,
+        term_tags: CSRMatrix,
+        note_terms: Dict[str, Tuple[np.ndarray, np.ndarray]],
+        note_tags: Dict[str, np.ndarray],
+        neighbors: Dict[str, Set[str]],
+    ) -> None:
+        """Initialize the model from precomputed matrices."""
+        self.tags = tags
+        self.tag_counts = tag_counts
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.cooccurrence = cooccurrence
+        self.term_tags = term_tags
+        self.note_terms = note_terms
+        self.note_tags = note_tags
+        self.neighbors = neighbors
+
+    def score(self, path: str) -> np.ndarray:
+        """Score every tag as a candidate for a note.
+
+        Args:
+            path: The path of a note the model was built from.
+
+        Returns:
+            One score per tag id.
+        """
+        scores = np.zeros(len(self.tags), dtype=np.float64)
+        if not self.tags:
+            return scores
+
+        term_ids, counts = self.note_terms.get(path, (np.zeros(0, np.int32), np.zeros(0)))
+        if len(term_ids):
+            weights = counts * self.idf[term_ids]
+            weights /= np.linalg.norm(weights)
+            scores += TERM_WEIGHT * self.term_tags.vecmat(term_ids, weights)
+
+        neighbors = self.neighbors.get(path, set())
+        if neighbors:
+            linked = [self.note_tags[n] for n in neighbors if n in self.note_tags]
+            if linked:
+                link_counts = np.bincount(
+                    np.concatenate(linked), minlength=len(self.tags)
+                )
+                scores += LINK_WEIGHT * link_counts / len(neighbors)
+
+        scores += COOCCURRENCE_WEIGHT * self.cooccurrence.dot(scores)
+        return scores
+
+    def suggest(
+        self, path: str, limit: int = 5, min_score: float = 0.0
+    ) -> List[Tuple[str, float]]:
+        """Rank the tags a note does not have yet.
+
+        Args:
+            path: The path of a note the model was built from.
+            limit: Maximum number of suggestions.
+            min_score: Minimum score of a suggestion.
+
+        Returns:
+            ``(tag, score)`` pairs, best first.
+        """
+        scores = self.score(path)
+        own = self.note_tags.get(path)
+        if own is not None:
+            scores[own] = 0.0
+        candidates = np.flatnonzero(scores > max(min_score, 0.0))
+        order = candidates[np.lexsort((candidates, -scores[candidates]))][:limit]
+        return [(self.tags[i], float(scores[i])) for i in order]
+
+
+def build_tag_model(notes: Iterable[Note], tag_counts: Dict[str, int]) -> TagModel:
+    """Build the tag co-occurrence and tag-term association matrices.
+
+    Every note is tokenized once; the per-note term and tag ids collected on
+    the way are turned into coordinate arrays and summed into CSR matrices.
+
+    Args:
+        notes: The notes of the vault.
+        tag_counts: Tag usage counts, as returned by ``Vault.get_all_tags``.
+
+    Returns:
+        The model used to rank tag suggestions.
+    """
+    tags = sorted(tag_counts)
+    tag_ids = {tag: i for i, tag in enumerate(tags)}
+    vocabulary: Dict[str, int] = {}
+
+    note_terms: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+    note_tags: Dict[str, np.ndarray] = {}
+    note_links: Dict[str, List[str]] = {}
+    pair_tags, pair_terms, pair_counts = [], [], []
+    cooc_rows, cooc_cols = [], []
+
+    for note in notes:
+        counts = Counter(tokenize(note.content))
+        term_ids = np.fromiter(
+            (vocabulary.setdefault(term, len(vocabulary)) for term in counts),
+            dtype=np.int32,
+            count=len(counts),
+        )
+        term_counts = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        note_terms[note.path] = (term_ids, term_counts)
+        note_links[note.path] = [link.target for link in note.links]
+
+        ids = np.array(
+            sorted(tag_ids[tag] for tag in set(note.tags) if tag in tag_ids),
+            dtype=np.int32,
+        )
+        if not len(ids):
+            continue
+        note_tags[note.path] = ids
+
+        # Every (tag, term) pair of the note adds the term count to the tag
+        pair_tags.append(np.repeat(ids, len(term_ids)))
+        pair_terms.append(np.tile(term_ids, len(ids)))
+        pair_counts.append(np.tile(term_counts, len(ids)))
+
+        # Every ordered pair of distinct tags co-occurs once
+        if len(ids) > 1:
+            rows = np.repeat(ids, len(ids))
+            cols = np.tile(ids, len(ids))
+            distinct = rows != cols
+            cooc_rows.append(rows[distinct])
+            cooc_cols.append(cols[distinct])
+
+    n_notes = max(len(note_terms), 1)
+    document_frequency = np.zeros(len(vocabulary), dtype=np.float64)
+    for term_ids, _ in note_terms.values():
+        document_frequency[term_ids] += 1
+    idf = np.log((1 + n_notes) / (1 + document_frequency)) + 1.0
+
+    associations = CSRMatrix.from_coo(
+        _concat(pair_tags),
+        _concat(pair_terms),
+        _concat(pair_counts),
+        (len(tags), len(vocabulary)),
+    )
+    term_tags = associations.scale_columns(idf).normalize_rows().transpose()
+
+    counts_array = np.array([tag_counts[tag] for tag in tags], dtype=np.float64)
+    cooccurrence = CSRMatrix.from_coo(
+        _concat(cooc_rows),
+        _concat(cooc_cols),
+        np.ones(sum(len(r) for r in cooc_rows)),
+        (len(tags), len(tags)),
+    )
+    cooccurrence = cooccurrence.scale_columns(1.0 / np.maximum(counts_array, 1.0))
+
+    return TagModel(
+        tags,
+        counts_array,
+        vocabulary,
+        idf,
+        cooccurrence,
+        term_tags,
+        note_terms,
+        note_tags,
+        _link_neighbors(note_links),
+    )
+
+
+def _concat(arrays: List[np.ndarray]) -> np.ndarray:
+    """Concatenate arrays, returning an empty array for an empty list."""
+    return np.concatenate(arrays) if arrays else np.zeros(0)
+
+
+def _link_neighbors(note_links: Dict[str, List[str]]) -> Dict[str, Set[str]]:
+    """Collect the notes each note links to or is linked from."""
+    index = build_link_index(note_links)
+    neighbors: Dict[str, Set[str]] = {path: set() for path in note_links}
+    for source, targets in note_links.items():
+        for target in targets:
+            path = resolve_link(target, index)
+            if path is not None and path != source:
+                neighbors[source].add(path)
+                neighbors[path].add(source)
+    return neighbors
+
+
+@click.command(name="suggest-tags")
+@click.argument("note_path", required=False)
+@click.option("--untagged", is_flag=True, help="Suggest tags for every note without tags.")
+@click.option("--limit", default=5, help="Maximum number of tags to suggest per note.")
+@click.option("--min-score", default=0.05, help="Minimum score of a suggested tag.")
+def suggest_tags(
+    note_path: Optional[str], untagged: bool, limit: int, min_score: float
+) -> None:
+    """Suggest tags for a note, or for every untagged note."""
+    vault = obsidian_context.vault
+    if not note_path and not untagged:
+        display_error("Provide a note path or use --untagged.")
+        return
+
+    notes = vault.get_all_notes()
+    if note_path and all(note.path != note_path for note in notes):
+        display_error(f"Note {note_path} not found.")
+        return
+
+    model = build_tag_model(notes, vault.get_all_tags())
+    if untagged:
+        paths = sorted(note.path for note in notes if note.path not in model.note_tags)
+    else:
+        paths = [note_path]
+
+    suggestions = {path: model.suggest(path, limit, min_score) for path in paths}
+    display_tag_suggestions(suggestions)
+
+
+def register_command(cli: click.Group) -> None:
+    """Register the suggest-tags command to the CLI group."""
+    cli.add_command(suggest_tags)
@@ -1,8 +1,12 @@
 """Tag management command."""
 import click
 import re
+from typing import Callable, List, Tuple
 
-from ..core import obsidian_context
+from ..core import Note, obsidian_context
+from ..journal import JournalError
+from ..query import QueryError, select_notes
+from ..tagging import insert_tag, strip_tag
 from ..ui_handler import display_success, display_error
 from .base_command import BaseCommand
 
@@ -87,8 +91,80 @@ def replace_tag(old_tag: str, new_tag: str, note_path: str) -> None:
         display_error(str(e))
 
 
+def _edit_selection(where: str, edit: Callable[[Note], None], name: str) -> Tuple[List[Note], int]:
+    """Apply an in-memory edit to every note matching a query.
+
+    The vault is loaded once, every selected note is edited in memory, and
+    only the notes whose content actually changed are written back, in a
+    single batched write pass recorded in the vault's journal, so that an
+    interrupted pass can be resumed or rolled back.
+
+    Args:
+        where: The query selecting the notes.
+        edit: The edit to apply to each note.
+        name: A description of the edit, for the journal.
+
+    Returns:
+        The notes that were modified, and the number of them whose file
+        already held the new content and was not rewritten.
+    """
+    vault = obsidian_context.vault
+    changed = []
+    for note in select_notes(vault.get_all_notes(), where):
+        before = note.content
+        edit(note)
+        if note.content != before:
+            changed.append(note)
+    with vault.batch(journal=name) as batch:
+        vault.save_notes(changed)
+    return changed, batch.elided
+
+
+@click.group(name="tag")
+def tag() -> None:
+    """Add or remove a tag on every note matching a query."""
+    pass
+
+
+@tag.command(name="add")
+@click.argument('tag_name')
+@click.option('--where', required=True, help='Query selecting the notes to tag.')
+def add_tag_where(tag_name: str, where: str) -> None:
+    """Add a tag to every note matching a query."""
+    tag_name = tag_name.lstrip('#')
+    try:
+        changed, elided = _edit_selection(
+            where,
+            lambda note: note.update_content(insert_tag(note.content, tag_name)),
+            f"tag add #{tag_name} --where {where}",
+        )
+    except (QueryError, JournalError) as e:
+        display_error(str(e))
+        return
+    display_success(f"Added tag #{tag_name} to {len(changed)} notes, {elided} already up to date on disk")
+
+
+@tag.command(name="remove")
+@click.argument('tag_name')
+@click.option('--where', required=True, help='Query selecting the notes to untag.')
+def remove_tag_where(tag_name: str, where: str) -> None:
+    """Remove a tag from every note matching a query."""
+    tag_name = tag_name.lstrip('#')
+    try:
+        changed, elided = _edit_selection(
+            where,
+            lambda note: note.update_content(strip_tag(note.content, tag_name)),
+            f"tag remove #{tag_name} --where {where}",
+        )
+    except (QueryError, JournalError) as e:
+        display_error(str(e))
+        return
+    display_success(f"Removed tag #{tag_name} from {len(changed)} notes, {elided} already up to date on disk")
+
+
 def register_command(cli: click.Group) -> None:
     """Register tag management commands to the CLI group."""
     cli.add_command(add_tag, name="add-tag")
     cli.add_command(remove_tag, name="remove-tag")
     cli.add_command(replace_tag, name="replace-tag")
+    cli.add_command(tag)
@@ -0,0 +1,32 @@
+"""Command to cluster notes into topics."""
+import click
+
+from ..core import obsidian_context
+from ..topics import DIMENSIONS, load_topic_model
+from ..ui_handler import display_error, display_topics
+
+
+@click.command()
+@click.option('--clusters', default=10, help='Number of topics.')
+@click.option('--dims', default=DIMENSIONS, help='Dimensions of the latent topic space.')
+@click.option('--terms', default=8, help='Top terms shown per topic.')
+@click.option('--notes', default=5, help='Member notes shown per topic.')
+@click.option('--seed', default=0, help='Seed of the clustering.')
+def topics(clusters: int, dims: int, terms: int, notes: int, seed: int) -> None:
+    """Cluster notes into topics in a latent semantic space.
+
+    The TF-IDF matrix is reduced with a truncated SVD and the notes are
+    grouped with mini-batch k-means. The reduced embedding is cached in
+    .pyobsidian, where find-similar --semantic reuses it.
+    """
+    if clusters < 1 or dims < 1:
+        display_error("Clusters and dimensions must be at least 1.")
+        return
+
+    model = load_topic_model(obsidian_context.vault, dims)
+    display_topics(model.topics(clusters, terms, seed), notes)
+
+
+def register_command(cli: click.Group) -> None:
+    """Register the topics command to the CLI group."""
+    cli.add_command(topics)
@@ -1,60 +1,58 @@
 """Command to generate a word cloud from notes."""
-from typing import Dict, List
+from typing import Optional
 import click
-import re
-from collections import Counter
 
+from ..cache import cache_path
 from ..core import obsidian_context
-from ..ui_handler import display_table, display_error
-
-# Common English stop words to filter out
-STOP_WORDS = {
-    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'he',
-    'in', 'is', 'it', 'its', 'of', 'on', 'that', 'the', 'to', 'was', 'were',
-    'will', 'with', 'this', 'but', 'they', 'have', 'had', 'what', 'when',
-    'where', 'who', 'which', 'why', 'how'
-}
+from ..sketch import SpaceSaving
+from ..wordfreq import WORD_COUNTS_CACHE_NAME, WordCounts, approximate_word_counts, count_words
+from ..ui_handler import display_table, display_error, display_heavy_hitters
 
 @click.command()
 @click.option('--min-length', default=3, help='Minimum word length')
 @click.option('--min-count', default=2, help='Minimum word count')
 @click.option('--max-words', default=5, help='Maximum number of words to display')
-def word_cloud(min_length: int, min_count: int, max_words: int) -> None:
+@click.option('--jobs', type=int, default=None, help='Worker processes for large vaults (default: CPU count)')
+@click.option('--approx', is_flag=True, help='Count in fixed memory, with bounded error')
+@click.option('--epsilon', type=float, default=1e-4, show_default=True,
+              help='With --approx, maximum error as a fraction of all words')
+def word_cloud(min_length: int, min_count: int, max_words: int, jobs: Optional[int],
+               approx: bool, epsilon: float) -> None:
     """Generate a word cloud from notes."""
-    notes = obsidian_context.vault.get_all_notes()
-    word_counts = Counter()
-    
-    for note in notes:
-        # Get content and remove code blocks
-        content = note._remove_code_blocks(note._content)
-        
-        # Remove links and tags
-        content = re.sub(r'\[\[.*?\]\]', '', content)
-        content = re.sub(r'#\w+', '', content)
-        
-        # Remove headers
-        content = re.sub(r'^#+\s.*$', '', content, flags=re.MULTILINE)
-        
-        # Remove formatting and punctuation
-        content = re.sub(r'[*_`]', '', content)
-        content = re.sub(r'[^\w\s]', ' ', content)
-        
-        # Normalize whitespace
-        content = re.sub(r'\s+', ' ', content)
-        content = content.strip()
-        
-        # Count words
-        words = content.lower().split()
-        word_counts.update(w for w in words if len(w) >= min_length and w not in STOP_WORDS)
-        
-        # Include words from tags (without the #)
-        for tag in note.tags:
-            tag = tag.lower()
-            if len(tag) >= min_length and tag not in STOP_WORDS:
-                word_counts[tag] += 1
+    vault = obsidian_context.vault
+
+    if approx:
+        try:
+            summary = SpaceSaving.for_error(epsilon)
+        except ValueError as e:
+            display_error(str(e))
+            return
+        # Notes are streamed into the sketch, so the vault is never held in memory
+        summary = approximate_word_counts(vault.iter_notes(), summary.capacity, min_length, jobs)
+        top = [item for item in summary.top(max_words) if item[1] >= min_count]
+        if not top:
+            display_table([], ["Word", "Count", "At Least", "Share"], title="No words found meeting the criteria")
+            return
+        display_heavy_hitters(
+            top, summary.total, summary.max_error,
+            title=f"Approximate Word Cloud (min length: {min_length}, min count: {min_count}, "
+                  f"tracking {summary.capacity} words)",
+        )
+        return
+
+    # Per-note counts are cached by content hash, so only changed notes are
+    # read; the vault hashed the notes while loading them
+    path = cache_path(vault.vault_path, WORD_COUNTS_CACHE_NAME)
+    cache = WordCounts.load(path)
+    digests = {note_path: digest for note_path, (_, _, digest) in vault.get_file_digests().items()}
+    word_counts = count_words(vault.get_all_notes(), cache, jobs, digests)
+    cache.save(path)
     
     # Filter and sort words
-    filtered_words = {word: count for word, count in word_counts.items() if count >= min_count}
+    filtered_words = {
+        word: count for word, count in word_counts.items()
+        if count >= min_count and len(word) >= min_length
+    }
     sorted_words = sorted(filtered_words.items(), key=lambda x: (-x[1], x[0]))[:max_words]
     
     # If no words found, display message
@@ -62,8 +60,8 @@ def word_cloud(min_length: int, min_count: int, max_words: int) -> None:
         display_table([], ["Word", "Count", "Percentage"], title="No words found meeting the criteria")
         return
     
-    # Calculate total for percentages
-    total_count = sum(count for _, count in sorted_words)
+    # Percentages are of all words long enough, like the shares of --approx
+    total_count = sum(count for word, count in word_counts.items() if len(word) >= min_length)
     
     # Prepare rows for display
     rows = []
@@ -76,4 +74,4 @@ def word_cloud(min_length: int, min_count: int, max_words: int) -> None:
 
 def register_command(cli: click.Group) -> None:
     """Register the word-cloud command to the CLI group."""
-    cli.add_command(word_cloud, name="word-cloud") 
\ No newline at end of file
+    cli.add_command(word_cloud, name="word-cloud") 
@@ -1,14 +1,28 @@
 from __future__ import annotations
 
+import hashlib
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Pattern, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Pattern, Tuple, Union
 
 import yaml
 import time
 
+from .atomic import AtomicWriter
+from .cache import cache_path
+from .folders import find_empty_folders
+from .hashindex import bytes_digest
+from .history import record_history
+from .journal import (
+    APPLIED, CONFLICT, JOURNAL_NAME, PENDING, Journal, JournalEntry, JournalError, plan_entry,
+)
+from .stattable import StatTable
+from .timeline import Timeline, note_dates
+
 
 class ObsidianCliError(Exception):
     """Base exception for ObsidianCLI errors."""
@@ -118,8 +132,9 @@ class Note:
         """
         self._path = path
         self._content = content
-        self._title = self._extract_title()
-        self._links = self._extract_links()
+        # Parsed on first use, so repeated edits do not re-parse each time
+        self._title: Optional[str] = None
+        self._links: Optional[List[Link]] = None
 
     def _extract_title(self) -> str:
         """Extract the title from the note content."""
@@ -221,7 +236,7 @@ class Note:
             if '```' in target or '`' in target:
                 continue
             
-            links.append(Link(target=target, alias=alias))
+            links.append(Link(self._path, target=target, alias=alias))
         
         return links
 
@@ -238,11 +253,15 @@ class Note:
     @property
     def title(self) -> str:
         """Get the title of the note."""
+        if self._title is None:
+            self._title = self._extract_title()
         return self._title
 
     @property
     def links(self) -> List[Link]:
         """Get the links in the note."""
+        if self._links is None:
+            self._links = self._extract_links()
         return self._links
 
     @property
@@ -257,8 +276,8 @@ class Note:
             content: The new content for the note.
         """
         self._content = content
-        self._title = self._extract_title()
-        self._links = self._extract_links()
+        self._title = None
+        self._links = None
 
     def add_tag(self, tag: str) -> None:
         """Add a tag to the note.
@@ -318,9 +337,31 @@ class Note:
         return f"Note(path={self.path}, title={self.title})"
 
 
+class Batch:
+    """The pending note writes of a :meth:`Vault.batch` block."""
+
+    def __init__(self) -> None:
+        """Initialize an empty batch."""
+        # Latest content of each dirty note, by path; None for a deletion
+        self.dirty: Dict[str, Optional[str]] = {}
+        # Number of edits made in the block, and of notes written at its
+        # end or skipped because their content had not changed
+        self.edits = 0
+        self.written = 0
+        self.elided = 0
+
+    def add(self, path: str, content: Optional[str]) -> None:
+        """Record an edit, replacing any earlier edit of the same note."""
+        self.dirty[path] = content
+        self.edits += 1
+
+
 class Vault:
     """A vault containing notes."""
 
+    # Journaled edits are applied, and recorded as applied, in groups of this size
+    JOURNAL_CHUNK = 500
+
     def __init__(self, vault_path: Union[str, Path]) -> None:
         """Initialize a vault.
 
@@ -328,34 +369,179 @@ class Vault:
             vault_path: Path to the vault directory.
         """
         self.vault_path = Path(vault_path)
-        self.notes: Dict[str, Note] = {}
-        self._load_notes()
-
-    def _get_all_files(self) -> List[str]:
-        """Get all markdown files in the vault."""
-        if not self.vault_path.exists():
-            return []
-
-        markdown_files = []
-        for file_path in self.vault_path.rglob("*.md"):
-            try:
-                rel_path = file_path.relative_to(self.vault_path)
-                markdown_files.append(str(rel_path))
-            except ValueError:
-                continue
-        return markdown_files
+        # Notes are read on first use, so stat-only queries never read them
+        self._notes: Optional[Dict[str, Note]] = None
+        # (mtime_ns, size) of each markdown file, readable as a note or not,
+        # as of the last load or write
+        self._file_stats: Dict[str, Tuple[int, int]] = {}
+        # Content digest of each note file, see hashindex.bytes_digest
+        self._digests: Dict[str, str] = {}
+        # Modification and creation dates of the notes, see timeline.Timeline
+        self._timeline = Timeline()
+        self._generation: Optional[str] = None
+        self._stat_table: Optional[StatTable] = None
+        # All note writes go through this writer, see atomic.AtomicWriter
+        self._writer = AtomicWriter()
+        # Pending writes of the current batch, see batch()
+        self._batch: Optional[Batch] = None
+        # Writes skipped because the note already had the content
+        self.elided_writes = 0
+
+    @property
+    def notes(self) -> Dict[str, Note]:
+        """Get the notes of the vault by path, loading them on first use."""
+        self._ensure_loaded()
+        return self._notes
+
+    def _ensure_loaded(self) -> None:
+        """Load the notes, and with them their stats, digests and dates."""
+        if self._notes is None:
+            self._load_notes()
 
     def _load_notes(self) -> None:
         """Load all notes from the vault."""
-        self.notes.clear()
-        for file_path in self._get_all_files():
-            try:
-                note_path = self.vault_path / file_path
-                if note_path.exists():
-                    content = note_path.read_text()
-                    self.notes[file_path] = Note(file_path, content)
-            except (OSError, UnicodeDecodeError):
+        self._notes = {}
+        self._file_stats.clear()
+        self._digests.clear()
+        self._generation = None
+        dates = {}
+        table = self.get_stat_table()
+        for file_path, mtime_ns, size in zip(table.paths, table.mtimes.tolist(), table.sizes.tolist()):
+            read = self.read_note(file_path)
+            if read is None:
+                # Not a note, but still part of the generation, as it is
+                # before the notes are read
+                self._file_stats[file_path] = (mtime_ns, size)
                 continue
+            note, stat, digest = read
+            self._notes[file_path] = note
+            self._file_stats[file_path] = (stat.st_mtime_ns, stat.st_size)
+            self._digests[file_path] = digest
+            dates[file_path] = note_dates(note.content, stat)
+        self._timeline = Timeline.from_dates(dates)
+        try:
+            record_history(self, loaded=True)
+        except OSError:
+            # A read-only vault is still usable, without writing statistics
+            pass
+
+    def read_note(self, path: str) -> Optional[Tuple[Note, os.stat_result, str]]:
+        """Read a note file from disk, without loading the vault.
+
+        Args:
+            path: The path of the note.
+
+        Returns:
+            The note, decoded like ``read_text`` with universal newlines,
+            its file stats and its content digest; None if the file cannot
+            be read or is not UTF-8.
+        """
+        try:
+            note_path = self.vault_path / path
+            stat = note_path.stat()
+            data = note_path.read_bytes()
+            content = data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+        except (OSError, UnicodeDecodeError):
+            return None
+        return Note(path, content), stat, bytes_digest(data)
+
+    def _record_stat(self, path: str, content: Optional[str] = None) -> None:
+        """Refresh the recorded file stats of a note after it was written.
+
+        Args:
+            path: The path of the note.
+            content: The content just written, used to update its digest.
+        """
+        self._ensure_loaded()
+        self._stat_table = None
+        try:
+            stat = (self.vault_path / path).stat()
+            self._file_stats[path] = (stat.st_mtime_ns, stat.st_size)
+            note = self.notes.get(path)
+            if note is not None:
+                self._timeline.add(path, note_dates(note.content, stat))
+        except OSError:
+            self._file_stats.pop(path, None)
+            self._timeline.remove(path)
+            content = None
+        if content is None:
+            self._digests.pop(path, None)
+        else:
+            self._digests[path] = bytes_digest(content.encode("utf-8"))
+        self._generation = None
+
+    @property
+    def generation(self) -> str:
+        """Get a fingerprint of the vault that changes whenever a note does.
+
+        Caches derived from the notes store the generation they were built
+        from and are rebuilt when it no longer matches.
+        """
+        if self._generation is None:
+            if self._notes is None:
+                # Before the notes are read, the stat table tells the same
+                table = self.get_stat_table()
+                stats = {
+                    path: (int(mtime_ns), int(size))
+                    for path, mtime_ns, size in zip(table.paths, table.mtimes, table.sizes)
+                }
+            else:
+                stats = self._file_stats
+            digest = hashlib.blake2b(digest_size=16)
+            for path in sorted(stats):
+                mtime_ns, size = stats[path]
+                digest.update(f"{path}\0{mtime_ns}\0{size}\n".encode("utf-8"))
+            self._generation = digest.hexdigest()
+        return self._generation
+
+    def get_digest(self, path: str) -> Optional[str]:
+        """Get the content digest of a note file, as of its last load or write."""
+        self._ensure_loaded()
+        return self._digests.get(path)
+
+    def get_file_digests(self) -> Dict[str, Tuple[int, int, str]]:
+        """Get ``(mtime_ns, size, digest)`` of every note file.
+
+        The result can seed a :class:`~pyobsidian.hashindex.HashIndex`
+        without reading the notes again.
+        """
+        self._ensure_loaded()
+        return {
+            path: (*self._file_stats[path], digest)
+            for path, digest in self._digests.items()
+            if path in self._file_stats
+        }
+
+    def get_timeline(self) -> Timeline:
+        """Get the modification and creation dates of the notes."""
+        self._ensure_loaded()
+        return self._timeline
+
+    def get_stat_table(self, refresh: bool = False) -> StatTable:
+        """Get the size, mtime and inode of every note file, without reading any.
+
+        Args:
+            refresh: Walk the vault again instead of reusing the last table.
+        """
+        if self._stat_table is None or refresh:
+            self._stat_table = StatTable.scan(self.vault_path)
+        return self._stat_table
+
+    def get_attachments(self) -> List[str]:
+        """Get the paths of all non-markdown files in the vault.
+
+        Hidden directories such as ``.obsidian``, ``.pyobsidian`` and
+        ``.git`` are skipped.
+        """
+        attachments = []
+        for root, dirs, files in os.walk(self.vault_path):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            rel_root = os.path.relpath(root, self.vault_path)
+            for name in files:
+                if name.startswith(".") or name.endswith(".md"):
+                    continue
+                attachments.append(os.path.normpath(os.path.join(rel_root, name)))
+        return sorted(attachments)
 
     def get_note(self, path: str) -> Optional[Note]:
         """Get a note by its path."""
@@ -385,6 +571,21 @@ class Vault:
         """Get all notes in the vault."""
         return list(self.notes.values())
 
+    def iter_notes(self) -> Iterator[Note]:
+        """Iterate over all notes in the vault, without loading it.
+
+        Notes already loaded are reused; otherwise each file is read when
+        it is reached and not kept, so a single pass over a large vault
+        holds one note at a time.
+        """
+        if self._notes is not None:
+            yield from list(self._notes.values())
+            return
+        for path in self.get_stat_table().paths:
+            read = self.read_note(path)
+            if read is not None:
+                yield read[0]
+
     def create_note(self, title: str, content: str = "") -> Note:
         """Create a new note in the vault.
 
@@ -399,24 +600,320 @@ class Vault:
         path = str(self.vault_path / filename)
         if not content:
             content = f"# {title}\n"
-        with open(path, "w") as f:
-            f.write(content)
         note = Note(filename, content)
         self.notes[filename] = note
+        if self._batch is not None:
+            self._batch.add(filename, content)
+            return note
+        self._writer.write(path, content)
+        self._record_stat(filename, content)
         return note
 
-    def update_note(self, path: str, content: str) -> None:
+    def update_note(self, path: str, content: str) -> bool:
         """Update a note's content.
 
+        The file is left untouched, mtime included, if it already holds
+        the content, so no-op edits do not trigger sync re-uploads.
+
         Args:
             path: The path to the note.
             content: The new content for the note.
+
+        Returns:
+            Whether the note was written, or marked dirty in a batch.
         """
-        note_path = self.vault_path / path
-        with open(note_path, "w") as f:
-            f.write(content)
         if path in self.notes:
             self.notes[path].update_content(content)
+        if self._batch is not None:
+            self._batch.add(path, content)
+            return True
+        if self._is_unchanged(path, content):
+            self.elided_writes += 1
+            return False
+        self._writer.write(self.vault_path / path, content)
+        self._record_stat(path, content)
+        return True
+
+    def _is_unchanged(self, path: str, content: str) -> bool:
+        """Check whether a note file already holds some content.
+
+        The content digest is compared to the one recorded when the file
+        was last loaded or written, and the file stats to the recorded
+        ones, so a file changed behind the vault's back is still written.
+        """
+        self._ensure_loaded()
+        digest = self._digests.get(path)
+        if digest is None or digest != bytes_digest(content.encode("utf-8")):
+            return False
+        try:
+            stat = (self.vault_path / path).stat()
+        except OSError:
+            return False
+        return self._file_stats.get(path) == (stat.st_mtime_ns, stat.st_size)
+
+    @contextmanager
+    def group_commit(self) -> Iterator[AtomicWriter]:
+        """Group the durability syncs of the note writes made in a block.
+
+        Every write stays atomic, but the directories they touched are
+        synced once each when the block ends instead of after each write.
+
+        Yields:
+            The writer used for the block.
+        """
+        if self._writer.group:
+            yield self._writer
+            return
+        previous = self._writer
+        self._writer = AtomicWriter(durable=previous.durable, group=True)
+        try:
+            yield self._writer
+        finally:
+            writer, self._writer = self._writer, previous
+            writer.commit()
+
+    def save_notes(
+        self, notes: Iterable[Note], max_workers: Optional[int] = None, journal: Optional[str] = None
+    ) -> int:
+        """Write the in-memory content of several notes to disk.
+
+        Notes edited in memory (e.g. with ``Note.add_tag``) are flushed in a
+        single pass, with the writes spread over a thread pool and their
+        directory syncs grouped, see :meth:`group_commit`. Inside a
+        :meth:`batch`, the notes are only marked dirty.
+
+        Args:
+            notes: The notes to write.
+            max_workers: Maximum number of writer threads.
+            journal: Write through a journal, see :meth:`batch`.
+
+        Returns:
+            The number of notes written, or marked dirty; notes already
+            holding their content on disk are skipped.
+        """
+        notes = list(notes)
+        if journal is not None and self._batch is None:
+            with self.batch(max_workers, journal=journal) as batch:
+                self.save_notes(notes)
+            return batch.written
+        if self._batch is not None:
+            for note in notes:
+                self._batch.add(note.path, note.content)
+            return len(notes)
+        return self._write_notes({note.path: note.content for note in notes}, max_workers)
+
+    def _write_notes(self, contents: Dict[str, Optional[str]], max_workers: Optional[int] = None) -> int:
+        """Write notes concurrently, then record their new stats.
+
+        Args:
+            contents: The content to write, by note path; None deletes the
+                note file.
+            max_workers: Maximum number of writer threads.
+
+        Returns:
+            The number of notes written or deleted; writes of unchanged
+            content are skipped and counted in ``elided_writes``.
+        """
+        changed = {
+            path: content for path, content in contents.items()
+            if content is None or not self._is_unchanged(path, content)
+        }
+        self.elided_writes += len(contents) - len(changed)
+        contents = changed
+        done: List[str] = []
+
+        def write(path: str) -> None:
+            content = contents[path]
+            if content is None:
+                try:
+                    (self.vault_path / path).unlink()
+                except FileNotFoundError:
+                    pass
+            else:
+                self._writer.write(self.vault_path / path, content)
+            done.append(path)
+
+        try:
+            with self.group_commit(), ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # Consume the iterator so write errors are raised here
+                list(executor.map(write, contents))
+        except BaseException:
+            # The notes that were not written must not keep content that
+            # never reached disk
+            self._reload_notes([path for path in contents if path not in done])
+            raise
+        finally:
+            # Also after a failed write, so the stats match what reached disk
+            for path in done:
+                self._record_stat(path, contents[path])
+        return len(done)
+
+    @contextmanager
+    def batch(self, max_workers: Optional[int] = None, journal: Optional[str] = None) -> Iterator[Batch]:
+        """Defer and coalesce the note writes made in a block.
+
+        Inside the block, :meth:`create_note`, :meth:`update_note`,
+        :meth:`save_notes` and :meth:`delete_note` only change the notes in
+        memory and mark them dirty; however often a note is edited, it is
+        written once when the block ends, all dirty notes concurrently and
+        with grouped syncs, and the stats, digests and dates of the vault
+        are updated then.
+
+        If the block raises, nothing is written and the dirty notes are
+        read back from disk; if a write fails, the notes not written yet are.
+        A batch opened inside another one joins it.
+
+        Args:
+            max_workers: Maximum number of writer threads.
+            journal: Describe the edit in a write-ahead journal, so that if
+                the writes are interrupted they can be resumed with
+                :meth:`resume_journal` or undone with :meth:`rollback_journal`.
+
+        Yields:
+            The batch, whose ``edits``, ``written`` and ``elided`` counts can
+            be read once the block ends.
+
+        Raises:
+            JournalError: If a journal is requested while the journal of an
+                interrupted edit is pending.
+        """
+        if self._batch is not None:
+            yield self._batch
+            return
+        if journal is not None and self.get_journal() is not None:
+            raise JournalError("An interrupted edit is pending; resume or roll it back first")
+        self._ensure_loaded()
+        batch = self._batch = Batch()
+        try:
+            yield batch
+        except BaseException:
+            self._batch = None
+            self._reload_notes(list(batch.dirty))
+            raise
+        self._batch = None
+        elided = self.elided_writes
+        if not batch.dirty:
+            batch.written = 0
+        elif journal is None:
+            batch.written = self._write_notes(batch.dirty, max_workers)
+        else:
+            entries = [plan_entry(self.vault_path, path, content) for path, content in batch.dirty.items()]
+            batch.written = self._apply_journal(
+                Journal.begin(self._journal_path(), journal, entries), entries, max_workers
+            )
+        batch.elided = self.elided_writes - elided
+
+    def _journal_path(self) -> Path:
+        """Get the path of the journal of interrupted edits."""
+        return cache_path(self.vault_path, JOURNAL_NAME)
+
+    def get_journal(self) -> Optional[Journal]:
+        """Get the journal of an interrupted edit, None if there is none."""
+        return Journal.load(self._journal_path())
+
+    def _apply_journal(
+        self,
+        journal: Journal,
+        entries: List[JournalEntry],
+        max_workers: Optional[int] = None,
+        rollback: bool = False,
+    ) -> int:
+        """Write journaled edits in groups, recording each group as applied.
+
+        The journal is removed once every group is written.
+
+        Args:
+            journal: The journal of the edit.
+            entries: The edits to write.
+            max_workers: Maximum number of writer threads.
+            rollback: Restore the contents before the edits instead.
+
+        Returns:
+            The number of notes written.
+        """
+        written = 0
+        for start in range(0, len(entries), self.JOURNAL_CHUNK):
+            chunk = entries[start:start + self.JOURNAL_CHUNK]
+            contents = {
+                entry.path: entry.original if rollback else entry.content for entry in chunk
+            }
+            for path, content in contents.items():
+                self._set_note(path, content)
+            written += self._write_notes(contents, max_workers)
+            if not rollback:
+                journal.mark_applied([entry.path for entry in chunk])
+        journal.finish()
+        return written
+
+    def _set_note(self, path: str, content: Optional[str]) -> None:
+        """Set the in-memory content of a note, creating or dropping it."""
+        self._ensure_loaded()
+        if content is None:
+            self.notes.pop(path, None)
+            return
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+        if path in self.notes:
+            self.notes[path].update_content(content)
+        else:
+            self.notes[path] = Note(path, content)
+
+    def resume_journal(self, max_workers: Optional[int] = None) -> Dict[str, int]:
+        """Finish an interrupted journaled edit.
+
+        Only the edits whose file still holds the planned before content
+        are written; edits found applied are skipped, and files changed by
+        something else since are left alone.
+
+        Returns:
+            The number of edits ``applied`` now, found ``done`` already,
+            ``elided`` because the file already held the planned content and
+            skipped as ``conflicts``; all zero if there was no journal.
+        """
+        journal = self.get_journal()
+        if journal is None or not journal.complete:
+            if journal is not None:
+                # Interrupted while planning: nothing was written
+                journal.finish()
+            return {"applied": 0, "done": 0, "elided": 0, "conflicts": 0}
+        states = journal.states(self.vault_path)
+        elided = self.elided_writes
+        applied = self._apply_journal(journal, states[PENDING], max_workers)
+        return {
+            "applied": applied,
+            "done": len(states[APPLIED]),
+            "elided": self.elided_writes - elided,
+            "conflicts": len(states[CONFLICT]),
+        }
+
+    def rollback_journal(self, max_workers: Optional[int] = None) -> Dict[str, int]:
+        """Undo an interrupted journaled edit.
+
+        The edits found applied are reverted to the content recorded before
+        them; files changed by something else since are left alone.
+
+        Returns:
+            The number of edits ``reverted``, found not ``applied`` and
+            skipped as ``conflicts``; all zero if there was no journal.
+        """
+        journal = self.get_journal()
+        if journal is None or not journal.complete:
+            if journal is not None:
+                journal.finish()
+            return {"reverted": 0, "pending": 0, "conflicts": 0}
+        states = journal.states(self.vault_path)
+        reverted = self._apply_journal(journal, states[APPLIED], max_workers, rollback=True)
+        return {"reverted": reverted, "pending": len(states[PENDING]), "conflicts": len(states[CONFLICT])}
+
+    def _reload_notes(self, paths: List[str]) -> None:
+        """Read notes back from disk, dropping those that do not exist."""
+        for path in paths:
+            read = self.read_note(path)
+            if read is None:
+                self.notes.pop(path, None)
+            elif path in self.notes:
+                self.notes[path].update_content(read[0].content)
+            else:
+                self.notes[path] = read[0]
 
     def delete_note(self, path: str) -> None:
         """Delete a note from the vault.
@@ -424,24 +921,125 @@ class Vault:
         Args:
             path: The path to the note.
         """
+        if self._batch is not None:
+            self.notes.pop(path, None)
+            self._batch.add(path, None)
+            return
         note_path = self.vault_path / path
         if note_path.exists():
             note_path.unlink()
         if path in self.notes:
             del self.notes[path]
+        self._record_stat(path)
 
-    def get_empty_folders(self) -> List[str]:
-        """Get all empty folders in the vault."""
-        empty_folders = []
-        for folder in self.vault_path.rglob("*"):
-            if folder.is_dir():
-                try:
-                    rel_path = str(folder.relative_to(self.vault_path))
-                    if not list(folder.iterdir()):
-                        empty_folders.append(rel_path)
-                except ValueError:
-                    continue
-        return empty_folders
+    def get_empty_folders(
+        self, excluded: Optional[List[Pattern]] = None, recursive: bool = False
+    ) -> List[str]:
+        """Get all empty folders in the vault.
+
+        Args:
+            excluded: Exclusion patterns, such as ``Config.excluded_patterns``;
+                hidden folders are always skipped.
+            recursive: Also count folders holding only excluded files and
+                empty folders as empty.
+        """
+        return find_empty_folders(self.vault_path, excluded or [], recursive)
+
+    def export_to_html(
+        self, output: Union[str, Path] = "export", force: bool = False, jobs: Optional[int] = None
+    ) -> Dict[str, int]:
+        """Export the notes as linked HTML pages, see :func:`export.export_html`.
+
+        Only the pages whose note, or the notes it links to, changed since
+        the last export to the same directory are rendered again.
+
+        Args:
+            output: The output directory.
+            force: Render every page.
+            jobs: Number of worker processes, defaults to the CPU count.
+
+        Returns:
+            The number of pages ``rendered``, left ``unchanged`` and ``removed``.
+        """
+        # Imported here as the export module builds on modules importing this one
+        from .export import export_html
+
+        notes = self.get_all_notes()
+        return export_html(notes, output, self._digests, force, jobs)
+
+    def export_to_pdf(
+        self,
+        output: Union[str, Path] = "export",
+        book: bool = False,
+        jobs: Optional[int] = None,
+        force: bool = False,
+    ) -> Dict[str, int]:
+        """Export the notes as PDF files, see :func:`pdf.export_pdf`.
+
+        Only the PDFs whose note, or the notes it links to, changed since
+        the last export to the same directory are laid out again.
+
+        Args:
+            output: The output directory.
+            book: Combine the notes, in path order, into a single ``book.pdf``.
+            jobs: Number of worker processes, defaults to the CPU count.
+            force: Lay out every PDF again.
+
+        Returns:
+            The number of ``notes`` exported, of ``files`` written, of notes
+            left ``unchanged`` and of PDFs ``removed``.
+        """
+        # Imported here as WeasyPrint is slow to import and only needed here
+        from .pdf import export_pdf
+
+        notes = sorted(self.get_all_notes(), key=lambda note: note.path)
+        return export_pdf(notes, self.vault_path, output, book, jobs, digests=self._digests, force=force)
+
+    def publish_site(
+        self,
+        output: Union[str, Path] = "site",
+        notes: Optional[List[Note]] = None,
+        force: bool = False,
+        jobs: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """Publish notes as a static site, see :func:`publish.publish_site`.
+
+        Args:
+            output: The output directory.
+            notes: The notes to publish, all of them by default.
+            force: Render every page and rebuild the search index.
+            jobs: Number of worker processes, defaults to the CPU count.
+
+        Returns:
+            The number of pages ``rendered``, left ``unchanged`` and
+            ``removed``, and of notes ``indexed`` for search.
+        """
+        # Imported here as the publish module builds on modules importing this one
+        from .publish import publish_site
+
+        if notes is None:
+            notes = self.get_all_notes()
+        return publish_site(notes, output, self._digests, force, jobs)
+
+    def export_to_sqlite(self, path: Union[str, Path] = "vault.db", force: bool = False) -> Dict[str, int]:
+        """Export the notes and their links to SQLite, see :func:`database.export_sqlite`.
+
+        Only the notes whose content changed since the last export to the
+        same database are written again.
+
+        Args:
+            path: The database file.
+            force: Rebuild the database from scratch.
+
+        Returns:
+            The number of notes ``added``, ``updated``, ``deleted`` and left
+            ``unchanged``.
+        """
+        # Imported here as the database module builds on modules importing this one
+        from .database import export_sqlite
+
+        notes = self.get_all_notes()
+        return export_sqlite(notes, path, self.get_file_digests(), force)
 
     def get_empty_notes(self) -> List[Note]:
         """Get all notes with zero word count."""
@@ -0,0 +1,221 @@
+"""Export of vault metadata and the link graph to a SQLite database."""
+import json
+import re
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .frontmatter import frontmatter_end, split_frontmatter
+from .hashindex import bytes_digest
+from .link import build_link_index, resolve_link
+from .text import code_spans
+
+# Bump to rebuild existing databases after a schema change
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    title TEXT,
+    word_count INTEGER,
+    size INTEGER,
+    mtime_ns INTEGER,
+    digest TEXT
+);
+CREATE TABLE IF NOT EXISTS tags (
+    note_id INTEGER NOT NULL REFERENCES notes(id) ON DELETE CASCADE,
+    tag TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS links (
+    note_id INTEGER NOT NULL REFERENCES notes(id) ON DELETE CASCADE,
+    target TEXT NOT NULL,
+    alias TEXT,
+    target_path TEXT
+);
+CREATE TABLE IF NOT EXISTS frontmatter (
+    note_id INTEGER NOT NULL REFERENCES notes(id) ON DELETE CASCADE,
+    key TEXT NOT NULL,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS headings (
+    note_id INTEGER NOT NULL REFERENCES notes(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tags_note ON tags(note_id);
+CREATE INDEX IF NOT EXISTS tags_tag ON tags(tag);
+CREATE INDEX IF NOT EXISTS links_note ON links(note_id);
+CREATE INDEX IF NOT EXISTS links_target_path ON links(target_path);
+CREATE INDEX IF NOT EXISTS frontmatter_note ON frontmatter(note_id);
+CREATE INDEX IF NOT EXISTS frontmatter_key ON frontmatter(key, value);
+CREATE INDEX IF NOT EXISTS headings_note ON headings(note_id);
+"""
+
+_TABLES = ("headings", "frontmatter", "links", "tags", "notes", "meta")
+
+_HEADING_RE = re.compile(r'^(#{1,6})[ \t]+(.+?)[ \t#]*$', re.MULTILINE)
+
+
+def note_headings(content: str) -> List[Tuple[int, str]]:
+    """Get the ``(level, text)`` of the headings of a note, outside code."""
+    start = frontmatter_end(content)
+    spans = code_spans(content, start)
+    return [
+        (len(match.group(1)), match.group(2))
+        for match in _HEADING_RE.finditer(content, start)
+        if not any(s <= match.start() < e for s, e in spans)
+    ]
+
+
+def _connect(path: Union[str, Path], force: bool) -> sqlite3.Connection:
+    """Open the database, creating or rebuilding its schema as needed."""
+    connection = sqlite3.connect(str(path), isolation_level=None)
+    connection.execute("PRAGMA foreign_keys = ON")
+    connection.execute("PRAGMA journal_mode = WAL")
+    version = None
+    try:
+        row = connection.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        version = int(row[0]) if row else None
+    except sqlite3.OperationalError:
+        pass
+    if force or version != SCHEMA_VERSION:
+        for table in _TABLES:
+            connection.execute(f"DROP TABLE IF EXISTS {table}")
+    connection.executescript(SCHEMA)
+    connection.execute(
+        "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),)
+    )
+    return connection
+
+
+def export_sqlite(
+    notes: Iterable[Any],
+    path: Union[str, Path],
+    file_stats: Optional[Dict[str, Tuple[int, int, str]]] = None,
+    force: bool = False,
+) -> Dict[str, int]:
+    """Write the notes, their tags, links, frontmatter and headings to SQLite.
+
+    An existing database is updated in place: only notes whose content
+    digest changed are written again, their child rows replaced with bulk
+    ``executemany`` inserts, and notes that no longer exist are deleted.
+    Everything happens in one transaction, so readers see either the old
+    or the new state. When notes were added or removed, the resolved
+    ``target_path`` of every link is brought up to date.
+
+    Args:
+        notes: Every note of the vault.
+        path: The database file.
+        file_stats: ``(mtime_ns, size, digest)`` of each note file, as
+            given by ``Vault.get_file_digests``; digests of missing notes
+            are computed from their content.
+        force: Rebuild the database from scratch.
+
+    Returns:
+        The number of notes ``added``, ``updated``, ``deleted`` and left
+        ``unchanged``.
+    """
+    notes = list(notes)
+    file_stats = file_stats or {}
+    connection = _connect(path, force)
+    try:
+        connection.execute("BEGIN")
+        known = {
+            note_path: (note_id, digest)
+            for note_id, note_path, digest in connection.execute("SELECT id, path, digest FROM notes")
+        }
+        index = build_link_index(note.path for note in notes)
+        counts = {"added": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+
+        changed = []
+        for note in notes:
+            mtime_ns, size, digest = file_stats.get(note.path, (None, None, None))
+            digest = digest or bytes_digest(note.content.encode("utf-8"))
+            previous = known.get(note.path)
+            if previous is not None and previous[1] == digest:
+                counts["unchanged"] += 1
+                continue
+            counts["updated" if previous is not None else "added"] += 1
+            changed.append((note, mtime_ns, size, digest))
+
+        note_ids = _upsert_notes(connection, changed)
+        for table in ("tags", "links", "frontmatter", "headings"):
+            connection.executemany(f"DELETE FROM {table} WHERE note_id = ?", [(i,) for i in note_ids])
+        _insert_children(connection, changed, note_ids, index)
+
+        gone = set(known) - {note.path for note in notes}
+        connection.executemany("DELETE FROM notes WHERE id = ?", [(known[p][0],) for p in gone])
+        counts["deleted"] = len(gone)
+        if gone or counts["added"]:
+            _resolve_all_links(connection, index)
+        connection.execute("COMMIT")
+    except BaseException:
+        if connection.in_transaction:
+            connection.execute("ROLLBACK")
+        raise
+    finally:
+        connection.close()
+    return counts
+
+
+def _upsert_notes(connection: sqlite3.Connection, changed: List[Tuple[Any, Any, Any, str]]) -> List[int]:
+    """Insert or update the rows of changed notes, returning their ids in order."""
+    connection.executemany(
+        """INSERT INTO notes (path, title, word_count, size, mtime_ns, digest)
+           VALUES (?, ?, ?, ?, ?, ?)
+           ON CONFLICT(path) DO UPDATE SET
+               title = excluded.title, word_count = excluded.word_count, size = excluded.size,
+               mtime_ns = excluded.mtime_ns, digest = excluded.digest""",
+        [(note.path, note.title, note.word_count, size, mtime_ns, digest)
+         for note, mtime_ns, size, digest in changed],
+    )
+    ids = {}
+    paths = [note.path for note, _, _, _ in changed]
+    # Look the ids up in batches below SQLite's limit on query parameters
+    for start in range(0, len(paths), 500):
+        batch = paths[start:start + 500]
+        marks = ",".join("?" * len(batch))
+        ids.update(connection.execute(f"SELECT path, id FROM notes WHERE path IN ({marks})", batch))
+    return [ids[path] for path in paths]
+
+
+def _insert_children(
+    connection: sqlite3.Connection,
+    changed: List[Tuple[Any, Any, Any, str]],
+    note_ids: List[int],
+    index: Dict[str, str],
+) -> None:
+    """Insert the tags, links, frontmatter and headings of changed notes."""
+    tags, links, fields, headings = [], [], [], []
+    for note_id, (note, _, _, _) in zip(note_ids, changed):
+        tags.extend((note_id, tag) for tag in note.tags)
+        links.extend(
+            (note_id, link.target, link.alias, resolve_link(link.target, index)) for link in note.links
+        )
+        data, _ = split_frontmatter(note.content)
+        fields.extend((note_id, str(key), json.dumps(value, default=str)) for key, value in data.items())
+        headings.extend(
+            (note_id, position, level, text)
+            for position, (level, text) in enumerate(note_headings(note.content))
+        )
+    connection.executemany("INSERT INTO tags (note_id, tag) VALUES (?, ?)", tags)
+    connection.executemany(
+        "INSERT INTO links (note_id, target, alias, target_path) VALUES (?, ?, ?, ?)", links
+    )
+    connection.executemany("INSERT INTO frontmatter (note_id, key, value) VALUES (?, ?, ?)", fields)
+    connection.executemany(
+        "INSERT INTO headings (note_id, position, level, text) VALUES (?, ?, ?, ?)", headings
+    )
+
+
+def _resolve_all_links(connection: sqlite3.Connection, index: Dict[str, str]) -> None:
+    """Re-resolve the target of every link, updating only those that moved."""
+    updates = []
+    for rowid, target, target_path in connection.execute("SELECT rowid, target, target_path FROM links"):
+        resolved = resolve_link(target, index)
+        if resolved != target_path:
+            updates.append((resolved, rowid))
+    connection.executemany("UPDATE links SET target_path = ? WHERE rowid = ?", updates)
@@ -0,0 +1,306 @@
+"""Incremental HTML export of a vault, rendered in worker processes."""
+import html
+import json
+import os
+import posixpath
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import quote
+
+import markdown2
+
+from .atomic import AtomicWriter
+from .frontmatter import frontmatter_end
+from .hashindex import bytes_digest
+from .link import build_link_index, resolve_link
+from .text import code_spans
+
+# File, inside the output directory, recording what each page was rendered from
+MANIFEST_NAME = ".pyobsidian-export.json"
+
+# Bump to re-render every page after a change to the rendering
+RENDER_VERSION = 1
+
+# Below this many pages to render, worker processes cost more than they save
+PARALLEL_THRESHOLD = 200
+
+STYLESHEET_NAME = "style.css"
+
+MARKDOWN_EXTRAS = ["fenced-code-blocks", "tables", "header-ids", "strike", "task_list", "footnotes"]
+
+STYLESHEET = """body { max-width: 46em; margin: 2em auto; padding: 0 1em; font: 16px/1.6 sans-serif; color: #222; }
+pre { background: #f6f8fa; padding: 0.8em; overflow-x: auto; }
+code { font-size: 0.9em; }
+table { border-collapse: collapse; }
+th, td { border: 1px solid #ddd; padding: 0.3em 0.6em; }
+a.internal-link { color: #6b3fa0; }
+span.broken-link { color: #a33; border-bottom: 1px dashed #a33; }
+"""
+
+_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<link rel="stylesheet" href="{stylesheet}">
+</head>
+<body>
+<article>
+{body}
+</article>
+</body>
+</html>
+"""
+
+# [[target#heading|alias]], optionally embedded with a leading "!"
+_WIKILINK_RE = re.compile(r'!?\[\[([^\[\]|#\n]*)(#[^\[\]|\n]*)?(?:\|([^\[\]\n]*))?\]\]')
+
+# Markdown converter of each worker process, see _init_worker
+_worker_state: Optional[Tuple[markdown2.Markdown, str]] = None
+
+
+def html_path(note_path: str, extension: str = ".html") -> str:
+    """Get the path of the page of a note, relative to the output directory."""
+    return note_path.replace(os.sep, "/").removesuffix(".md") + extension
+
+
+def _link_key(target: str) -> str:
+    """Normalize a link target the way :func:`resolve_link` does."""
+    return target.strip().replace("\\", "/").removesuffix(".md").lower()
+
+
+def _slugify(text: str) -> str:
+    """Turn a heading into the id markdown2 gives it."""
+    text = re.sub(r'[^\w\s-]', '', text).strip().lower()
+    return re.sub(r'[-\s]+', '-', text)
+
+
+def _outside_code(content: str, start: int = 0) -> List[re.Match]:
+    """Find the wikilinks of a note after an offset, outside code."""
+    matches = list(_WIKILINK_RE.finditer(content, start)) if "[[" in content else []
+    if not matches:
+        return matches
+    spans = code_spans(content, start)
+    return [
+        match for match in matches
+        if not any(s < match.end() and match.start() < e for s, e in spans)
+    ]
+
+
+def link_targets(content: str) -> List[str]:
+    """Get the distinct wikilink targets of a note, outside frontmatter and code."""
+    targets = {}
+    for match in _outside_code(content, frontmatter_end(content)):
+        targets.setdefault(match.group(1), None)
+    return list(targets)
+
+
+def resolve_links(targets: List[str], path: str, index: Dict[str, str]) -> Dict[str, Optional[str]]:
+    """Resolve the wikilink targets of a note to the notes they point to.
+
+    Args:
+        targets: The targets, see :func:`link_targets`.
+        path: The note path, which an empty target points to.
+        index: The link index of the vault, see :func:`build_link_index`.
+
+    Returns:
+        The note path of each normalized link target, or None for a broken
+        link. A page must be rendered again whenever this changes, even if
+        its note did not.
+    """
+    return {
+        _link_key(target): resolve_link(target, index) if _link_key(target) else path
+        for target in targets
+    }
+
+
+def render_body(
+    content: str,
+    path: str,
+    resolved: Dict[str, Optional[str]],
+    converter: markdown2.Markdown,
+    link_href: Optional[Callable[[str, str], str]] = None,
+) -> str:
+    """Render a note to HTML, turning wikilinks into links between pages.
+
+    Args:
+        content: The note content; its frontmatter is not rendered.
+        path: The note path, which relative URLs start from.
+        resolved: The notes the wikilinks point to, see :func:`resolve_links`.
+        converter: The Markdown converter.
+        link_href: Build the URL of a linked note from its path and the
+            heading linked to (``""`` for none); by default the relative
+            URL of its HTML page.
+    """
+    page_dir = posixpath.dirname(html_path(path)) or "."
+    if link_href is None:
+        def link_href(linked: str, heading: str) -> str:
+            href = quote(posixpath.relpath(html_path(linked), page_dir))
+            return href + "#" + _slugify(heading) if heading else href
+
+    content = content[frontmatter_end(content):]
+    pieces = []
+    position = 0
+    for match in _outside_code(content):
+        target, heading, alias = match.group(1), match.group(2), match.group(3)
+        text = html.escape((alias or target + (heading or "")).strip())
+        linked = resolved.get(_link_key(target))
+        if linked is None:
+            link = f'<span class="broken-link">{text}</span>'
+        else:
+            href = link_href(linked, heading[1:] if heading else "")
+            link = f'<a class="internal-link" href="{html.escape(href)}">{text}</a>'
+        pieces.append(content[position:match.start()])
+        pieces.append(link)
+        position = match.end()
+    pieces.append(content[position:])
+    return converter.convert("".join(pieces))
+
+
+def render_page(title: str, body: str, page: str) -> str:
+    """Wrap a rendered note in a standalone page sharing the stylesheet."""
+    stylesheet = posixpath.relpath(STYLESHEET_NAME, posixpath.dirname(page) or ".")
+    return _PAGE.format(title=html.escape(title), stylesheet=quote(stylesheet), body=body)
+
+
+def _init_worker(output: str) -> None:
+    """Create the Markdown converter once per worker."""
+    global _worker_state
+    _worker_state = (markdown2.Markdown(extras=MARKDOWN_EXTRAS), output)
+
+
+def _render_chunk(items: List[Tuple[str, str, str, Dict[str, Optional[str]]]]) -> int:
+    """Render and write ``(path, title, content, resolved links)`` pages."""
+    converter, output = _worker_state
+    writer = AtomicWriter(durable=False)
+    for path, title, content, resolved in items:
+        page = html_path(path)
+        target = os.path.join(output, page)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        writer.write(target, render_page(title, render_body(content, path, resolved, converter), page))
+    return len(items)
+
+
+class ExportManifest:
+    """The signature each exported page was rendered from.
+
+    A signature covers the note content and where its links point, so a
+    page is rendered again when its note changes and also when a note it
+    links to appears, disappears or moves. The link targets of each note
+    are kept with the digest they were read from, so unchanged notes are
+    not parsed again to check where their links now point.
+    """
+
+    def __init__(self, pages: Optional[Dict[str, List[Any]]] = None) -> None:
+        """Initialize the manifest.
+
+        Args:
+            pages: ``[signature, content digest, link targets]`` of each
+                note path.
+        """
+        self.pages = pages or {}
+
+    @classmethod
+    def load(cls, path: Path) -> "ExportManifest":
+        """Load a manifest saved by :meth:`save`; empty if missing, broken or outdated."""
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls()
+        if not isinstance(data, dict) or data.get("version") != RENDER_VERSION:
+            return cls()
+        return cls(data.get("pages", {}))
+
+    def save(self, path: Path) -> None:
+        """Write the manifest."""
+        path.write_text(json.dumps({"version": RENDER_VERSION, "pages": self.pages}), encoding="utf-8")
+
+    @staticmethod
+    def signature(
+        digest: str, title: str, resolved: Dict[str, Optional[str]], backlinks: Optional[List[Any]] = None
+    ) -> str:
+        """Get the signature of a page from what it is rendered from.
+
+        Pages listing their backlinks pass them too, so that they are
+        rendered again when a note starts or stops linking to them.
+        """
+        parts = [digest, title, sorted(resolved.items())]
+        if backlinks is not None:
+            parts.append(backlinks)
+        return bytes_digest(json.dumps(parts).encode("utf-8"))
+
+
+def export_html(
+    notes: List[Any],
+    output: Union[str, Path],
+    digests: Optional[Dict[str, str]] = None,
+    force: bool = False,
+    jobs: Optional[int] = None,
+) -> Dict[str, int]:
+    """Export notes as HTML pages, rendering only those that changed.
+
+    Every note becomes a page at its path with ``.html`` instead of
+    ``.md``, linked to the others by relative URLs. Pages whose signature,
+    see :class:`ExportManifest`, matches the manifest of the last export
+    are left as they are; pages of notes that no longer exist are removed.
+    Pages are rendered in worker processes when there are at least
+    ``PARALLEL_THRESHOLD`` of them.
+
+    Args:
+        notes: The notes to export.
+        output: The output directory.
+        digests: Known content digests, by path; others are computed.
+        force: Render every page; pages of deleted notes are still removed.
+        jobs: Number of worker processes, defaults to the CPU count.
+
+    Returns:
+        The number of pages ``rendered``, left ``unchanged`` and ``removed``.
+    """
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+    manifest_path = output / MANIFEST_NAME
+    # Loaded even when forced, to know the pages of deleted notes
+    old = ExportManifest.load(manifest_path)
+    manifest = ExportManifest()
+    digests = digests or {}
+    index = build_link_index(note.path for note in notes)
+
+    pending = []
+    for note in notes:
+        digest = digests.get(note.path) or bytes_digest(note.content.encode("utf-8"))
+        previous = old.pages.get(note.path)
+        if previous is not None and previous[1] == digest:
+            targets = previous[2]
+        else:
+            targets = link_targets(note.content)
+        resolved = resolve_links(targets, note.path, index)
+        signature = ExportManifest.signature(digest, note.title, resolved)
+        manifest.pages[note.path] = [signature, digest, targets]
+        page = os.path.join(output, html_path(note.path))
+        if force or previous is None or previous[0] != signature or not os.path.exists(page):
+            pending.append((note.path, note.title, note.content, resolved))
+
+    removed = 0
+    for path in set(old.pages) - set(manifest.pages):
+        try:
+            (output / html_path(path)).unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass
+
+    (output / STYLESHEET_NAME).write_text(STYLESHEET, encoding="utf-8")
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 1 or len(pending) < PARALLEL_THRESHOLD:
+        _init_worker(str(output))
+        _render_chunk(pending)
+    else:
+        size = -(-len(pending) // (jobs * 4))
+        chunks = [pending[i:i + size] for i in range(0, len(pending), size)]
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(str(output),)) as executor:
+            list(executor.map(_render_chunk, chunks))
+    manifest.save(manifest_path)
+    return {"rendered": len(pending), "unchanged": len(notes) - len(pending), "removed": removed}
@@ -0,0 +1,196 @@
+"""Per-folder statistics and structure of a vault."""
+import bisect
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Sequence, Set, Union
+
+import numpy as np
+
+from .link import build_link_index, resolve_link
+
+# Word count percentiles reported for each folder
+PERCENTILES = (10, 50, 90)
+
+# Edges of the word count histogram bins: empty, 1-49, 50-199, ... 2500+
+HISTOGRAM_EDGES = (0, 1, 50, 200, 500, 1000, 2500, np.inf)
+
+
+def _parent(path: str) -> str:
+    """Get the folder of a path, ``""`` for the vault root."""
+    return path.rpartition("/")[0]
+
+
+def _depth(folder: str) -> int:
+    """Get the depth of a folder, 0 for the vault root."""
+    return folder.count("/") + 1 if folder else 0
+
+
+def folder_report(
+    paths: Sequence[str],
+    sizes: Sequence[int],
+    words: Sequence[int],
+    links: Sequence[int],
+    orphans: Sequence[bool],
+    mtimes: Sequence[Optional[float]],
+    max_depth: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Aggregate note statistics for every folder, subfolders included.
+
+    Notes are sorted by path once, which makes the notes under any folder
+    a contiguous range; sums then come from prefix sums in O(1) per folder
+    and only the percentiles and histograms look at the notes themselves.
+
+    Args:
+        paths: Note paths, relative to the vault, with ``/`` separators.
+        sizes: Size of each note, in bytes.
+        words: Word count of each note.
+        links: Outgoing link count of each note.
+        orphans: Whether each note has no incoming link.
+        mtimes: Modification time of each note, None if unknown.
+        max_depth: Deepest folder level to report; the root is level 0.
+
+    Returns:
+        One row per folder, in path order, with ``folder`` (``""`` for the
+        root), ``depth``, ``notes``, ``bytes``, ``words``, ``links``,
+        ``orphans``, ``modified`` (latest mtime, None if unknown),
+        ``percentiles`` (word counts at :data:`PERCENTILES`) and
+        ``histogram`` (note counts in :data:`HISTOGRAM_EDGES` bins).
+    """
+    order = sorted(range(len(paths)), key=paths.__getitem__)
+    sorted_paths = [paths[i] for i in order]
+    word_counts = np.asarray(words, dtype=np.int64)[order]
+    modified = np.array(
+        [mtimes[i] if mtimes[i] is not None else np.nan for i in order], dtype=np.float64
+    )
+    prefix = {
+        name: np.concatenate(([0], np.cumsum(np.asarray(values, dtype=np.int64)[order])))
+        for name, values in (("bytes", sizes), ("words", words), ("links", links), ("orphans", orphans))
+    }
+
+    folders = {""}
+    for path in sorted_paths:
+        folder = _parent(path)
+        while folder not in folders:
+            folders.add(folder)
+            folder = _parent(folder)
+    if max_depth is not None:
+        folders = {folder for folder in folders if _depth(folder) <= max_depth}
+
+    rows = []
+    for folder in sorted(folders):
+        if folder:
+            # Every path starting with "folder/" sorts before "folder0"
+            low = bisect.bisect_left(sorted_paths, folder + "/")
+            high = bisect.bisect_left(sorted_paths, folder + "0")
+        else:
+            low, high = 0, len(sorted_paths)
+        counts = word_counts[low:high]
+        times = modified[low:high]
+        known = times[~np.isnan(times)]
+        row: Dict[str, Any] = {"folder": folder, "depth": _depth(folder), "notes": high - low}
+        for name, sums in prefix.items():
+            row[name] = int(sums[high] - sums[low])
+        row["modified"] = float(known.max()) if len(known) else None
+        row["percentiles"] = (
+            np.percentile(counts, PERCENTILES).tolist() if len(counts) else [0.0] * len(PERCENTILES)
+        )
+        row["histogram"] = np.histogram(counts, bins=HISTOGRAM_EDGES)[0].tolist()
+        rows.append(row)
+    return rows
+
+
+def find_orphans(note_links: Dict[str, List[str]]) -> Set[str]:
+    """Find the notes no other note links to.
+
+    Link targets are resolved like Obsidian does, see
+    :func:`~pyobsidian.link.resolve_link`, so a note linked by its bare file
+    name from another folder is not an orphan. Links of a note to itself do
+    not count.
+
+    Args:
+        note_links: The link targets of every note, by note path.
+
+    Returns:
+        The paths of the orphan notes.
+    """
+    index = build_link_index(note_links)
+    linked: Set[str] = set()
+    for source, targets in note_links.items():
+        for target in targets:
+            path = resolve_link(target, index)
+            if path is not None and path != source:
+                linked.add(path)
+    return set(note_links) - linked
+
+
+def is_excluded(rel_path: str, excluded: Iterable[Pattern]) -> bool:
+    """Check a path against exclusion patterns such as ``excluded_files``.
+
+    Hidden entries are always excluded. A pattern matches if it matches at
+    the start of the path, with ``/`` separators, or of the entry name.
+    """
+    rel_path = rel_path.replace(os.sep, "/")
+    name = rel_path.rpartition("/")[2]
+    if name.startswith("."):
+        return True
+    return any(pattern.match(rel_path) or pattern.match(name) for pattern in excluded)
+
+
+def find_empty_folders(
+    root: Union[str, Path],
+    excluded: Iterable[Pattern] = (),
+    recursive: bool = False,
+) -> List[str]:
+    """Find the empty folders of a vault in one bottom-up walk.
+
+    Each folder is listed once with ``os.scandir`` and decided as soon as
+    its subfolders are, so no folder is listed twice and no extra ``stat``
+    is needed. Excluded and hidden folders are neither descended into nor
+    reported.
+
+    Args:
+        root: The vault root, which is never reported.
+        excluded: Exclusion patterns, see :func:`is_excluded`.
+        recursive: Also count as empty a folder whose entries are only
+            excluded files and folders that are themselves empty. Only the
+            outermost such folder is reported.
+
+    Returns:
+        Paths of the empty folders, relative to the root, sorted.
+    """
+    excluded = list(excluded)
+    empty: List[str] = []
+
+    def visit(folder: str) -> bool:
+        """Report the empty folders under ``folder`` and tell if it is empty."""
+        try:
+            with os.scandir(os.path.join(root, folder)) as entries:
+                entries = list(entries)
+        except OSError:
+            return False
+        children = []
+        has_content = False
+        for entry in entries:
+            rel_path = os.path.join(folder, entry.name) if folder else entry.name
+            ignored = is_excluded(rel_path, excluded)
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                is_dir = False
+            if is_dir and not ignored:
+                if visit(rel_path):
+                    children.append(rel_path)
+                else:
+                    has_content = True
+            elif not (recursive and ignored):
+                has_content = True
+        if not recursive:
+            empty.extend(children)
+            return not entries
+        # An empty folder is reported by its parent, as the outermost one
+        if has_content or not folder:
+            empty.extend(children)
+        return not has_content
+
+    visit("")
+    return sorted(empty)
@@ -0,0 +1,91 @@
+"""Read and update the YAML frontmatter of notes."""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+_FRONTMATTER_RE = re.compile(r'\A---[ \t]*\r?\n(.*?\r?\n)?---[ \t]*(?:\r?\n|\Z)', re.DOTALL)
+
+
+def split_frontmatter(content: str) -> Tuple[Dict[str, Any], str]:
+    """Split note content into its frontmatter and its body.
+
+    Args:
+        content: The raw note content.
+
+    Returns:
+        The parsed frontmatter (empty if the note has none or it is not a
+        YAML mapping) and the content that follows it.
+    """
+    match = _FRONTMATTER_RE.match(content)
+    if not match:
+        return {}, content
+    try:
+        data = yaml.safe_load(match.group(1) or "")
+    except yaml.YAMLError:
+        return {}, content
+    if not isinstance(data, dict):
+        return {}, content
+    return data, content[match.end():]
+
+
+def _field_lines(lines: List[str], key: str) -> Optional[Tuple[int, int]]:
+    """Find the lines of a top-level field in frontmatter lines.
+
+    A field spans its ``key:`` line and the indented or ``- `` list item
+    lines that follow it.
+
+    Returns:
+        The ``(start, end)`` line range of the field, None if it is absent.
+    """
+    key_re = re.compile(rf'(?:{re.escape(key)}|\'{re.escape(key)}\'|"{re.escape(key)}")[ \t]*:(?:[ \t]|$)')
+    for start, line in enumerate(lines):
+        if key_re.match(line.rstrip("\r\n")):
+            end = start + 1
+            while end < len(lines) and (
+                lines[end][:1] in (" ", "\t") or (lines[end].startswith("-") and not lines[end].startswith("---"))
+            ):
+                end += 1
+            return start, end
+    return None
+
+
+def set_frontmatter_field(content: str, key: str, value: Any) -> str:
+    """Set a frontmatter field, adding a frontmatter block if needed.
+
+    Only the lines of the field are rewritten; every other line of the
+    frontmatter, comments and formatting included, is kept as it is.
+
+    Args:
+        content: The raw note content.
+        key: The field to set.
+        value: The new value; None removes the field.
+
+    Returns:
+        The updated content. Other fields keep their order.
+    """
+    dumped = "" if value is None else yaml.safe_dump({key: value}, sort_keys=False, allow_unicode=True)
+    match = _FRONTMATTER_RE.match(content)
+    if not match:
+        return f"---\n{dumped}---\n{content}" if dumped else content
+
+    opening = content[:content.index("\n") + 1]
+    block = match.group(1) or ""
+    closing = content[len(opening) + len(block):match.end()]
+    if "\r\n" in opening:
+        dumped = dumped.replace("\n", "\r\n")
+    lines = block.splitlines(keepends=True)
+    span = _field_lines(lines, key)
+    if span is None:
+        lines.append(dumped)
+    else:
+        lines[span[0]:span[1]] = [dumped]
+    if not any(line.strip() for line in lines):
+        return content[match.end():]
+    return opening + "".join(lines) + closing + content[match.end():]
+
+
+def frontmatter_end(content: str) -> int:
+    """Get the offset where the frontmatter block of a note ends, 0 if it has none."""
+    match = _FRONTMATTER_RE.match(content)
+    return match.end() if match else 0
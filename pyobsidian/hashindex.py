@@ -0,0 +1,110 @@
+"""Content-addressed index of the files in a vault."""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+# Cache file, inside the cache directory, holding the digests
+HASH_INDEX_NAME = "hashes.json"
+
+# Bytes read at once when hashing a file
+_CHUNK_SIZE = 1024 * 1024
+
+
+def bytes_digest(data: bytes) -> str:
+    """Get the hex BLAKE2 digest of some bytes."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    """Get the hex BLAKE2 digest of a file, reading it in chunks."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class HashIndex:
+    """Digests of vault files, keyed by path and validated by mtime and size.
+
+    A file is only hashed again when its modification time or size changed
+    since the digest was recorded, so refreshing the index of a large vault
+    mostly costs one ``stat`` per file.
+    """
+
+    def __init__(self, entries: Optional[Dict[str, Tuple[int, int, str]]] = None) -> None:
+        """Initialize the index.
+
+        Args:
+            entries: ``(mtime_ns, size, digest)`` of each relative path.
+        """
+        self.entries = entries or {}
+
+    @classmethod
+    def load(cls, path: Path) -> "HashIndex":
+        """Load an index saved by :meth:`save`; empty if missing or broken."""
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            return cls({key: (int(m), int(s), str(d)) for key, (m, s, d) in data.items()})
+        except (OSError, ValueError, TypeError):
+            return cls()
+
+    def save(self, path: Path) -> None:
+        """Write the index to a JSON file."""
+        path.write_text(json.dumps(self.entries), encoding="utf-8")
+
+    def refresh(
+        self,
+        root: Union[str, Path],
+        paths: Iterable[str],
+        known: Optional[Dict[str, Tuple[int, int, str]]] = None,
+    ) -> int:
+        """Bring the index in line with a set of files.
+
+        Args:
+            root: The directory the paths are relative to.
+            paths: The files to index; entries of other paths are dropped.
+            known: Digests already computed elsewhere, e.g. while loading the
+                notes, as ``(mtime_ns, size, digest)``. They are trusted
+                without touching the file.
+
+        Returns:
+            The number of files that had to be read and hashed.
+        """
+        root = Path(root)
+        known = known or {}
+        entries: Dict[str, Tuple[int, int, str]] = {}
+        hashed = 0
+        for path in paths:
+            if path in known:
+                entries[path] = known[path]
+                continue
+            try:
+                stat = os.stat(root / path)
+                entry = self.entries.get(path)
+                if entry is None or entry[:2] != (stat.st_mtime_ns, stat.st_size):
+                    entry = (stat.st_mtime_ns, stat.st_size, file_digest(root / path))
+                    hashed += 1
+            except OSError:
+                continue
+            entries[path] = entry
+        self.entries = entries
+        return hashed
+
+    def digest(self, path: str) -> Optional[str]:
+        """Get the recorded digest of a file."""
+        entry = self.entries.get(path)
+        return entry[2] if entry else None
+
+    def duplicates(self) -> List[List[str]]:
+        """Group the indexed files with identical content.
+
+        Returns:
+            Groups of two or more paths, each sorted, ordered by first path.
+        """
+        groups: Dict[str, List[str]] = {}
+        for path, (_, _, digest) in self.entries.items():
+            groups.setdefault(digest, []).append(path)
+        return sorted(sorted(paths) for paths in groups.values() if len(paths) > 1)
@@ -0,0 +1,245 @@
+"""Append-only history of per-note word counts, for writing statistics."""
+import bisect
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .cache import cache_path
+from .hashindex import HashIndex, bytes_digest
+
+# Cache file, inside the cache directory, holding the history
+HISTORY_NAME = "wordcount_history.tsv"
+
+# Cache file holding ``(mtime_ns, size, digest)`` of each note at the last
+# snapshot, so unchanged notes are recognized without being read
+HISTORY_STATS_NAME = "wordcount_history_stats.json"
+
+_HEADER = "# pyobsidian word count history v1\n"
+
+# Word count recorded for a note that does not exist, before creation or after deletion
+ABSENT = -1
+
+# (time, words before, words after, digest, path); ``before`` is None for
+# the first snapshot of a note, whose previous count is unknown
+Record = Tuple[float, Optional[int], int, str, str]
+
+
+class WordCountHistory:
+    """Snapshots of the word count of every note, stored as changes only.
+
+    Each snapshot appends one line per note created, edited or deleted since
+    the previous one, carrying the counts before and after the change and
+    stamped with the note's modification time. Per-day statistics are then
+    sums over the records of the range, found by bisection, and never need
+    the vault to be read again.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        """Load the history, if any.
+
+        Args:
+            path: The history file, or None to keep the history in memory.
+        """
+        self.path = path
+        self.records: List[Record] = []
+        # Last (word count, digest) recorded for each existing note
+        self.latest: Dict[str, Tuple[int, str]] = {}
+        self._times: List[float] = []
+        if path is not None:
+            self._load()
+
+    def _load(self) -> None:
+        """Read the history file, skipping malformed lines."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                lines = f.readlines()
+        except OSError:
+            return
+        for line in lines:
+            if line.startswith("#"):
+                continue
+            try:
+                stamp, before, after, digest, path = line.rstrip("\n").split("\t", 4)
+                record = (float(stamp), int(before) if before else None, int(after), digest, path)
+            except ValueError:
+                continue
+            self._apply(record)
+        self._sort()
+
+    def _apply(self, record: Record) -> None:
+        """Add a record and update the latest state of its note."""
+        self.records.append(record)
+        _, _, after, digest, path = record
+        if after == ABSENT:
+            self.latest.pop(path, None)
+        else:
+            self.latest[path] = (after, digest)
+
+    def _sort(self) -> None:
+        """Keep the records in time order for range queries."""
+        self.records.sort(key=lambda record: record[0])
+        self._times = [record[0] for record in self.records]
+
+    def snapshot(
+        self,
+        notes: Iterable[Any],
+        digests: Optional[Dict[str, str]] = None,
+        times: Optional[Dict[str, float]] = None,
+        now: Optional[float] = None,
+        unchanged: Iterable[str] = (),
+    ) -> int:
+        """Record the notes that changed since the last snapshot.
+
+        Only notes whose content digest differs from the recorded one are
+        counted again.
+
+        Args:
+            notes: Every note of the vault, or only the possibly changed
+                ones when the others are listed in ``unchanged``.
+            digests: Known content digests, by path; others are computed.
+            times: Modification times, by path; ``now`` is used for others.
+            now: The time of the snapshot, defaults to the current time.
+            unchanged: Paths of notes known to be as last recorded, which
+                are neither read nor counted as deleted.
+
+        Returns:
+            The number of records appended.
+        """
+        now = time.time() if now is None else now
+        digests = digests or {}
+        times = times or {}
+        first = not self.records
+        new: List[Record] = []
+        seen = set(unchanged)
+        for note in notes:
+            seen.add(note.path)
+            digest = digests.get(note.path) or bytes_digest(note.content.encode("utf-8"))
+            previous = self.latest.get(note.path)
+            if previous is not None and previous[1] == digest:
+                continue
+            if previous is not None:
+                before: Optional[int] = previous[0]
+            else:
+                before = None if first else ABSENT
+            new.append((times.get(note.path, now), before, note.word_count, digest, note.path))
+        for path in set(self.latest) - seen:
+            new.append((now, self.latest[path][0], ABSENT, "", path))
+
+        if not new:
+            return 0
+        for record in new:
+            self._apply(record)
+        self._sort()
+        if self.path is not None:
+            self._append(new)
+        return len(new)
+
+    def _append(self, records: List[Record]) -> None:
+        """Append records to the history file."""
+        lines = [
+            f"{stamp:.3f}\t{'' if before is None else before}\t{after}\t{digest}\t{path}\n"
+            for stamp, before, after, digest, path in records
+        ]
+        new_file = not self.path.exists()
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(("" if not new_file else _HEADER) + "".join(lines))
+
+    def between(self, start: float, end: Optional[float] = None) -> List[Record]:
+        """Get the records of a time range, ``start`` inclusive, ``end`` exclusive."""
+        low = bisect.bisect_left(self._times, start)
+        high = len(self._times) if end is None else bisect.bisect_left(self._times, end)
+        return self.records[low:high]
+
+    def daily_stats(self, start: float, end: Optional[float] = None) -> Dict[str, Dict[str, int]]:
+        """Sum the changes of each day in a time range.
+
+        The first snapshot of a note has no previous count and is ignored,
+        so the snapshot that starts a history does not count as writing.
+
+        Args:
+            start: Start of the range, as a timestamp.
+            end: End of the range; None for no end.
+
+        Returns:
+            For each day with changes, as ``YYYY-MM-DD``, the words added and
+            removed and the notes created, modified and deleted.
+        """
+        stats: Dict[str, Dict[str, int]] = {}
+        modified: Dict[str, set] = {}
+        for stamp, before, after, _, path in self.between(start, end):
+            if before is None:
+                continue
+            day = datetime.fromtimestamp(stamp).strftime("%Y-%m-%d")
+            day_stats = stats.setdefault(day, {
+                "added": 0, "removed": 0, "created": 0, "modified": 0, "deleted": 0,
+            })
+            delta = max(after, 0) - max(before, 0)
+            if delta > 0:
+                day_stats["added"] += delta
+            else:
+                day_stats["removed"] -= delta
+            if before == ABSENT:
+                day_stats["created"] += 1
+            elif after == ABSENT:
+                day_stats["deleted"] += 1
+            else:
+                modified.setdefault(day, set()).add(path)
+        for day, paths in modified.items():
+            stats[day]["modified"] = len(paths)
+        return stats
+
+
+def record_history(vault: Any, loaded: bool = False) -> WordCountHistory:
+    """Load the word count history of a vault and snapshot its notes.
+
+    The history lives in the vault's cache directory. The vault records a snapshot whenever it loads its notes, so edits made
+    between two loads are told apart. Each file's mtime and size are
+    compared with those of the previous snapshot and only new or changed
+    notes are counted; when the notes are not loaded, only those files are
+    read, with :meth:`~pyobsidian.core.Vault.read_note`.
+
+    Args:
+        vault: The vault.
+        loaded: The vault's notes are in memory, as right after it loaded
+            them, and are used instead of reading the changed files.
+    """
+    history = WordCountHistory(cache_path(vault.vault_path, HISTORY_NAME))
+    stats_path = cache_path(vault.vault_path, HISTORY_STATS_NAME)
+    previous = HashIndex.load(stats_path).entries
+    if loaded:
+        current = vault.get_file_digests()
+    else:
+        table = vault.get_stat_table()
+        current = {
+            path: (mtime_ns, size, None)
+            for path, mtime_ns, size in zip(table.paths, table.mtimes.tolist(), table.sizes.tolist())
+        }
+    entries: Dict[str, Tuple[int, int, str]] = {}
+    unchanged = []
+    notes = []
+    digests = {}
+    times = {}
+    for path, (mtime_ns, size, digest) in current.items():
+        entry = previous.get(path)
+        latest = history.latest.get(path)
+        if entry is not None and entry[:2] == (mtime_ns, size) and latest and latest[1] == entry[2]:
+            unchanged.append(path)
+            entries[path] = entry
+            continue
+        if loaded:
+            note = vault.get_note(path)
+        else:
+            read = vault.read_note(path)
+            if read is None:
+                continue
+            note, stat, digest = read
+            mtime_ns, size = stat.st_mtime_ns, stat.st_size
+        notes.append(note)
+        digests[path] = digest
+        times[path] = mtime_ns / 1e9
+        entries[path] = (mtime_ns, size, digest)
+    history.snapshot(notes, digests, times, unchanged=unchanged)
+    if entries != previous:
+        HashIndex(entries).save(stats_path)
+    return history
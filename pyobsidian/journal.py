@@ -0,0 +1,191 @@
+"""Write-ahead journal making bulk note edits resumable and reversible."""
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Union
+
+from .atomic import fsync_directory
+from .hashindex import bytes_digest
+
+# Cache file, inside the cache directory, holding the journal of the bulk
+# edit in progress; it only exists while an edit is unfinished
+JOURNAL_NAME = "journal"
+
+_VERSION = 1
+
+# State of a planned edit, judged from the current content of its file
+APPLIED = "applied"
+PENDING = "pending"
+CONFLICT = "conflict"
+
+
+class JournalError(Exception):
+    """Raised when a journaled edit cannot start."""
+
+
+class JournalEntry(NamedTuple):
+    """A planned edit of one note file.
+
+    Contents and digests are None for a file that is absent: before the
+    edit for a creation, after it for a deletion.
+    """
+
+    path: str
+    before: Optional[str]
+    after: Optional[str]
+    original: Optional[str]
+    content: Optional[str]
+
+
+def file_digest(path: Union[str, Path]) -> Optional[str]:
+    """Get the content digest of a file, None if it does not exist."""
+    try:
+        with open(path, "rb") as f:
+            return bytes_digest(f.read())
+    except FileNotFoundError:
+        return None
+
+
+def plan_entry(root: Union[str, Path], path: str, content: Optional[str]) -> JournalEntry:
+    """Plan the edit of a note, reading its current content for rollback.
+
+    Args:
+        root: The vault root.
+        path: The note path, relative to the root.
+        content: The new content, None to delete the note.
+    """
+    try:
+        with open(os.path.join(root, path), "rb") as f:
+            data = f.read()
+        before: Optional[str] = bytes_digest(data)
+        original: Optional[str] = data.decode("utf-8")
+    except FileNotFoundError:
+        before = original = None
+    after = None if content is None else bytes_digest(content.encode("utf-8"))
+    return JournalEntry(path, before, after, original, content)
+
+
+class Journal:
+    """The planned and applied edits of one bulk operation.
+
+    The whole plan, with every note's content before and after the edit,
+    is written and synced before the first note is touched; applied edits
+    are then appended as they complete. After an interruption, the state of
+    each edit is read back from the digest of its file, so the operation can
+    be finished or undone without recomputing the plan.
+
+    The journal is a JSON-lines file: a header, one line per planned edit,
+    a line closing the plan, then one line per group of applied edits.
+    """
+
+    def __init__(self, path: Path, name: str, entries: List[JournalEntry],
+                 started: float, complete: bool = True) -> None:
+        """Initialize the journal of an edit; see :meth:`begin` and :meth:`load`.
+
+        Args:
+            path: The journal file.
+            name: A description of the bulk operation.
+            entries: The planned edits.
+            started: When the operation started, as a timestamp.
+            complete: Whether the whole plan reached the file; if not, no
+                edit was applied yet.
+        """
+        self.path = path
+        self.name = name
+        self.entries = entries
+        self.started = started
+        self.complete = complete
+        self.applied: List[str] = []
+
+    @classmethod
+    def begin(cls, path: Path, name: str, entries: Iterable[JournalEntry]) -> "Journal":
+        """Write the plan of an edit to disk, before any note is written.
+
+        Args:
+            path: The journal file, which must not exist.
+            name: A description of the bulk operation.
+            entries: The planned edits.
+
+        Raises:
+            FileExistsError: If another edit is unfinished.
+        """
+        journal = cls(path, name, list(entries), time.time())
+        with open(path, "x", encoding="utf-8") as f:
+            header = {"journal": _VERSION, "name": name, "started": journal.started}
+            f.write(json.dumps(header) + "\n")
+            for entry in journal.entries:
+                f.write(json.dumps(entry._asdict()) + "\n")
+            f.write(json.dumps({"planned": len(journal.entries)}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        fsync_directory(path.parent)
+        return journal
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["Journal"]:
+        """Load the journal of an unfinished edit, None if there is none.
+
+        A torn last line, left by a crash while appending, is ignored.
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return None
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+        if not records or records[0].get("journal") != _VERSION:
+            return None
+        header = records[0]
+        journal = cls(path, header.get("name", ""), [], header.get("started", 0.0), complete=False)
+        for record in records[1:]:
+            if "path" in record:
+                journal.entries.append(JournalEntry(**record))
+            elif "planned" in record:
+                journal.complete = record["planned"] == len(journal.entries)
+            elif "applied" in record:
+                journal.applied.extend(record["applied"])
+        return journal
+
+    def mark_applied(self, paths: List[str]) -> None:
+        """Record that edits reached the disk."""
+        self.applied.extend(paths)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"applied": paths}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def state(self, root: Union[str, Path], entry: JournalEntry) -> str:
+        """Tell whether an edit is applied, pending or conflicting.
+
+        An edit whose file holds neither the planned before nor after
+        content was changed by something else and is left alone.
+        """
+        digest = file_digest(os.path.join(root, entry.path))
+        if digest == entry.after:
+            return APPLIED
+        if digest == entry.before:
+            return PENDING
+        return CONFLICT
+
+    def states(self, root: Union[str, Path]) -> Dict[str, List[JournalEntry]]:
+        """Group the planned edits by :meth:`state`.
+
+        Without a complete plan no edit was applied, so all are pending.
+        """
+        groups: Dict[str, List[JournalEntry]] = {APPLIED: [], PENDING: [], CONFLICT: []}
+        for entry in self.entries:
+            groups[self.state(root, entry) if self.complete else PENDING].append(entry)
+        return groups
+
+    def finish(self) -> None:
+        """Remove the journal once the edit is complete or rolled back."""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
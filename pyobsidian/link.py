@@ -1,5 +1,6 @@
 """Link class for PyObsidian."""
-from typing import Optional, Union
+import posixpath
+from typing import Dict, Iterable, Optional, Union
 
 class Link:
     """A link between notes in the vault."""
@@ -45,4 +46,45 @@ class Link:
 
     def __lt__(self, other: "Link") -> bool:
         """Compare links for sorting."""
-        return (self.source, self.target) < (other.source, other.target) 
\ No newline at end of file
+        return (self.source, self.target) < (other.source, other.target)
+
+
+def build_link_index(paths: Iterable[str]) -> Dict[str, str]:
+    """Map every name a note can be linked by to the note's path.
+
+    A note is reachable by its full path without the ``.md`` suffix and,
+    like in Obsidian, by its bare file name. When several notes share a file
+    name the one with the shortest path wins.
+
+    Args:
+        paths: Vault-relative note paths.
+
+    Returns:
+        A dictionary from lowercase link target to note path.
+    """
+    index: Dict[str, str] = {}
+    by_name: Dict[str, str] = {}
+    for path in paths:
+        stem = path.replace("\\", "/").removesuffix(".md")
+        index[stem.lower()] = path
+        name = posixpath.basename(stem).lower()
+        current = by_name.get(name)
+        if current is None or (len(path), path) < (len(current), current):
+            by_name[name] = path
+    for name, path in by_name.items():
+        index.setdefault(name, path)
+    return index
+
+
+def resolve_link(target: str, index: Dict[str, str]) -> Optional[str]:
+    """Resolve a link target to a note path.
+
+    Args:
+        target: The link target as written in the note.
+        index: The index built by :func:`build_link_index`.
+
+    Returns:
+        The path of the linked note, or None if it does not exist.
+    """
+    target = target.split("#", 1)[0].strip().replace("\\", "/")
+    return index.get(target.removesuffix(".md").lower())
@@ -15,6 +15,18 @@ from .commands import (
     visualization_command,
     data_management_command,
     export_command,
+    suggest_tags_command,
+    find_similar_command,
+    related_command,
+    duplicates_command,
+    topics_command,
+    word_cloud_command,
+    daily_stats_command,
+    changed_command,
+    folders_command,
+    journal_command,
+    replace_command,
+    publish_command,
 )
 
 @click.group()
@@ -35,7 +47,19 @@ def main() -> None:
     orphan_links_command.register_command(cli)
     tag_management_command.register_command(cli)
     visualization_command.register_command(cli)
-    data_management_command.register_command(cli)
+    data_management_command.register_commands(cli)
     export_command.register_command(cli)
+    suggest_tags_command.register_command(cli)
+    find_similar_command.register_command(cli)
+    related_command.register_command(cli)
+    duplicates_command.register_command(cli)
+    topics_command.register_command(cli)
+    word_cloud_command.register_command(cli)
+    daily_stats_command.register_command(cli)
+    changed_command.register_command(cli)
+    folders_command.register_command(cli)
+    journal_command.register_command(cli)
+    replace_command.register_command(cli)
+    publish_command.register_command(cli)
     
     cli() 
\ No newline at end of file
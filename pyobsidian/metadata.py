@@ -0,0 +1,207 @@
+"""Per-note metadata index with incrementally maintained vault aggregates."""
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cache import cache_path
+from .hashindex import bytes_digest
+
+# Cache files, inside the cache directory, holding the per-note entries and
+# the aggregates; the latter is small and enough to answer from a warm cache
+METADATA_NAME = "metadata.json"
+AGGREGATES_NAME = "aggregates.json"
+
+# (content digest, words, links, tags) of a note
+Entry = Tuple[str, int, int, List[str]]
+
+
+def note_entry(note: Any, digest: str) -> Entry:
+    """Compute the metadata entry of a note."""
+    return (digest, note.word_count, len(note.links), list(note.tags))
+
+
+def _folders(path: str) -> List[str]:
+    """Get the folders containing a note path, outermost first."""
+    parts = path.replace(os.sep, "/").split("/")[:-1]
+    return ["/".join(parts[:i]) for i in range(1, len(parts) + 1)]
+
+
+class MetadataIndex:
+    """Word, link and tag counts of every note, with their vault-wide sums.
+
+    The sums are kept up to date entry by entry: refreshing the index only
+    recounts notes whose content digest changed, subtracting their old
+    entry and adding the new one. Folder roll-ups include subfolders.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self.generation: Optional[str] = None
+        self.entries: Dict[str, Entry] = {}
+        self.totals: Dict[str, int] = {"notes": 0, "words": 0, "links": 0}
+        # Occurrences of each tag, in notes
+        self.tags: Dict[str, int] = {}
+        # [notes, words, links] of each folder, subfolders included
+        self.folders: Dict[str, List[int]] = {}
+
+    def _apply(self, path: str, entry: Entry, sign: int) -> None:
+        """Add (``sign=1``) or subtract (``sign=-1``) an entry from the sums."""
+        _, words, links, tags = entry
+        self.totals["notes"] += sign
+        self.totals["words"] += sign * words
+        self.totals["links"] += sign * links
+        for tag in tags:
+            count = self.tags.get(tag, 0) + sign
+            if count:
+                self.tags[tag] = count
+            else:
+                self.tags.pop(tag, None)
+        for folder in _folders(path):
+            sums = self.folders.setdefault(folder, [0, 0, 0])
+            sums[0] += sign
+            sums[1] += sign * words
+            sums[2] += sign * links
+            if not sums[0]:
+                del self.folders[folder]
+
+    def refresh(self, notes: List[Any], digests: Dict[str, str], generation: Optional[str] = None) -> int:
+        """Bring the index in line with the notes of a vault.
+
+        Args:
+            notes: Every note of the vault.
+            digests: Content digest of each note, by path; missing ones are
+                computed from the note content.
+            generation: The vault generation the index now matches.
+
+        Returns:
+            The number of notes that had to be counted.
+        """
+        counted = 0
+        seen = set()
+        for note in notes:
+            seen.add(note.path)
+            digest = digests.get(note.path) or bytes_digest(note.content.encode("utf-8"))
+            old = self.entries.get(note.path)
+            if old is not None and old[0] == digest:
+                continue
+            if old is not None:
+                self._apply(note.path, old, -1)
+            entry = note_entry(note, digest)
+            self.entries[note.path] = entry
+            self._apply(note.path, entry, 1)
+            counted += 1
+        for path in set(self.entries) - seen:
+            self._apply(path, self.entries.pop(path), -1)
+        self.generation = generation
+        return counted
+
+    def aggregates(self) -> Dict[str, Any]:
+        """Get the vault-wide sums as plain data."""
+        return {
+            "generation": self.generation,
+            "totals": self.totals,
+            "tags": self.tags,
+            "folders": self.folders,
+        }
+
+    def compare(self, other: "MetadataIndex") -> List[str]:
+        """List the aggregates that differ from those of another index."""
+        mine, theirs = self.aggregates(), other.aggregates()
+        return [key for key in ("totals", "tags", "folders") if mine[key] != theirs[key]]
+
+    @classmethod
+    def load(cls, directory: Path) -> "MetadataIndex":
+        """Load an index saved by :meth:`save`; empty if missing or broken."""
+        index = cls()
+        try:
+            entries = json.loads((directory / METADATA_NAME).read_text(encoding="utf-8"))
+            data = json.loads((directory / AGGREGATES_NAME).read_text(encoding="utf-8"))
+            index.entries = {path: (d, int(w), int(l), list(t)) for path, (d, w, l, t) in entries.items()}
+            index.generation = data["generation"]
+            index.totals = data["totals"]
+            index.tags = data["tags"]
+            index.folders = data["folders"]
+        except (OSError, ValueError, TypeError, KeyError):
+            return cls()
+        return index
+
+    @staticmethod
+    def load_aggregates(directory: Path, generation: str) -> Optional[Dict[str, Any]]:
+        """Load only the saved aggregates, if they match a vault generation."""
+        try:
+            data = json.loads((directory / AGGREGATES_NAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("generation") != generation:
+            return None
+        return data
+
+    def save(self, directory: Path) -> None:
+        """Write the entries and the aggregates to the cache directory."""
+        (directory / METADATA_NAME).write_text(json.dumps(self.entries), encoding="utf-8")
+        (directory / AGGREGATES_NAME).write_text(json.dumps(self.aggregates()), encoding="utf-8")
+
+
+def vault_aggregates(vault: Any) -> Dict[str, Any]:
+    """Get the aggregates of a vault, from the cache when it is current.
+
+    A warm cache answers without touching the notes. Otherwise the metadata
+    index is refreshed, recounting only the notes that changed, and saved.
+
+    Returns:
+        ``totals`` (notes, words, links), ``tags`` (occurrences of each tag)
+        and ``folders`` (notes, words and links per folder) of the vault.
+    """
+    directory = cache_path(vault.vault_path, METADATA_NAME).parent
+    cached = MetadataIndex.load_aggregates(directory, vault.generation)
+    if cached is not None:
+        return cached
+
+    return load_metadata_index(vault).aggregates()
+
+
+def load_metadata_index(vault: Any) -> MetadataIndex:
+    """Load the metadata index of a vault and bring it up to date.
+
+    Only the notes that changed since the index was saved are counted, and
+    the index is saved again if any were.
+    """
+    directory = cache_path(vault.vault_path, METADATA_NAME).parent
+    index = MetadataIndex.load(directory)
+    generation = vault.generation
+    stale = index.generation != generation
+    notes = vault.get_all_notes()
+    if index.refresh(notes, _digests(vault, notes), generation) or stale:
+        index.save(directory)
+    return index
+
+
+def _digests(vault: Any, notes: List[Any]) -> Dict[str, str]:
+    """Get the content digests the vault recorded while loading its notes."""
+    return {note.path: vault.get_digest(note.path) for note in notes}
+
+
+def verify_aggregates(vault: Any) -> Tuple[Dict[str, Any], List[str]]:
+    """Recompute the aggregates of a vault from scratch and audit the cache.
+
+    The cached index is brought up to date incrementally, as it would be
+    by :func:`vault_aggregates`, then compared to an index built by
+    counting every note again.
+
+    Returns:
+        The recomputed aggregates, and the names of the cached aggregates
+        that disagreed with them. The cache is replaced when any did.
+    """
+    notes = vault.get_all_notes()
+    digests = _digests(vault, notes)
+    generation = vault.generation
+    fresh = MetadataIndex()
+    fresh.refresh(notes, digests, generation)
+
+    directory = cache_path(vault.vault_path, METADATA_NAME).parent
+    cached = MetadataIndex.load(directory)
+    cached.refresh(notes, digests, generation)
+    mismatches = cached.compare(fresh)
+    fresh.save(directory)
+    return fresh.aggregates(), mismatches
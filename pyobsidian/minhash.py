@@ -0,0 +1,328 @@
+"""MinHash signatures and LSH banding for near-duplicate detection."""
+import hashlib
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .core import Note
+from .hashindex import bytes_digest
+
+# Number of hash functions in a signature
+NUM_PERM = 128
+
+# Number of words in a shingle
+SHINGLE_SIZE = 5
+
+# Seed of the hash functions; signatures are only comparable for equal seeds
+SEED = 1
+
+_WORD_RE = re.compile(r'\w+')
+
+# Odd multiplier used to fold word hashes into shingle hashes
+_FOLD = np.uint64(0x9E3779B97F4A7C15)
+
+# Buckets larger than this are linked as a star instead of all their pairs
+MAX_BUCKET_PAIRS = 64
+
+
+def _word_hash(word: str) -> int:
+    """Hash a word to 64 bits, stable across runs unlike ``hash()``."""
+    return int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def shingle_hashes(
+    content: str, size: int = SHINGLE_SIZE, cache: Optional[Dict[str, int]] = None
+) -> np.ndarray:
+    """Hash the word shingles of a note.
+
+    Each word is hashed once; the hashes of ``size`` consecutive words are
+    then folded together with vectorized polynomial hashing.
+
+    Args:
+        content: The raw note content.
+        size: Number of words in a shingle.
+        cache: Word hashes shared between calls.
+
+    Returns:
+        The distinct 64-bit shingle hashes. A note shorter than ``size``
+        words is a single shingle; an empty note has none.
+    """
+    cache = {} if cache is None else cache
+    words = _WORD_RE.findall(content.lower())
+    if not words:
+        return np.zeros(0, dtype=np.uint64)
+    for word in set(words).difference(cache):
+        cache[word] = _word_hash(word)
+    hashes = np.array(list(map(cache.__getitem__, words)), dtype=np.uint64)
+    size = min(size, len(hashes))
+    count = len(hashes) - size + 1
+    shingles = hashes[:count].copy()
+    for offset in range(1, size):
+        shingles = shingles * _FOLD + hashes[offset:offset + count]
+    return np.unique(shingles)
+
+
+class MinHasher:
+    """A family of multiply-shift hash functions producing MinHash signatures."""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = SEED) -> None:
+        """Draw the hash functions.
+
+        Args:
+            num_perm: Number of hash functions.
+            seed: Seed of the random generator.
+        """
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.seed = seed
+        # Multiply-shift hashing needs odd multipliers
+        self._a = rng.integers(0, 2**64, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**64, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingles: np.ndarray, chunk: int = 4096) -> np.ndarray:
+        """Compute the MinHash signature of a set of shingle hashes.
+
+        Args:
+            shingles: 64-bit shingle hashes.
+            chunk: Shingles hashed at once, bounding memory for long notes.
+
+        Returns:
+            ``num_perm`` 32-bit minimums; all ones for an empty set.
+        """
+        signature = np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint32)
+        for start in range(0, len(shingles), chunk):
+            block = shingles[start:start + chunk]
+            hashed = (np.outer(self._a, block) + self._b[:, None]) >> np.uint64(32)
+            np.minimum(signature, hashed.min(axis=1).astype(np.uint32), out=signature)
+        return signature
+
+
+def estimate_jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimate the Jaccard similarity of two sets from their signatures."""
+    return float(np.mean(a == b))
+
+
+def lsh_parameters(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """Pick the number of bands and rows per band for a similarity threshold.
+
+    Two sets become candidates when any band matches, which happens with
+    probability ``1 - (1 - s**rows)**bands`` for Jaccard similarity ``s``.
+    The curve's inflection point ``(1 / bands) ** (1 / rows)`` is placed at
+    or just below the threshold: false candidates are dropped when checked
+    against the full signature, missed pairs are never seen again.
+
+    Args:
+        num_perm: Signature length.
+        threshold: Target Jaccard similarity.
+
+    Returns:
+        ``(bands, rows)`` with ``bands * rows == num_perm``.
+    """
+    choices = [(num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0]
+    below = [br for br in choices if (1 / br[0]) ** (1 / br[1]) <= threshold]
+    return max(below or choices[:1], key=lambda br: (1 / br[0]) ** (1 / br[1]))
+
+
+def candidate_pairs(signatures: np.ndarray, bands: int, rows: int) -> np.ndarray:
+    """Find pairs of signatures that agree on at least one band.
+
+    Each band is folded into one 64-bit key per signature; sorting the keys
+    groups the signatures that share a bucket without comparing every pair.
+    Buckets of more than ``MAX_BUCKET_PAIRS`` signatures, such as notes
+    created from one template, only pair each member with the first one.
+
+    Args:
+        signatures: ``(n, bands * rows)`` signature matrix.
+        bands: Number of bands.
+        rows: Rows per band.
+
+    Returns:
+        ``(m, 2)`` array of distinct index pairs ``i < j``.
+    """
+    n = len(signatures)
+    found = []
+    for band in range(bands):
+        columns = signatures[:, band * rows:(band + 1) * rows].astype(np.uint64)
+        keys = np.zeros(n, dtype=np.uint64)
+        for column in columns.T:
+            keys = keys * _FOLD + column
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        sizes = np.diff(np.r_[starts, n])
+        for start, size in zip(starts[sizes > 1].tolist(), sizes[sizes > 1].tolist()):
+            members = order[start:start + size]
+            if size > MAX_BUCKET_PAIRS:
+                i, j = np.zeros(size - 1, dtype=np.int64), np.arange(1, size)
+            else:
+                i, j = np.triu_indices(size, k=1)
+            found.append(np.stack((members[i], members[j]), axis=1))
+    if not found:
+        return np.zeros((0, 2), dtype=np.int64)
+    pairs = np.sort(np.concatenate(found), axis=1)
+    return np.unique(pairs, axis=0)
+
+
+def _find(parent: List[int], i: int) -> int:
+    """Find the root of a union-find set, halving the path on the way."""
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def cluster_pairs(n: int, pairs: Iterable[Tuple[int, int]]) -> List[List[int]]:
+    """Group items linked by pairs into connected clusters.
+
+    Args:
+        n: Number of items.
+        pairs: Linked item pairs.
+
+    Returns:
+        Clusters of two or more items, each sorted, in order of first item.
+    """
+    parent = list(range(n))
+    for i, j in pairs:
+        root_i, root_j = _find(parent, i), _find(parent, j)
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+    clusters: Dict[int, List[int]] = {}
+    for i in range(n):
+        clusters.setdefault(_find(parent, i), []).append(i)
+    return [members for members in clusters.values() if len(members) > 1]
+
+
+class SignatureCache:
+    """MinHash signatures stored on disk, keyed by content digest."""
+
+    def __init__(self, path: Optional[Path], hasher: MinHasher, shingle_size: int) -> None:
+        """Load the cached signatures, if any match the hashing parameters.
+
+        Args:
+            path: The ``.npz`` cache file, or None to keep signatures in memory.
+            hasher: The hash functions the signatures must come from.
+            shingle_size: The shingle size the signatures must come from.
+        """
+        self.path = path
+        self.hasher = hasher
+        self.shingle_size = shingle_size
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._dirty = False
+        if path is not None:
+            self._load()
+
+    def _params(self) -> np.ndarray:
+        """Get the parameters a cache file must have been written with."""
+        return np.array([self.hasher.num_perm, self.hasher.seed, self.shingle_size], dtype=np.int64)
+
+    def _load(self) -> None:
+        """Read the cache file, ignoring it if missing, broken or stale."""
+        try:
+            with np.load(self.path) as data:
+                if not np.array_equal(data["params"], self._params()):
+                    return
+                digests, signatures = data["digests"], data["signatures"]
+        except (OSError, EOFError, ValueError, KeyError):
+            return
+        self._signatures = {d.tobytes().hex(): s for d, s in zip(digests, signatures)}
+
+    def signatures(self, notes: List[Note], digests: Optional[Dict[str, str]] = None) -> np.ndarray:
+        """Get the signatures of notes, computing only the uncached ones.
+
+        Args:
+            notes: The notes.
+            digests: Known content digests, by path; others are computed.
+
+        Returns:
+            ``(len(notes), num_perm)`` signature matrix.
+        """
+        digests = digests or {}
+        words: Dict[str, int] = {}
+        result = np.empty((len(notes), self.hasher.num_perm), dtype=np.uint32)
+        for i, note in enumerate(notes):
+            digest = digests.get(note.path) or bytes_digest(note.content.encode("utf-8"))
+            signature = self._signatures.get(digest)
+            if signature is None:
+                shingles = shingle_hashes(note.content, self.shingle_size, words)
+                signature = self.hasher.signature(shingles)
+                self._signatures[digest] = signature
+                self._dirty = True
+            result[i] = signature
+        return result
+
+    def save(self, keep: Optional[Iterable[Note]] = None, digests: Optional[Dict[str, str]] = None) -> None:
+        """Write the cache file if new signatures were computed.
+
+        Args:
+            keep: If given, only the signatures of these notes are kept, so
+                the cache does not grow with deleted or edited notes.
+            digests: Known content digests of the kept notes, by path.
+        """
+        if self.path is None or not self._dirty:
+            return
+        if keep is not None:
+            digests = digests or {}
+            kept = {
+                digests.get(note.path) or bytes_digest(note.content.encode("utf-8"))
+                for note in keep
+            }
+            self._signatures = {d: s for d, s in self._signatures.items() if d in kept}
+        keys = list(self._signatures)
+        with open(self.path, "wb") as f:
+            np.savez(
+                f,
+                params=self._params(),
+                digests=np.array([bytes.fromhex(k) for k in keys], dtype="S16")
+                .view(np.uint8)
+                .reshape(len(keys), 16),
+                signatures=np.array([self._signatures[k] for k in keys], dtype=np.uint32).reshape(
+                    len(keys), self.hasher.num_perm
+                ),
+            )
+        self._dirty = False
+
+
+def find_duplicates(
+    notes: List[Note],
+    threshold: float = 0.8,
+    cache: Optional[SignatureCache] = None,
+    digests: Optional[Dict[str, str]] = None,
+) -> List[List[Tuple[str, float]]]:
+    """Find clusters of near-duplicate notes.
+
+    Candidate pairs come from LSH bands, so only notes that share a band
+    are ever compared; each candidate is then checked against the full
+    signature before being clustered.
+
+    Args:
+        notes: The notes to compare.
+        threshold: Minimum estimated Jaccard similarity of word shingles.
+        cache: Signature cache; a fresh in-memory one is used if None.
+        digests: Known content digests, by path, such as the vault's; the
+            others are computed.
+
+    Returns:
+        Clusters of ``(path, similarity)`` pairs, where the similarity is
+        estimated against the cluster's first note, which scores 1.0.
+    """
+    # Notes without words would all share the empty signature
+    notes = [note for note in notes if _WORD_RE.search(note.content)]
+    if cache is None:
+        cache = SignatureCache(None, MinHasher(), SHINGLE_SIZE)
+    signatures = cache.signatures(notes, digests)
+    bands, rows = lsh_parameters(cache.hasher.num_perm, threshold)
+    pairs = candidate_pairs(signatures, bands, rows)
+
+    agreement = (signatures[pairs[:, 0]] == signatures[pairs[:, 1]]).mean(axis=1)
+    similar = pairs[agreement >= threshold].tolist()
+    clusters = []
+    for members in cluster_pairs(len(notes), similar):
+        members.sort(key=lambda i: notes[i].path)
+        first = signatures[members[0]]
+        clusters.append([
+            (notes[i].path, estimate_jaccard(first, signatures[i])) for i in members
+        ])
+    clusters.sort(key=lambda cluster: cluster[0][0])
+    return clusters
@@ -140,7 +140,7 @@ class Note:
             if not target:
                 continue
             
-            links.append(Link(target=target, alias=alias))
+            links.append(Link(self._path, target=target, alias=alias))
         return links
 
     def _remove_code_blocks(self, content: str) -> str:
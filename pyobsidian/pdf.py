@@ -0,0 +1,257 @@
+"""PDF export of notes through WeasyPrint, rendered in worker processes."""
+import html
+import os
+import posixpath
+import re
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import quote
+
+import markdown2
+from pypdf import PdfWriter
+from weasyprint import CSS, HTML
+from weasyprint.fonts import FontConfiguration
+
+from .export import MARKDOWN_EXTRAS, ExportManifest, html_path, link_targets, render_body, resolve_links
+from .hashindex import bytes_digest
+from .link import build_link_index
+
+# Notes rendered into each part of a book; a worker lays out one part at a
+# time, so this bounds its memory
+BOOK_PART_NOTES = 50
+
+# Name of the combined output, inside the output directory
+BOOK_NAME = "book.pdf"
+
+# Files, inside the output directory, recording what the per-note PDFs and
+# the book were rendered from
+MANIFEST_NAME = ".pyobsidian-pdf.json"
+BOOK_MANIFEST_NAME = ".pyobsidian-pdf-book.json"
+
+PDF_STYLESHEET = """@page { size: A4; margin: 2cm; }
+body { font: 11pt/1.5 serif; color: #222; }
+h1, h2, h3 { font-family: sans-serif; }
+pre { background: #f6f8fa; padding: 0.6em; white-space: pre-wrap; font-size: 9pt; }
+table { border-collapse: collapse; }
+th, td { border: 1px solid #ccc; padding: 0.2em 0.5em; }
+a.internal-link { color: #6b3fa0; text-decoration: none; }
+span.broken-link { color: #a33; }
+section.note { page-break-before: always; }
+"""
+
+_DOCUMENT = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+# (note path, title, content, resolved links)
+Item = Tuple[str, str, str, Dict[str, Optional[str]]]
+
+# Converter, stylesheet, font configuration, vault root and output directory
+# of each worker process, see _init_worker
+_worker_state: Optional[Tuple[markdown2.Markdown, CSS, FontConfiguration, str, str]] = None
+
+
+def note_anchor(path: str) -> str:
+    """Get the id of the section of a note in a book."""
+    return "note-" + re.sub(r'[^\w-]', '-', path.removesuffix(".md"))
+
+
+def _init_worker(stylesheet: str, root: str, output: str) -> None:
+    """Parse the stylesheet and set up fonts once per worker."""
+    global _worker_state
+    fonts = FontConfiguration()
+    _worker_state = (
+        markdown2.Markdown(extras=MARKDOWN_EXTRAS),
+        CSS(string=stylesheet, font_config=fonts),
+        fonts,
+        root,
+        output,
+    )
+
+
+def _write_pdf(document: str, target: str) -> None:
+    """Lay out an HTML document and write it as a PDF, replacing ``target`` atomically."""
+    _, css, fonts, root, _ = _worker_state
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(target), suffix=".pdf.tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            # Relative image paths in the notes resolve against the vault
+            HTML(string=document, base_url=root).write_pdf(f, stylesheets=[css], font_config=fonts)
+        os.replace(temp_path, target)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def _render_notes(items: List[Item]) -> int:
+    """Write one PDF per note, linking to the PDFs of other notes."""
+    converter, _, _, _, output = _worker_state
+    for path, title, content, resolved in items:
+        page = html_path(path, ".pdf")
+        page_dir = posixpath.dirname(page) or "."
+
+        def link_href(linked: str, heading: str) -> str:
+            return quote(posixpath.relpath(html_path(linked, ".pdf"), page_dir))
+
+        body = render_body(content, path, resolved, converter, link_href)
+        _write_pdf(_DOCUMENT.format(title=html.escape(title), body=body), os.path.join(output, page))
+    return len(items)
+
+
+def _render_part(number: int, items: List[Item], directory: str) -> str:
+    """Write a part of a book, one section per note, returning its path.
+
+    Links to notes of the same part jump to their sections; the anchors of
+    other parts are not known while laying out this one, so links to their
+    notes are kept as text.
+    """
+    converter = _worker_state[0]
+    in_part = {path for path, _, _, _ in items}
+    sections = []
+    for path, title, content, resolved in items:
+        resolved = {key: linked if linked in in_part else None for key, linked in resolved.items()}
+        body = render_body(content, path, resolved, converter, lambda linked, _: "#" + note_anchor(linked))
+        sections.append(f'<section class="note" id="{note_anchor(path)}">\n{body}\n</section>')
+    target = os.path.join(directory, f"part-{number:05d}.pdf")
+    _write_pdf(_DOCUMENT.format(title=f"Part {number}", body="\n".join(sections)), target)
+    return target
+
+
+def _assemble(parts: List[str], target: Path) -> None:
+    """Concatenate the parts of a book, keeping their outlines.
+
+    Only the compressed page objects of the parts are held until the book
+    is written, never their layout.
+    """
+    writer = PdfWriter()
+    for part in parts:
+        writer.append(part)
+    temp_path = target.with_name(target.name + ".tmp")
+    with open(temp_path, "wb") as f:
+        writer.write(f)
+    os.replace(temp_path, target)
+
+
+def _run(jobs: int, stylesheet: str, root: str, output: str) -> ProcessPoolExecutor:
+    """Start the worker pool, set up like :func:`_init_worker`."""
+    return ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(stylesheet, root, output))
+
+
+def export_pdf(
+    notes: List[Any],
+    root: Union[str, Path],
+    output: Union[str, Path],
+    book: bool = False,
+    jobs: Optional[int] = None,
+    stylesheet: str = PDF_STYLESHEET,
+    digests: Optional[Dict[str, str]] = None,
+    force: bool = False,
+) -> Dict[str, int]:
+    """Export notes as PDF files, one per note or combined in a book.
+
+    Notes are laid out in worker processes that each parse the stylesheet
+    and load the fonts once, instead of once per note; with a single job
+    they are laid out in this process. A book is laid out in parts of
+    ``BOOK_PART_NOTES`` notes, which are then concatenated, so no process
+    holds the layout of the whole book.
+
+    As for the HTML export, see :class:`export.ExportManifest`, the PDF of
+    a note is laid out again only when its note or where its links point
+    changed, and the book only when one of its notes did or the notes
+    changed order.
+
+    Args:
+        notes: The notes to export, in book order.
+        root: The vault root, against which relative image paths resolve.
+        output: The output directory.
+        book: Write a single ``book.pdf`` instead of one PDF per note.
+        jobs: Number of worker processes, defaults to the CPU count.
+        stylesheet: The CSS used for every note.
+        digests: Known content digests, by path; others are computed.
+        force: Lay out every PDF again; PDFs of deleted notes are still removed.
+
+    Returns:
+        The number of ``notes`` exported, of ``files`` written, of notes
+        left ``unchanged`` and of PDFs ``removed``.
+    """
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+    manifest_path = output / (BOOK_MANIFEST_NAME if book else MANIFEST_NAME)
+    # Loaded even when forced, to know the PDFs of deleted notes
+    old = ExportManifest.load(manifest_path)
+    manifest = ExportManifest()
+    digests = digests or {}
+    index = build_link_index(note.path for note in notes)
+    items = []
+    pending = []
+    for note in notes:
+        digest = digests.get(note.path) or bytes_digest(note.content.encode("utf-8"))
+        previous = old.pages.get(note.path)
+        targets = previous[2] if previous is not None and previous[1] == digest else link_targets(note.content)
+        resolved = resolve_links(targets, note.path, index)
+        signature = ExportManifest.signature(digest, note.title, resolved)
+        manifest.pages[note.path] = [signature, digest, targets]
+        item = (note.path, note.title, note.content, resolved)
+        items.append(item)
+        target = output / html_path(note.path, ".pdf")
+        if force or previous is None or previous[0] != signature or not target.exists():
+            pending.append(item)
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(items)))
+
+    if book:
+        # Dicts compare their order too, so a reordered book is laid out again
+        unchanged = (not force and list(old.pages.items()) == list(manifest.pages.items())
+                     and (output / BOOK_NAME).exists())
+        if not unchanged:
+            _write_book(items, jobs, stylesheet, str(root), output)
+        manifest.save(manifest_path)
+        return {"notes": len(items), "files": 0 if unchanged else 1,
+                "unchanged": len(items) if unchanged else 0, "removed": 0}
+
+    removed = 0
+    for path in set(old.pages) - set(manifest.pages):
+        try:
+            (output / html_path(path, ".pdf")).unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass
+    if jobs <= 1 or len(pending) <= 1:
+        _init_worker(stylesheet, str(root), str(output))
+        written = _render_notes(pending)
+    else:
+        size = -(-len(pending) // (jobs * 4))
+        chunks = [pending[i:i + size] for i in range(0, len(pending), size)]
+        with _run(jobs, stylesheet, str(root), str(output)) as executor:
+            written = sum(executor.map(_render_notes, chunks))
+    manifest.save(manifest_path)
+    return {"notes": len(items), "files": written, "unchanged": len(items) - len(pending), "removed": removed}
+
+
+def _write_book(items: List[Item], jobs: int, stylesheet: str, root: str, output: Path) -> None:
+    """Lay out a book in parts, in parallel, and concatenate them."""
+    directory = tempfile.mkdtemp(prefix=".book-", dir=output)
+    try:
+        parts = [(number, items[start:start + BOOK_PART_NOTES])
+                 for number, start in enumerate(range(0, len(items), BOOK_PART_NOTES), 1)]
+        if jobs <= 1 or len(parts) <= 1:
+            _init_worker(stylesheet, root, str(output))
+            paths = [_render_part(number, part, directory) for number, part in parts]
+        else:
+            with _run(jobs, stylesheet, root, str(output)) as executor:
+                futures = [executor.submit(_render_part, number, part, directory) for number, part in parts]
+                paths = [future.result() for future in futures]
+        _assemble(paths, output / BOOK_NAME)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
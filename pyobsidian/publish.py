@@ -0,0 +1,485 @@
+"""Static site publishing: pages with backlinks, tag pages, a link graph and search."""
+import html
+import json
+import os
+import re
+import shutil
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+from urllib.parse import quote
+
+import markdown2
+
+from .atomic import AtomicWriter
+from .export import (
+    MARKDOWN_EXTRAS,
+    PARALLEL_THRESHOLD,
+    STYLESHEET,
+    STYLESHEET_NAME,
+    ExportManifest,
+    html_path,
+    link_targets,
+    render_body,
+    resolve_links,
+)
+from .frontmatter import frontmatter_end
+from .hashindex import bytes_digest
+from .link import build_link_index
+from .text import STOP_WORDS
+
+# File, inside the output directory, recording what each page was built from
+MANIFEST_NAME = ".pyobsidian-publish.json"
+
+# Directory, inside the output directory, of the generated pages and data
+SITE_DIR = "_site"
+
+# Times a word of the title counts over one of the body in search results
+TITLE_WEIGHT = 5
+
+# Search terms: runs of letters and digits, as matched by the client
+_TERM_RE = re.compile(r'[^\W_]{2,}')
+
+# Longer words are not indexed, they are mostly URLs and hashes
+MAX_TERM_LENGTH = 32
+
+PUBLISH_STYLESHEET = STYLESHEET + """nav { display: flex; gap: 1em; align-items: baseline; flex-wrap: wrap;
+      border-bottom: 1px solid #ddd; padding-bottom: 0.5em; }
+nav .search { position: relative; margin-left: auto; }
+#search-results { position: absolute; right: 0; z-index: 1; min-width: 20em; margin: 0; padding: 0.5em 1em;
+                  list-style: none; background: #fff; border: 1px solid #ddd; }
+#search-results:empty { display: none; }
+aside { border-top: 1px solid #ddd; margin-top: 2em; font-size: 0.9em; }
+a.tag { background: #eee; border-radius: 0.8em; padding: 0 0.5em; color: #555; text-decoration: none; }
+"""
+
+# Loads the index lazily: the document list on the first query, and the
+# shard of each query word as it is typed. Words match by prefix and every
+# word of the query must match.
+SEARCH_SCRIPT = r"""(function () {
+  "use strict";
+  var root = document.currentScript.dataset.root;
+  var base = root + "_site/search/";
+  var TERM = /[\p{L}\p{N}]{2,}/gu;
+  var docs = null;
+  var shards = new Map();
+
+  function load(url) {
+    return fetch(url).then(function (r) { return r.ok ? r.json() : {}; }).catch(function () { return {}; });
+  }
+
+  function shard(term) {
+    var key = Array.from(term).slice(0, 2).join("");
+    if (!shards.has(key)) shards.set(key, load(base + encodeURIComponent(key) + ".json"));
+    return shards.get(key);
+  }
+
+  function search(query) {
+    var terms = query.toLowerCase().match(TERM) || [];
+    if (!terms.length) return Promise.resolve([]);
+    docs = docs || load(base + "docs.json");
+    return Promise.all([docs].concat(terms.map(shard))).then(function (loaded) {
+      var meta = loaded[0], scores = null;
+      terms.forEach(function (term, i) {
+        var postings = loaded[i + 1], found = new Map();
+        Object.keys(postings).forEach(function (word) {
+          if (word.indexOf(term) !== 0) return;
+          var list = postings[word], doc = 0;
+          var weight = Math.log(1 + meta.count / (list.length / 2)) * (word === term ? 1 : 0.5);
+          for (var j = 0; j < list.length; j += 2) {
+            doc += list[j];
+            found.set(doc, Math.max(found.get(doc) || 0, list[j + 1] * weight));
+          }
+        });
+        if (scores === null) {
+          scores = found;
+        } else {
+          scores.forEach(function (score, doc) {
+            if (found.has(doc)) scores.set(doc, score + found.get(doc)); else scores.delete(doc);
+          });
+        }
+      });
+      return Array.from(scores).sort(function (a, b) { return b[1] - a[1]; }).slice(0, 20)
+        .map(function (entry) { return meta.docs[entry[0]]; }).filter(Boolean);
+    });
+  }
+
+  document.addEventListener("DOMContentLoaded", function () {
+    var input = document.getElementById("search");
+    var results = document.getElementById("search-results");
+    var latest = 0;
+    input.addEventListener("input", function () {
+      var query = ++latest;
+      search(input.value).then(function (hits) {
+        if (query !== latest) return;
+        results.replaceChildren.apply(results, hits.map(function (hit) {
+          var item = document.createElement("li"), link = document.createElement("a");
+          link.href = root + hit[0];
+          link.textContent = hit[1];
+          item.appendChild(link);
+          return item;
+        }));
+      });
+    });
+  });
+})();
+"""
+
+_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<link rel="stylesheet" href="{root}{stylesheet}">
+<script src="{root}{site}/search.js" data-root="{root}" defer></script>
+</head>
+<body>
+<nav>
+<a href="{root}{site}/notes.html">All notes</a>
+<a href="{root}{site}/tags.html">Tags</a>
+<span class="search"><input type="search" id="search" placeholder="Search" autocomplete="off">
+<ol id="search-results"></ol></span>
+</nav>
+<article>
+{body}
+</article>
+{aside}
+</body>
+</html>
+"""
+
+# (note path, title, content, resolved links, backlinks, tags, render, index)
+Item = Tuple[str, str, str, Dict[str, Optional[str]], List[List[str]], List[str], bool, bool]
+
+# Markdown converter and output directory of each worker process, see _init_worker
+_worker_state: Optional[Tuple[markdown2.Markdown, str]] = None
+
+
+def _root(page: str) -> str:
+    """Get the relative URL of the output directory from a page."""
+    return "../" * page.count("/")
+
+
+def _href(target: str, page: str) -> str:
+    """Get the relative URL of a page from another, both relative to the output directory."""
+    return html.escape(_root(page) + quote(target))
+
+
+def tag_page(tag: str) -> str:
+    """Get the path of the page of a tag, relative to the output directory."""
+    return f"{SITE_DIR}/tags/{tag}.html"
+
+
+def layout(title: str, body: str, page: str, aside: str = "") -> str:
+    """Wrap content in a site page with the navigation and search box."""
+    return _PAGE.format(
+        title=html.escape(title), root=_root(page), stylesheet=STYLESHEET_NAME, site=SITE_DIR,
+        body=body, aside=aside,
+    )
+
+
+def _link_list(entries: Iterable[Tuple[str, str]], page: str) -> str:
+    """Render ``(target page, text)`` entries as a list of links."""
+    items = "".join(
+        f'<li><a href="{_href(target, page)}">{html.escape(text)}</a></li>\n' for target, text in entries
+    )
+    return f"<ul>\n{items}</ul>"
+
+
+def note_aside(page: str, tags: List[str], backlinks: List[List[str]]) -> str:
+    """Render the tags and backlinks shown under a note."""
+    parts = []
+    if tags:
+        links = " ".join(
+            f'<a class="tag" href="{_href(tag_page(tag), page)}">#{html.escape(tag)}</a>' for tag in tags
+        )
+        parts.append(f'<p class="tags">{links}</p>')
+    if backlinks:
+        entries = ((html_path(source), title or source) for source, title in backlinks)
+        parts.append(f'<h2>Backlinks</h2>\n{_link_list(entries, page)}')
+    return "<aside>\n" + "\n".join(parts) + "\n</aside>" if parts else ""
+
+
+def note_terms(title: str, content: str) -> Dict[str, int]:
+    """Count the search terms of a note, its title words weighing ``TITLE_WEIGHT``."""
+    counts = Counter(_TERM_RE.findall(content[frontmatter_end(content):].lower()))
+    for term in _TERM_RE.findall(title.lower()):
+        counts[term] += TITLE_WEIGHT
+    return {
+        term: count for term, count in counts.items()
+        if len(term) <= MAX_TERM_LENGTH and term not in STOP_WORDS
+    }
+
+
+def shard_key(term: str) -> str:
+    """Get the name of the search index shard holding a term."""
+    return term[:2]
+
+
+def _init_worker(output: str) -> None:
+    """Create the Markdown converter once per worker."""
+    global _worker_state
+    _worker_state = (markdown2.Markdown(extras=MARKDOWN_EXTRAS), output)
+
+
+def _publish_chunk(items: List[Item]) -> List[Tuple[str, Optional[Dict[str, int]]]]:
+    """Render the pages and count the search terms of notes, as flagged by each item."""
+    converter, output = _worker_state
+    writer = AtomicWriter(durable=False)
+    results = []
+    for path, title, content, resolved, backlinks, tags, render, index in items:
+        if render:
+            page = html_path(path)
+            target = os.path.join(output, page)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            body = render_body(content, path, resolved, converter)
+            writer.write(target, layout(title or path, body, page, note_aside(page, tags, backlinks)))
+        results.append((path, note_terms(title, content) if index else None))
+    return results
+
+
+def _write_if_changed(path: Path, content: str) -> bool:
+    """Write a generated file unless it already has this content."""
+    try:
+        if path.read_text(encoding="utf-8") == content:
+            return False
+    except (OSError, ValueError):
+        path.parent.mkdir(parents=True, exist_ok=True)
+    AtomicWriter(durable=False).write(path, content)
+    return True
+
+
+def _assign_ids(old: Dict[str, List[Any]], paths: List[str]) -> Dict[str, int]:
+    """Give every note a search document id, keeping those it had and reusing freed ones."""
+    ids = {path: old[path][3] for path in paths if path in old}
+    used = set(ids.values())
+    free = (i for i in range(len(paths) + len(used)) if i not in used)
+    for path in paths:
+        if path not in ids:
+            ids[path] = next(free)
+    return ids
+
+
+def _update_shards(
+    directory: Path, stale: Set[int], postings: Dict[str, Dict[str, List[Tuple[int, int]]]], affected: Set[str]
+) -> int:
+    """Rewrite the affected search shards, dropping stale documents and adding new postings.
+
+    A shard maps each of its terms to a flat ``[doc id, weight, ...]``
+    list sorted by document, each id stored as the gap from the previous
+    one to keep the numbers short. Shards left empty are removed. Returns
+    the number of shards written or removed.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    for key in affected:
+        path = directory / f"{key}.json"
+        try:
+            shard = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            shard = {}
+        merged: Dict[str, List[Tuple[int, int]]] = {}
+        for term, flat in shard.items():
+            doc_id = 0
+            kept = []
+            for i in range(0, len(flat), 2):
+                doc_id += flat[i]
+                if doc_id not in stale:
+                    kept.append((doc_id, flat[i + 1]))
+            if kept:
+                merged[term] = kept
+        for term, pairs in postings.get(key, {}).items():
+            merged.setdefault(term, []).extend(pairs)
+        for term, pairs in merged.items():
+            pairs.sort()
+            previous = 0
+            flat = []
+            for doc_id, weight in pairs:
+                flat += (doc_id - previous, weight)
+                previous = doc_id
+            merged[term] = flat
+        if merged:
+            _write_if_changed(path, json.dumps(merged, sort_keys=True, ensure_ascii=False, separators=(",", ":")))
+        else:
+            path.unlink(missing_ok=True)
+    return len(affected)
+
+
+def _write_site_pages(output: Path, titles: Dict[str, str], tags: Dict[str, List[str]],
+                      edges: List[Tuple[str, str]], doc_ids: Dict[str, int]) -> None:
+    """Write the note and tag listings, the link graph and the search documents."""
+    site = output / SITE_DIR
+    by_title = sorted(titles, key=lambda path: (titles[path].lower(), path))
+
+    page = f"{SITE_DIR}/notes.html"
+    body = f"<h1>All notes</h1>\n{_link_list(((html_path(p), titles[p]) for p in by_title), page)}"
+    _write_if_changed(output / page, layout("All notes", body, page))
+
+    tagged: Dict[str, List[str]] = defaultdict(list)
+    for path in by_title:
+        for tag in tags[path]:
+            tagged[tag].append(path)
+    page = f"{SITE_DIR}/tags.html"
+    entries = ((tag_page(tag), f"#{tag} ({len(paths)})") for tag, paths in sorted(tagged.items()))
+    _write_if_changed(output / page, layout("Tags", f"<h1>Tags</h1>\n{_link_list(entries, page)}", page))
+    wanted = set()
+    for tag, paths in tagged.items():
+        page = tag_page(tag)
+        wanted.add(output / page)
+        body = f"<h1>#{html.escape(tag)}</h1>\n{_link_list(((html_path(p), titles[p]) for p in paths), page)}"
+        _write_if_changed(output / page, layout(f"#{tag}", body, page))
+    for directory, _, files in os.walk(site / "tags"):
+        for name in files:
+            if Path(directory, name) not in wanted:
+                Path(directory, name).unlink()
+
+    graph = {
+        "nodes": [{"id": path, "title": titles[path], "url": html_path(path), "tags": tags[path]}
+                  for path in sorted(titles)],
+        "links": [{"source": source, "target": target} for source, target in edges],
+    }
+    _write_if_changed(site / "graph.json", json.dumps(graph, ensure_ascii=False, separators=(",", ":")))
+
+    docs: List[Optional[List[str]]] = [None] * (max(doc_ids.values(), default=-1) + 1)
+    for path, doc_id in doc_ids.items():
+        docs[doc_id] = [html_path(path), titles[path]]
+    search = {"count": len(doc_ids), "docs": docs}
+    _write_if_changed(site / "search" / "docs.json", json.dumps(search, ensure_ascii=False, separators=(",", ":")))
+    _write_if_changed(site / "search.js", SEARCH_SCRIPT)
+    _write_if_changed(output / STYLESHEET_NAME, PUBLISH_STYLESHEET)
+    if "index.md" not in titles:
+        # Without an index note, the site opens on the list of notes
+        _write_if_changed(
+            output / "index.html",
+            f'<!DOCTYPE html>\n<meta http-equiv="refresh" content="0; url={SITE_DIR}/notes.html">\n',
+        )
+
+
+def publish_site(
+    notes: List[Any],
+    output: Union[str, Path],
+    digests: Optional[Dict[str, str]] = None,
+    force: bool = False,
+    jobs: Optional[int] = None,
+) -> Dict[str, int]:
+    """Publish notes as a static site, rebuilding only what changed.
+
+    Each note becomes a page, as in :func:`export.export_html`, followed by
+    its tags and the notes linking to it. The site also has a page per tag,
+    a list of all notes, the link graph as ``graph.json`` for graph views,
+    and a search index sharded by the first two letters of each word, of
+    which a small script loads only the shards a query needs.
+
+    A page is rendered again only when its signature changes: the note
+    content, where its links point or which notes link to it, so editing a
+    note re-renders it and the pages whose backlinks it adds or removes.
+    Only the search shards holding words of changed or removed notes are
+    rewritten. Work is spread over worker processes when there are at
+    least ``PARALLEL_THRESHOLD`` notes to render or index.
+
+    Args:
+        notes: The notes to publish; links to other notes are shown as
+            broken.
+        output: The output directory.
+        digests: Known content digests, by path; others are computed.
+        force: Render every page and rebuild the search index; pages of
+            deleted notes are still removed.
+        jobs: Number of worker processes, defaults to the CPU count.
+
+    Returns:
+        The number of pages ``rendered``, left ``unchanged`` and ``removed``,
+        and of notes ``indexed`` for search.
+    """
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+    manifest_path = output / MANIFEST_NAME
+    # Loaded even when forced, to know the pages of deleted notes
+    old = ExportManifest.load(manifest_path)
+    search_dir = output / SITE_DIR / "search"
+    if force or not old.pages:
+        # Shards cannot be updated without knowing which documents they hold
+        shutil.rmtree(search_dir, ignore_errors=True)
+    digests = digests or {}
+    index = build_link_index(note.path for note in notes)
+
+    titles, tags, targets, resolved, note_digests = {}, {}, {}, {}, {}
+    backlinks: Dict[str, Set[str]] = defaultdict(set)
+    edges = []
+    for note in notes:
+        digest = digests.get(note.path) or bytes_digest(note.content.encode("utf-8"))
+        previous = old.pages.get(note.path)
+        unchanged = previous is not None and previous[1] == digest
+        note_digests[note.path] = digest
+        titles[note.path] = note.title or note.path
+        tags[note.path] = list(note.tags)
+        targets[note.path] = previous[2] if unchanged else link_targets(note.content)
+        resolved[note.path] = resolve_links(targets[note.path], note.path, index)
+        for linked in sorted(set(resolved[note.path].values()) - {None}):
+            edges.append((note.path, linked))
+            if linked != note.path:
+                backlinks[linked].add(note.path)
+
+    doc_ids = _assign_ids(old.pages, [note.path for note in notes])
+    manifest = ExportManifest()
+    pending: List[Item] = []
+    rendered = 0
+    for note in notes:
+        path = note.path
+        incoming = [[source, titles[source]] for source in sorted(backlinks[path])]
+        signature = ExportManifest.signature(note_digests[path], titles[path], resolved[path], incoming)
+        previous = old.pages.get(path)
+        render = (force or previous is None or previous[0] != signature
+                  or not (output / html_path(path)).exists())
+        reindex = force or previous is None or previous[1] != note_digests[path]
+        manifest.pages[path] = [signature, note_digests[path], targets[path], doc_ids[path],
+                                [] if reindex else previous[4]]
+        rendered += render
+        if render or reindex:
+            pending.append((path, note.title, note.content, resolved[path], incoming, tags[path], render, reindex))
+
+    removed = 0
+    for path in set(old.pages) - set(manifest.pages):
+        try:
+            (output / html_path(path)).unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 1 or len(pending) < PARALLEL_THRESHOLD:
+        _init_worker(str(output))
+        results = _publish_chunk(pending)
+    else:
+        size = -(-len(pending) // (jobs * 4))
+        chunks = [pending[i:i + size] for i in range(0, len(pending), size)]
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(str(output),)) as executor:
+            results = [result for chunk in executor.map(_publish_chunk, chunks) for result in chunk]
+
+    # Shards to update: those that held words of removed or re-indexed
+    # notes, and those that will hold the words of re-indexed notes
+    stale = {old.pages[path][3] for path in set(old.pages) - set(manifest.pages)}
+    affected = {key for path in set(old.pages) - set(manifest.pages) for key in old.pages[path][4]}
+    postings: Dict[str, Dict[str, List[Tuple[int, int]]]] = defaultdict(dict)
+    indexed = 0
+    for path, terms in results:
+        if terms is None:
+            continue
+        indexed += 1
+        doc_id = doc_ids[path]
+        if path in old.pages:
+            stale.add(old.pages[path][3])
+            affected.update(old.pages[path][4])
+        keys = set()
+        for term, count in terms.items():
+            key = shard_key(term)
+            keys.add(key)
+            postings[key].setdefault(term, []).append((doc_id, count))
+        affected.update(keys)
+        manifest.pages[path][4] = sorted(keys)
+    _update_shards(search_dir, stale, postings, affected)
+
+    _write_site_pages(output, titles, tags, edges, doc_ids)
+    manifest.save(manifest_path)
+    return {"rendered": rendered, "unchanged": len(notes) - rendered, "removed": removed, "indexed": indexed}
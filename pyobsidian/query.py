@@ -0,0 +1,94 @@
+"""Query language for selecting notes.
+
+A query is a whitespace-separated list of terms that must all match:
+
+- ``tag:NAME`` the note has the tag
+- ``path:PREFIX`` the note path starts with the prefix, or matches it as a
+  glob when it contains ``*``, ``?`` or ``[``
+- ``title:TEXT`` the title contains the text
+- ``has:tags`` / ``has:links`` the note has at least one tag or link
+- any other term, or a ``"quoted phrase"``, must appear in the content
+
+Terms are case-insensitive and can be negated with a leading ``-``.
+"""
+import fnmatch
+import shlex
+from typing import Callable, Iterable, List
+
+from .core import Note
+
+Predicate = Callable[[Note], bool]
+
+
+class QueryError(ValueError):
+    """Raised when a query cannot be parsed."""
+
+
+def _term_predicate(term: str) -> Predicate:
+    """Build the predicate for a single, non-negated query term."""
+    field, sep, value = term.partition(":")
+    field = field.lower()
+    if not sep or field not in {"tag", "path", "title", "has"}:
+        text = term.lower()
+        return lambda note: text in note.content.lower()
+
+    if not value:
+        raise QueryError(f"Missing value for '{field}:'")
+    value = value.lower()
+
+    if field == "tag":
+        tag = value.lstrip("#")
+        return lambda note: tag in {t.lower() for t in note.tags}
+    if field == "path":
+        if any(c in value for c in "*?["):
+            return lambda note: fnmatch.fnmatch(note.path.lower(), value)
+        return lambda note: note.path.lower().startswith(value)
+    if field == "title":
+        return lambda note: value in note.title.lower()
+    if value == "tags":
+        return lambda note: bool(note.tags)
+    if value == "links":
+        return lambda note: bool(note.links)
+    raise QueryError(f"Unknown value for 'has:': {value}")
+
+
+def parse_query(query: str) -> Predicate:
+    """Compile a query into a predicate over notes.
+
+    Args:
+        query: The query string.
+
+    Returns:
+        A function returning True for notes matching every term.
+
+    Raises:
+        QueryError: If the query is malformed.
+    """
+    try:
+        terms = shlex.split(query)
+    except ValueError as e:
+        raise QueryError(f"Invalid query: {e}") from e
+
+    predicates: List[Predicate] = []
+    for term in terms:
+        negate = term.startswith("-") and len(term) > 1
+        predicate = _term_predicate(term[1:] if negate else term)
+        if negate:
+            predicate = (lambda p: lambda note: not p(note))(predicate)
+        predicates.append(predicate)
+
+    return lambda note: all(predicate(note) for predicate in predicates)
+
+
+def select_notes(notes: Iterable[Note], query: str) -> List[Note]:
+    """Return the notes matching a query.
+
+    Args:
+        notes: The notes to filter.
+        query: The query string.
+
+    Returns:
+        The matching notes, in their original order.
+    """
+    predicate = parse_query(query)
+    return [note for note in notes if predicate(note)]
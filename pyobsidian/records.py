@@ -0,0 +1,96 @@
+"""Streaming export of per-note records as NDJSON, CSV or a JSON array."""
+import csv
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+
+# How to compute each exportable field of a note
+FIELDS: Dict[str, Callable[[Any], Any]] = {
+    "path": lambda note: note.path,
+    "title": lambda note: note.title,
+    "tags": lambda note: list(note.tags),
+    "links": lambda note: [{"target": link.target, "alias": link.alias} for link in note.links],
+    "word_count": lambda note: note.word_count,
+}
+
+# Separator of list items in CSV cells
+CSV_LIST_SEPARATOR = ";"
+
+
+def parse_fields(spec: Optional[str]) -> List[str]:
+    """Parse a comma-separated list of field names, all fields if None.
+
+    Raises:
+        ValueError: If a field is unknown.
+    """
+    if not spec:
+        return list(FIELDS)
+    fields = [field.strip() for field in spec.split(",") if field.strip()]
+    unknown = [field for field in fields if field not in FIELDS]
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s): {', '.join(unknown)}; choose from {', '.join(FIELDS)}"
+        )
+    return fields
+
+
+def note_records(notes: Iterable[Any], fields: List[str]) -> Iterator[Dict[str, Any]]:
+    """Build the record of each note, computing only the requested fields."""
+    getters = [(field, FIELDS[field]) for field in fields]
+    for note in notes:
+        yield {field: getter(note) for field, getter in getters}
+
+
+def write_ndjson(records: Iterable[Dict[str, Any]], out: TextIO) -> int:
+    """Write one JSON object per line; returns the number of records."""
+    count = 0
+    for record in records:
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def write_json_array(records: Iterable[Dict[str, Any]], out: TextIO, key: str = "notes") -> int:
+    """Write ``{"<key>": [...]}`` one record at a time; returns the number of records."""
+    count = 0
+    out.write(f'{{"{key}": [')
+    for record in records:
+        out.write(("\n  " if not count else ",\n  ") + json.dumps(record, ensure_ascii=False))
+        count += 1
+    out.write("\n]}\n" if count else "]}\n")
+    return count
+
+
+def _csv_cell(value: Any) -> Any:
+    """Flatten a field value for a CSV cell; links keep only their target."""
+    if isinstance(value, list):
+        return CSV_LIST_SEPARATOR.join(
+            item["target"] if isinstance(item, dict) else str(item) for item in value
+        )
+    return value
+
+
+def write_csv(records: Iterable[Dict[str, Any]], out: TextIO, fields: List[str]) -> int:
+    """Write a header and one row per record; returns the number of records."""
+    writer = csv.writer(out)
+    writer.writerow(fields)
+    count = 0
+    for record in records:
+        writer.writerow([_csv_cell(record[field]) for field in fields])
+        count += 1
+    return count
+
+
+WRITERS: Dict[str, Callable[[Iterable[Dict[str, Any]], TextIO, List[str]], int]] = {
+    "ndjson": lambda records, out, fields: write_ndjson(records, out),
+    "json": lambda records, out, fields: write_json_array(records, out),
+    "csv": write_csv,
+}
+
+
+def export_records(notes: Iterable[Any], out: TextIO, format: str, fields: List[str]) -> int:
+    """Stream the records of notes to a text stream in one of :data:`WRITERS`.
+
+    Returns:
+        The number of records written.
+    """
+    return WRITERS[format](note_records(notes, fields), out, fields)
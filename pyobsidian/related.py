@@ -0,0 +1,289 @@
+"""All-pairs related notes computed in blocks over the TF-IDF index."""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .tfidf import TfidfIndex
+
+# Upper bound on the dense similarity block computed at once
+BLOCK_BYTES = 64 * 1024 * 1024
+
+# Upper bound on the dense note x term matrix of the most frequent terms
+DENSE_BYTES = 256 * 1024 * 1024
+
+# Terms in fewer notes than this always go through the sparse path
+DENSE_MIN_DF = 64
+
+# Files, inside the index directory, sharing the dense columns with workers
+_DENSE_FILE = "related_dense.npy"
+_DENSE_TERMS_FILE = "related_dense_terms.npy"
+
+# Index and dense columns loaded by each worker process, see _init_worker
+_worker_state: Optional[Tuple[TfidfIndex, np.ndarray, np.ndarray]] = None
+
+
+def dense_terms(index: TfidfIndex, max_bytes: int = DENSE_BYTES) -> np.ndarray:
+    """Pick the terms whose postings are worth storing densely.
+
+    The cost of the sparse product grows with the square of a term's
+    document frequency, so the few most frequent terms dominate it. Those
+    are multiplied as a dense matrix instead.
+
+    Args:
+        index: The TF-IDF index.
+        max_bytes: Memory budget of the dense note x term matrix.
+
+    Returns:
+        Term ids, most frequent first.
+    """
+    document_frequency = np.diff(np.asarray(index.postings.indptr))
+    max_terms = max_bytes // (4 * max(len(index), 1))
+    order = np.argsort(-document_frequency, kind="stable")[:max_terms]
+    return order[document_frequency[order] >= DENSE_MIN_DF]
+
+
+def dense_postings(index: TfidfIndex, terms: np.ndarray) -> np.ndarray:
+    """Build the note x term matrix of some terms as a dense array."""
+    postings = index.postings
+    dense = np.zeros((len(index), len(terms)), dtype=np.float32)
+    for column, term in enumerate(terms.tolist()):
+        start, end = postings.indptr[term], postings.indptr[term + 1]
+        dense[postings.indices[start:end], column] = postings.data[start:end]
+    return dense
+
+
+def top_k_block(
+    index: TfidfIndex,
+    start: int,
+    stop: int,
+    k: int,
+    min_similarity: float = 0.0,
+    terms: Optional[np.ndarray] = None,
+    dense: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Find the nearest neighbors of a contiguous block of notes.
+
+    The rows ``start:stop`` of the note x term matrix are multiplied by the
+    term x note postings into a dense block of similarities. The frequent
+    terms given in ``terms`` go through one dense matrix product with
+    ``dense``; every other term of the block is visited once and adds the
+    outer product of its block weights and its postings.
+
+    Args:
+        index: The TF-IDF index.
+        start: First note of the block.
+        stop: End of the block, exclusive.
+        k: Number of neighbors per note.
+        min_similarity: Minimum cosine similarity of a neighbor.
+        terms: Term ids stored densely, see :func:`dense_terms`.
+        dense: Their postings, as built by :func:`dense_postings`.
+
+    Returns:
+        Two ``(stop - start, k)`` arrays with the neighbor rows and their
+        similarities, best first. Missing neighbors have row -1.
+    """
+    matrix = index.matrix
+    # Plain views avoid the memmap subclass overhead on every slice
+    p_indptr, p_indices, p_data = (
+        np.asarray(getattr(index.postings, name)) for name in ("indptr", "indices", "data")
+    )
+    n_rows = stop - start
+    n_notes = len(index)
+
+    begin, end = int(matrix.indptr[start]), int(matrix.indptr[stop])
+    local_rows = np.repeat(
+        np.arange(n_rows), np.diff(np.asarray(matrix.indptr[start:stop + 1]))
+    )
+    block_terms = np.asarray(matrix.indices[begin:end])
+    values = np.asarray(matrix.data[begin:end])
+
+    if terms is not None and dense is not None and len(terms):
+        columns = np.full(matrix.shape[1], -1, dtype=np.int64)
+        columns[terms] = np.arange(len(terms))
+        block_columns = columns[block_terms]
+        is_dense = block_columns >= 0
+        block = np.zeros((n_rows, len(terms)), dtype=np.float32)
+        block[local_rows[is_dense], block_columns[is_dense]] = values[is_dense]
+        scores = block @ dense.T
+        sparse = ~is_dense
+        block_terms, local_rows, values = block_terms[sparse], local_rows[sparse], values[sparse]
+    else:
+        scores = np.zeros((n_rows, n_notes), dtype=np.float32)
+
+    # Group the remaining non-zeros by term
+    order = np.argsort(block_terms, kind="stable")
+    block_terms, local_rows, values = block_terms[order], local_rows[order], values[order]
+    bounds = np.flatnonzero(np.diff(block_terms)) + 1
+    for group_start, group_end in zip(
+        np.concatenate(([0], bounds)).tolist(),
+        np.concatenate((bounds, [len(block_terms)])).tolist(),
+    ):
+        if group_start == group_end:
+            continue
+        term = block_terms[group_start]
+        p_start, p_end = p_indptr[term], p_indptr[term + 1]
+        cols = p_indices[p_start:p_end]
+        weights = p_data[p_start:p_end]
+        rows = local_rows[group_start:group_end]
+        if len(rows) == 1:
+            scores[rows[0], cols] += values[group_start] * weights
+        else:
+            # Rows and columns are unique within a term, so fancy += is safe
+            scores[np.ix_(rows, cols)] += np.outer(values[group_start:group_end], weights)
+
+    scores[np.arange(n_rows), np.arange(start, stop)] = 0.0
+    scores[scores < max(min_similarity, np.finfo(np.float32).tiny)] = 0.0
+
+    k = min(k, n_notes)
+    if k <= 0:
+        empty = np.zeros((n_rows, 0))
+        return empty.astype(np.int64), empty
+    if k < n_notes:
+        neighbors = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        neighbors = np.tile(np.arange(n_notes), (n_rows, 1))
+    # Sort by decreasing similarity, then by row for stable output
+    neighbors = np.sort(neighbors, axis=1)
+    similarities = np.take_along_axis(scores, neighbors, axis=1)
+    order = np.argsort(-similarities, axis=1, kind="stable")
+    neighbors = np.take_along_axis(neighbors, order, axis=1)
+    similarities = np.take_along_axis(similarities, order, axis=1).astype(np.float64)
+    neighbors[similarities <= 0] = -1
+    return neighbors, similarities
+
+
+def _init_worker(directory: str) -> None:
+    """Memory-map the cached index and dense columns once per worker."""
+    global _worker_state
+    path = Path(directory)
+    _worker_state = (
+        TfidfIndex.load(path),
+        np.load(path / _DENSE_TERMS_FILE),
+        np.load(path / _DENSE_FILE, mmap_mode="r"),
+    )
+
+
+def _worker_block(
+    start: int, stop: int, k: int, min_similarity: float
+) -> Tuple[int, np.ndarray, np.ndarray]:
+    """Compute one block in a worker process."""
+    index, terms, dense = _worker_state
+    neighbors, similarities = top_k_block(index, start, stop, k, min_similarity, terms, dense)
+    return start, neighbors, similarities
+
+
+def related_notes(
+    index: TfidfIndex,
+    k: int = 10,
+    min_similarity: float = 0.0,
+    directory: Optional[Path] = None,
+    jobs: Optional[int] = None,
+    block_size: Optional[int] = None,
+) -> Dict[str, List[Tuple[str, float]]]:
+    """Find the top-k related notes of every note.
+
+    The notes are processed in blocks, so memory stays bounded by
+    ``BLOCK_BYTES`` per block plus ``DENSE_BYTES`` for the frequent terms,
+    whatever the size of the vault.
+
+    Args:
+        index: The TF-IDF index.
+        k: Number of related notes per note.
+        min_similarity: Minimum cosine similarity of a related note.
+        directory: Directory the index is saved in. When given and more
+            than one job is requested, blocks are spread over worker
+            processes that memory-map the index from there.
+        jobs: Number of worker processes, defaults to the CPU count.
+        block_size: Notes per block; by default as many as fit in
+            ``BLOCK_BYTES`` of dense similarities.
+
+    Returns:
+        The ``(path, similarity)`` pairs of every note, most similar first.
+    """
+    n_notes = len(index)
+    if block_size is None:
+        block_size = max(1, BLOCK_BYTES // (4 * max(n_notes, 1)))
+    blocks = [(start, min(start + block_size, n_notes)) for start in range(0, n_notes, block_size)]
+    jobs = jobs or os.cpu_count() or 1
+    terms = dense_terms(index)
+    dense = dense_postings(index, terms)
+
+    if directory is None or jobs <= 1 or len(blocks) <= 1:
+        results = (
+            (start, *top_k_block(index, start, stop, k, min_similarity, terms, dense))
+            for start, stop in blocks
+        )
+        return _collect(index, results)
+
+    # Share the dense columns through the page cache instead of pickling them
+    np.save(directory / _DENSE_TERMS_FILE, terms)
+    np.save(directory / _DENSE_FILE, dense)
+    del dense
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(blocks)),
+        initializer=_init_worker,
+        initargs=(str(directory),),
+    ) as executor:
+        futures = [
+            executor.submit(_worker_block, start, stop, k, min_similarity)
+            for start, stop in blocks
+        ]
+        return _collect(index, (future.result() for future in futures))
+
+
+def _collect(
+    index: TfidfIndex, results: Iterable[Tuple[int, np.ndarray, np.ndarray]]
+) -> Dict[str, List[Tuple[str, float]]]:
+    """Turn per-block neighbor arrays into ``(path, similarity)`` lists."""
+    related: Dict[str, List[Tuple[str, float]]] = {}
+    for start, neighbors, similarities in results:
+        for offset, (rows, values) in enumerate(zip(neighbors.tolist(), similarities.tolist())):
+            related[index.paths[start + offset]] = [
+                (index.paths[row], value) for row, value in zip(rows, values) if row >= 0
+            ]
+    return related
+
+
+def save_related(
+    path: Path, related: Dict[str, List[Tuple[str, float]]], generation: str
+) -> None:
+    """Write related notes to a JSON cache file.
+
+    Args:
+        path: The file to write.
+        related: The related notes of every note.
+        generation: The vault generation they were computed from.
+    """
+    data = {
+        "generation": generation,
+        "related": {source: [[p, round(s, 6)] for p, s in pairs] for source, pairs in related.items()},
+    }
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def load_related(
+    path: Path, generation: Optional[str] = None
+) -> Optional[Dict[str, List[Tuple[str, float]]]]:
+    """Load related notes written by :func:`save_related`.
+
+    Args:
+        path: The cache file.
+        generation: The expected vault generation, or None to accept any.
+
+    Returns:
+        The related notes, or None if the file is missing or stale.
+    """
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if generation is not None and data["generation"] != generation:
+            return None
+        return {
+            source: [(p, float(s)) for p, s in pairs]
+            for source, pairs in data["related"].items()
+        }
+    except (OSError, ValueError, KeyError):
+        return None
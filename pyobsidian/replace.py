@@ -0,0 +1,196 @@
+"""Vault-wide regular expression find and replace."""
+import bisect
+import difflib
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    try:
+        import sre_parse
+    except ImportError:  # The private parser moved again: no literal prefilter
+        sre_parse = None
+
+from .core import Note
+from .frontmatter import frontmatter_end
+from .text import code_spans
+
+# Below this many candidate notes, worker processes cost more than they save
+PARALLEL_THRESHOLD = 500
+
+# (path, new content, number of substitutions)
+Replacement = Tuple[str, str, int]
+
+
+def required_literal(pattern: str, flags: int = 0) -> Optional[str]:
+    """Find the longest literal text every match of a pattern contains.
+
+    Only the top level of the pattern is considered, so alternations and
+    repeats contribute nothing, but a literal found is always required.
+
+    Args:
+        pattern: The regular expression.
+        flags: The ``re`` flags it is compiled with.
+
+    Returns:
+        The literal, casefolded if the pattern ignores case, or None if
+        the pattern requires none, or if ``re``'s private parser is not
+        available in the form relied upon.
+    """
+    if sre_parse is None:
+        return None
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+        best, run = "", []
+        for op, value in list(parsed) + [(None, None)]:
+            if op is sre_parse.LITERAL:
+                run.append(chr(value))
+                continue
+            if len(run) > len(best):
+                best = "".join(run)
+            run = []
+        ignore_case = parsed.state.flags & re.IGNORECASE
+    except Exception:
+        # Private API: without it, every note is a candidate
+        return None
+    if not best:
+        return None
+    return best.casefold() if ignore_case else best
+
+
+def substitute(
+    content: str,
+    regex: "re.Pattern[str]",
+    repl: str,
+    skip_code: bool = False,
+    skip_frontmatter: bool = False,
+) -> Tuple[str, int]:
+    """Apply a substitution to a note, leaving protected regions alone.
+
+    The whole note is matched at once, so anchors and lookarounds see the
+    real context; matches overlapping a protected region are kept as is.
+
+    Args:
+        content: The note content.
+        regex: The compiled pattern.
+        repl: The replacement, with ``re.sub`` group references.
+        skip_code: Protect fenced code blocks and inline code.
+        skip_frontmatter: Protect the frontmatter block.
+
+    Returns:
+        The new content and the number of substitutions made.
+    """
+    end = frontmatter_end(content) if skip_frontmatter else 0
+    spans = code_spans(content, end) if skip_code else []
+    if end:
+        spans.insert(0, (0, end))
+    if not spans:
+        return regex.subn(repl, content)
+    starts = [start for start, _ in spans]
+    count = 0
+
+    def replace(match: "re.Match[str]") -> str:
+        nonlocal count
+        index = bisect.bisect_right(starts, match.start()) - 1
+        # The span starting before the match, or the next one, may overlap it
+        for start, stop in spans[max(index, 0):index + 2]:
+            if start < max(match.end(), match.start() + 1) and match.start() < stop:
+                return match.group(0)
+        count += 1
+        return match.expand(repl)
+
+    return regex.sub(replace, content), count
+
+
+def _replace_chunk(
+    items: List[Tuple[str, str]],
+    pattern: str,
+    flags: int,
+    repl: str,
+    skip_code: bool,
+    skip_frontmatter: bool,
+) -> List[Replacement]:
+    """Substitute in ``(path, content)`` pairs, returning the changed notes."""
+    regex = re.compile(pattern, flags)
+    results = []
+    for path, content in items:
+        new, count = substitute(content, regex, repl, skip_code, skip_frontmatter)
+        if count and new != content:
+            results.append((path, new, count))
+    return results
+
+
+def find_replacements(
+    notes: List[Note],
+    pattern: str,
+    repl: str,
+    flags: int = 0,
+    skip_code: bool = False,
+    skip_frontmatter: bool = False,
+    jobs: Optional[int] = None,
+) -> Iterator[Replacement]:
+    """Substitute a pattern in every note, yielding the notes that change.
+
+    Notes that lack the literal text every match requires are skipped
+    with a substring test. The remaining ones are processed in worker
+    processes when there are at least ``PARALLEL_THRESHOLD`` of them, and
+    results are yielded chunk by chunk, in note order, as they complete.
+
+    Args:
+        notes: The notes to search.
+        pattern: The regular expression.
+        repl: The replacement, with ``re.sub`` group references.
+        flags: The ``re`` flags to compile the pattern with.
+        skip_code: Protect fenced code blocks and inline code.
+        skip_frontmatter: Protect the frontmatter block.
+        jobs: Number of worker processes, defaults to the CPU count.
+
+    Raises:
+        re.error: If the pattern is invalid, or the replacement refers to a
+            group the pattern lacks.
+    """
+    regex = re.compile(pattern, flags)
+    literal = required_literal(pattern, flags)
+    folded = bool(regex.flags & re.IGNORECASE)
+    items = [
+        (note.path, note.content) for note in notes
+        if literal is None or literal in (note.content.casefold() if folded else note.content)
+    ]
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 1 or len(items) < PARALLEL_THRESHOLD:
+        for path, content in items:
+            new, count = substitute(content, regex, repl, skip_code, skip_frontmatter)
+            if count and new != content:
+                yield path, new, count
+        return
+    size = -(-len(items) // (jobs * 4))
+    chunks = [items[i:i + size] for i in range(0, len(items), size)]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(_replace_chunk, chunk, pattern, flags, repl, skip_code, skip_frontmatter)
+            for chunk in chunks
+        ]
+        for future in futures:
+            yield from future.result()
+
+
+def unified_diff(path: str, before: str, after: str, context: int = 3) -> str:
+    """Render the change of a note as a unified diff.
+
+    A last line without a line ending is marked like ``diff`` does, so it
+    does not run into the next line of the diff.
+    """
+    lines = difflib.unified_diff(
+        before.splitlines(keepends=True),
+        after.splitlines(keepends=True),
+        fromfile=f"a/{path}",
+        tofile=f"b/{path}",
+        n=context,
+    )
+    return "".join(
+        line if line.endswith("\n") else line + "\n\\ No newline at end of file\n" for line in lines
+    )
@@ -0,0 +1,153 @@
+"""Fixed-memory frequency sketches for very large corpora."""
+import heapq
+import math
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+
+class SpaceSaving:
+    """Space-Saving heavy hitters summary (Metwally, Agrawal and El Abbadi, 2005).
+
+    At most ``capacity`` items are tracked whatever the size of the stream.
+    When a new item arrives and the summary is full, the item with the
+    smallest count is evicted and the newcomer inherits its count as its
+    possible overestimate. For a stream of ``N`` occurrences:
+
+    - every tracked count overestimates the true count by at most its
+      recorded error, itself at most ``N / capacity``;
+    - every item occurring more than ``N / capacity`` times is tracked.
+
+    Summaries built over separate parts of a stream can be merged, which
+    makes the sketch usable as the reduce step of a parallel count.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize an empty summary.
+
+        Args:
+            capacity: Maximum number of tracked items.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.total = 0
+        self._counts: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        # Min-heap of (count, item); entries may be stale and are fixed lazily
+        self._heap: List[Tuple[int, str]] = []
+
+    @classmethod
+    def for_error(cls, epsilon: float) -> "SpaceSaving":
+        """Create a summary whose counts are within ``epsilon * N`` of the truth."""
+        if not 0 < epsilon < 1:
+            raise ValueError("epsilon must be between 0 and 1")
+        return cls(math.ceil(1 / epsilon))
+
+    def __len__(self) -> int:
+        """Get the number of tracked items."""
+        return len(self._counts)
+
+    def _pop_min(self) -> Tuple[int, str]:
+        """Remove and return the tracked item with the smallest count."""
+        while True:
+            count, item = self._heap[0]
+            current = self._counts[item]
+            if current == count:
+                heapq.heappop(self._heap)
+                return count, item
+            heapq.heapreplace(self._heap, (current, item))
+
+    def update(self, item: str, weight: int = 1) -> None:
+        """Record ``weight`` occurrences of an item.
+
+        Args:
+            item: The item.
+            weight: Number of occurrences.
+        """
+        self.total += weight
+        if item in self._counts:
+            self._counts[item] += weight
+            return
+        if len(self._counts) < self.capacity:
+            self._counts[item] = weight
+            self._errors[item] = 0
+            heapq.heappush(self._heap, (weight, item))
+            return
+        minimum, evicted = self._pop_min()
+        del self._counts[evicted], self._errors[evicted]
+        self._counts[item] = minimum + weight
+        self._errors[item] = minimum
+        heapq.heappush(self._heap, (minimum + weight, item))
+
+    def update_counts(self, counts: Mapping[str, int]) -> None:
+        """Record pre-aggregated occurrences, e.g. the word counts of one note."""
+        for item, weight in counts.items():
+            self.update(item, weight)
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """Combine two summaries of disjoint parts of a stream.
+
+        Counts and errors of common items add up; an item tracked by only
+        one summary may have been evicted from the other one with up to that
+        summary's minimum count, which is added to its error. The result
+        keeps the ``capacity`` largest counts (Agarwal et al., 2012).
+
+        Args:
+            other: The other summary.
+
+        Returns:
+            A new summary with the capacity of this one.
+        """
+        own_floor, other_floor = self.floor, other.floor
+        counts: Dict[str, int] = {}
+        errors: Dict[str, int] = {}
+        for item in set(self._counts) | set(other._counts):
+            counts[item] = self._counts.get(item, own_floor) + other._counts.get(item, other_floor)
+            errors[item] = self._errors.get(item, own_floor) + other._errors.get(item, other_floor)
+
+        merged = SpaceSaving(self.capacity)
+        merged.total = self.total + other.total
+        kept = heapq.nlargest(self.capacity, counts, key=lambda item: (counts[item], item))
+        merged._counts = {item: counts[item] for item in kept}
+        merged._errors = {item: errors[item] for item in kept}
+        merged._heap = [(count, item) for item, count in merged._counts.items()]
+        heapq.heapify(merged._heap)
+        return merged
+
+    @property
+    def floor(self) -> int:
+        """Get the largest count an untracked item may have.
+
+        This is zero until the summary fills up, then the smallest tracked
+        count, which is at most ``total / capacity``.
+        """
+        if len(self._counts) < self.capacity or not self._counts:
+            return 0
+        return min(self._counts.values())
+
+    @property
+    def max_error(self) -> int:
+        """Get the largest possible overestimate of any reported count."""
+        return max(self._errors.values(), default=0)
+
+    def top(self, n: int) -> List[Tuple[str, int, int]]:
+        """Get the items with the largest counts.
+
+        Args:
+            n: Number of items.
+
+        Returns:
+            ``(item, count, error)`` triples, largest count first; the true
+            count lies between ``count - error`` and ``count``.
+        """
+        items = heapq.nsmallest(
+            n, self._counts, key=lambda item: (-self._counts[item], item)
+        )
+        return [(item, self._counts[item], self._errors[item]) for item in items]
+
+    @classmethod
+    def from_counts(cls, capacity: int, counts: Iterable[Mapping[str, int]]) -> "SpaceSaving":
+        """Build a summary from a stream of pre-aggregated counts."""
+        sketch = cls(capacity)
+        for chunk in counts:
+            sketch.update_counts(chunk)
+        return sketch
@@ -0,0 +1,262 @@
+"""Minimal CSR sparse matrix built on NumPy."""
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+
+class CSRMatrix:
+    """A compressed sparse row matrix.
+
+    Only the handful of operations the analysis commands need are provided;
+    the layout matches ``scipy.sparse.csr_matrix`` so the arrays can be handed
+    to SciPy directly if it is available.
+    """
+
+    def __init__(
+        self,
+        data: np.ndarray,
+        indices: np.ndarray,
+        indptr: np.ndarray,
+        shape: Tuple[int, int],
+    ) -> None:
+        """Initialize a matrix from its CSR arrays.
+
+        Args:
+            data: Non-zero values, row by row.
+            indices: Column index of each value.
+            indptr: Row boundaries into ``data`` and ``indices``.
+            shape: Number of rows and columns.
+        """
+        self.data = data
+        self.indices = indices
+        self.indptr = indptr
+        self.shape = shape
+
+    @classmethod
+    def from_coo(
+        cls,
+        rows: np.ndarray,
+        cols: np.ndarray,
+        values: np.ndarray,
+        shape: Tuple[int, int],
+        dtype: type = np.float64,
+    ) -> "CSRMatrix":
+        """Build a matrix from coordinate triplets, summing duplicates.
+
+        Args:
+            rows: Row index of each entry.
+            cols: Column index of each entry.
+            values: Value of each entry.
+            shape: Number of rows and columns.
+            dtype: Data type of the stored values.
+
+        Returns:
+            The matrix with entries sorted by row and column.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        values = np.asarray(values, dtype=dtype)
+        n_rows, n_cols = shape
+
+        if rows.size == 0:
+            return cls(
+                np.zeros(0, dtype=dtype),
+                np.zeros(0, dtype=np.int32),
+                np.zeros(n_rows + 1, dtype=np.int64),
+                shape,
+            )
+
+        keys = rows * n_cols + cols
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        data = np.bincount(inverse, weights=values).astype(dtype)
+
+        unique_rows = unique_keys // n_cols
+        indices = (unique_keys % n_cols).astype(np.int32)
+        indptr = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(unique_rows, minlength=n_rows), out=indptr[1:])
+        return cls(data, indices, indptr, shape)
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[Tuple[np.ndarray, np.ndarray]],
+        n_cols: int,
+        dtype: type = np.float64,
+    ) -> "CSRMatrix":
+        """Build a matrix from per-row ``(indices, values)`` pairs.
+
+        Each row's indices must already be unique.
+
+        Args:
+            rows: The column indices and values of each row, in order.
+            n_cols: Number of columns.
+            dtype: Data type of the stored values.
+
+        Returns:
+            The assembled matrix.
+        """
+        all_indices = []
+        all_values = []
+        lengths = []
+        for indices, values in rows:
+            order = np.argsort(indices, kind="stable")
+            all_indices.append(np.asarray(indices, dtype=np.int32)[order])
+            all_values.append(np.asarray(values, dtype=dtype)[order])
+            lengths.append(len(indices))
+
+        indptr = np.zeros(len(lengths) + 1, dtype=np.int64)
+        if lengths:
+            np.cumsum(lengths, out=indptr[1:])
+        data = np.concatenate(all_values) if all_values else np.zeros(0, dtype=dtype)
+        indices = (
+            np.concatenate(all_indices) if all_indices else np.zeros(0, dtype=np.int32)
+        )
+        return cls(data, indices, indptr, (len(lengths), n_cols))
+
+    @property
+    def nnz(self) -> int:
+        """Get the number of stored values."""
+        return int(self.data.size)
+
+    def row(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the column indices and values of a row."""
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:end], self.data[start:end]
+
+    def row_ids(self) -> np.ndarray:
+        """Get the row index of every stored value."""
+        return np.repeat(
+            np.arange(self.shape[0], dtype=np.int64), np.diff(self.indptr)
+        )
+
+    def transpose(self) -> "CSRMatrix":
+        """Return the transposed matrix, also in CSR layout."""
+        n_rows, n_cols = self.shape
+        order = np.argsort(self.indices, kind="stable")
+        indices = self.row_ids()[order].astype(np.int32)
+        data = self.data[order]
+        indptr = np.zeros(n_cols + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=n_cols), out=indptr[1:])
+        return CSRMatrix(data, indices, indptr, (n_cols, n_rows))
+
+    def dot(self, vector: np.ndarray) -> np.ndarray:
+        """Multiply the matrix by a dense vector."""
+        products = self.data * vector[self.indices]
+        return np.bincount(self.row_ids(), weights=products, minlength=self.shape[0])
+
+    def vecmat(self, rows: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """Multiply a sparse row vector by the matrix.
+
+        Only the rows selected by the vector are touched, which makes this
+        the cheap direction when the matrix is an inverted index.
+
+        Args:
+            rows: Indices of the vector's non-zero entries.
+            weights: Values of the vector's non-zero entries.
+
+        Returns:
+            A dense vector with one entry per column.
+        """
+        result = np.zeros(self.shape[1], dtype=np.float64)
+        indptr = self.indptr
+        for row, weight in zip(np.asarray(rows).tolist(), np.asarray(weights).tolist()):
+            start, end = indptr[row], indptr[row + 1]
+            # Column indices are unique within a row, so fancy += is safe
+            result[self.indices[start:end]] += weight * self.data[start:end]
+        return result
+
+    def matmat(self, dense: np.ndarray, chunk_nnz: int = 4096) -> np.ndarray:
+        """Multiply the matrix by a dense matrix.
+
+        Rows are processed in chunks of about ``chunk_nnz`` stored values.
+        Small chunks keep the intermediate products in the CPU cache, which
+        is several times faster than one large gather.
+
+        Args:
+            dense: A ``(n_cols, k)`` array.
+            chunk_nnz: Stored values multiplied at once.
+
+        Returns:
+            The ``(n_rows, k)`` product.
+        """
+        n_rows = self.shape[0]
+        dtype = np.result_type(self.data.dtype, dense.dtype)
+        result = np.zeros((n_rows, dense.shape[1]), dtype=dtype)
+        indptr = np.asarray(self.indptr)
+        start = 0
+        while start < n_rows:
+            stop = int(np.searchsorted(indptr, indptr[start] + chunk_nnz, side="right")) - 1
+            stop = min(max(stop, start + 1), n_rows)
+            begin, end = indptr[start], indptr[stop]
+            if end > begin:
+                products = self.data[begin:end, None] * dense[self.indices[begin:end]]
+                offsets = indptr[start:stop] - begin
+                nonempty = np.diff(indptr[start:stop + 1]) > 0
+                # Segments of consecutive non-empty rows cover the chunk exactly
+                result[start:stop][nonempty] = np.add.reduceat(
+                    products, offsets[nonempty], axis=0
+                )
+            start = stop
+        return result
+
+    def select_columns(self, columns: np.ndarray) -> "CSRMatrix":
+        """Return the matrix restricted to some columns, renumbered in order.
+
+        Args:
+            columns: Sorted indices of the columns to keep.
+
+        Returns:
+            A ``(n_rows, len(columns))`` matrix.
+        """
+        mapping = np.full(self.shape[1], -1, dtype=np.int64)
+        mapping[columns] = np.arange(len(columns))
+        new_indices = mapping[self.indices]
+        keep = new_indices >= 0
+        indptr = np.zeros(self.shape[0] + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(self.row_ids()[keep], minlength=self.shape[0]), out=indptr[1:]
+        )
+        return CSRMatrix(
+            np.asarray(self.data)[keep],
+            new_indices[keep].astype(np.int32),
+            indptr,
+            (self.shape[0], len(columns)),
+        )
+
+    def row_sums(self) -> np.ndarray:
+        """Get the sum of each row."""
+        return np.bincount(
+            self.row_ids(), weights=self.data, minlength=self.shape[0]
+        )
+
+    def scale_rows(self, factors: np.ndarray) -> "CSRMatrix":
+        """Return a copy with every row multiplied by a factor."""
+        data = self.data * np.repeat(factors, np.diff(self.indptr))
+        return CSRMatrix(data, self.indices.copy(), self.indptr.copy(), self.shape)
+
+    def scale_columns(self, factors: np.ndarray) -> "CSRMatrix":
+        """Return a copy with every column multiplied by a factor."""
+        data = self.data * factors[self.indices]
+        return CSRMatrix(data, self.indices.copy(), self.indptr.copy(), self.shape)
+
+    def normalize_rows(self, norm: Optional[str] = "l2") -> "CSRMatrix":
+        """Return a copy with every row scaled to unit length.
+
+        Args:
+            norm: ``"l2"`` for Euclidean length or ``"l1"`` for sum.
+
+        Returns:
+            The normalized matrix. Empty rows are left as they are.
+        """
+        values = self.data * self.data if norm == "l2" else np.abs(self.data)
+        lengths = np.bincount(self.row_ids(), weights=values, minlength=self.shape[0])
+        if norm == "l2":
+            lengths = np.sqrt(lengths)
+        lengths[lengths == 0] = 1.0
+        return self.scale_rows(1.0 / lengths)
+
+    def to_dense(self) -> np.ndarray:
+        """Convert the matrix to a dense array."""
+        dense = np.zeros(self.shape, dtype=self.data.dtype)
+        dense[self.row_ids(), self.indices] = self.data
+        return dense
@@ -0,0 +1,97 @@
+"""Add and remove inline tags in note content, leaving everything else alone."""
+import re
+from typing import List, Tuple
+
+from .frontmatter import frontmatter_end
+from .text import code_spans
+
+# Lines a tag is not appended to: headings, indented code, tables and
+# horizontal rules
+_SKIP_LINE_RE = re.compile(r'#{1,6}(?:[ \t]|$)| {4}|\t|\||(?:[-*_][ \t]*){3,}$')
+
+
+def _inside(position: int, spans: List[Tuple[int, int]]) -> bool:
+    """Check whether an offset falls inside one of the spans."""
+    return any(start <= position < end for start, end in spans)
+
+
+def _tag_re(tag: str) -> "re.Pattern[str]":
+    """Match an inline ``#tag`` token, but not a longer or nested tag.
+
+    Tags match whatever their case, like ``tag:`` query terms.
+    """
+    return re.compile(rf'(?<!\S)#{re.escape(tag)}(?![\w/-])', re.IGNORECASE)
+
+
+def insert_tag(content: str, tag: str) -> str:
+    """Add ``#tag`` to a note.
+
+    The tag is appended to the first line of prose after the frontmatter,
+    outside code blocks; notes without such a line get it on a line of its
+    own at the end. The rest of the note is kept byte-for-byte.
+
+    Args:
+        content: The note content.
+        tag: The tag, without ``#``.
+
+    Returns:
+        The new content, unchanged if the note already has the tag, in
+        any case.
+    """
+    start = frontmatter_end(content)
+    spans = code_spans(content, start)
+    if any(not _inside(m.start(), spans) for m in _tag_re(tag).finditer(content, start)):
+        return content
+    position = start
+    while position < len(content):
+        end = content.find("\n", position)
+        end = len(content) if end < 0 else end
+        line = content[position:end].rstrip("\r")
+        if line.strip() and not _SKIP_LINE_RE.match(line) and not _inside(position, spans):
+            # Keep trailing spaces, which may be a hard line break, after the tag
+            text_end = position + len(line.rstrip(" \t"))
+            return content[:text_end] + f" #{tag}" + content[text_end:]
+        position = end + 1
+    separator = "" if not content or content.endswith("\n") else "\n"
+    return f"{content}{separator}#{tag}\n"
+
+
+def strip_tag(content: str, tag: str) -> str:
+    """Remove every inline ``#tag`` token of a note, outside frontmatter and code.
+
+    The tag is matched in any case. Only the token and the space separating it from its neighbours go; a
+    line holding nothing but the tag is removed whole.
+
+    Args:
+        content: The note content.
+        tag: The tag, without ``#``.
+
+    Returns:
+        The new content, unchanged if the note does not have the tag.
+    """
+    start = frontmatter_end(content)
+    spans = code_spans(content, start)
+    pieces = []
+    position = 0
+    for match in _tag_re(tag).finditer(content, start):
+        if _inside(match.start(), spans):
+            continue
+        begin, end = match.span()
+        line_start = content.rfind("\n", 0, begin) + 1
+        line_end = content.find("\n", end)
+        line_end = len(content) if line_end < 0 else line_end
+        before = content[line_start:begin]
+        after = content[end:line_end].rstrip("\r")
+        if not before.strip() and not after.strip():
+            # The tag is alone on its line
+            begin, end = line_start, min(line_end + 1, len(content))
+        elif not after.strip():
+            begin -= len(before) - len(before.rstrip(" \t"))
+        elif after[:1] in (" ", "\t"):
+            end += 1
+        if begin < position:
+            continue
+        pieces.append(content[position:begin])
+        position = end
+    pieces.append(content[position:])
+    return "".join(pieces)
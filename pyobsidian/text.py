@@ -0,0 +1,90 @@
+"""Markdown text helpers shared by the analysis and editing code."""
+import re
+from typing import List, Tuple
+
+# Common English stop words to filter out
+STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'he',
+    'in', 'is', 'it', 'its', 'of', 'on', 'that', 'the', 'to', 'was', 'were',
+    'will', 'with', 'this', 'but', 'they', 'have', 'had', 'what', 'when',
+    'where', 'who', 'which', 'why', 'how'
+}
+
+_FENCED_CODE_RE = re.compile(r'```[^`]*```', re.DOTALL)
+_INLINE_CODE_RE = re.compile(r'`[^`]+`')
+_LINK_RE = re.compile(r'\[\[.*?\]\]')
+_TAG_RE = re.compile(r'#\w+')
+_HEADER_RE = re.compile(r'^#+\s.*$', re.MULTILINE)
+_FORMATTING_RE = re.compile(r'[*_`]')
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+
+# Opening fence of a code block, and an inline code span of any backtick run
+_FENCE_RE = re.compile(r'^ {0,3}(`{3,}|~{3,})', re.MULTILINE)
+_CODE_SPAN_RE = re.compile(r'(`+)[^`\n].*?\1')
+
+
+def tokenize(content: str, min_length: int = 3) -> List[str]:
+    """Split note content into lowercase words for frequency analysis.
+
+    Code, links, tags, headers, formatting and stop words are dropped, so the
+    result only contains the prose of the note.
+
+    Args:
+        content: The raw note content.
+        min_length: Minimum length of a word to keep.
+
+    Returns:
+        The words in the order they appear.
+    """
+    # Remove code blocks and inline code
+    content = _FENCED_CODE_RE.sub('', content)
+    content = _INLINE_CODE_RE.sub('', content)
+
+    # Remove links and tags
+    content = _LINK_RE.sub('', content)
+    content = _TAG_RE.sub('', content)
+
+    # Remove headers
+    content = _HEADER_RE.sub('', content)
+
+    # Remove formatting and punctuation
+    content = _FORMATTING_RE.sub('', content)
+    content = _PUNCTUATION_RE.sub(' ', content)
+
+    words = content.lower().split()
+    return [w for w in words if len(w) >= min_length and w not in STOP_WORDS]
+
+
+def code_spans(content: str, start: int = 0) -> List[Tuple[int, int]]:
+    """Find the fenced code blocks and inline code spans of a note.
+
+    A fence is closed by a fence of the same character at least as long;
+    an unclosed fence runs to the end of the note.
+
+    Args:
+        content: The note content.
+        start: Offset to start looking from, such as the end of the
+            frontmatter.
+
+    Returns:
+        Sorted, non-overlapping ``(start, end)`` offsets.
+    """
+    spans = []
+    position = start
+    while True:
+        opening = _FENCE_RE.search(content, position)
+        if opening is None:
+            prose_end = len(content)
+        else:
+            prose_end = opening.start()
+        for inline in _CODE_SPAN_RE.finditer(content, position, prose_end):
+            spans.append(inline.span())
+        if opening is None:
+            return spans
+        fence = opening.group(1)
+        closing_re = re.compile(rf'^ {{0,3}}{re.escape(fence[0])}{{{len(fence)},}}[ \t]*$', re.MULTILINE)
+        line_end = content.find("\n", opening.end())
+        closing = closing_re.search(content, len(content) if line_end < 0 else line_end + 1)
+        end = len(content) if closing is None else closing.end()
+        spans.append((opening.start(), end))
+        position = end
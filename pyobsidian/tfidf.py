@@ -0,0 +1,239 @@
+"""TF-IDF index of the notes in a vault."""
+import heapq
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .cache import cache_path
+from .core import Note
+from .sparse import CSRMatrix
+from .text import tokenize
+
+# Directory, inside the cache directory, holding the index arrays
+CACHE_NAME = "tfidf"
+
+_ARRAYS = ("data", "indices", "indptr")
+
+
+class TfidfIndex:
+    """Unit-length TF-IDF vectors of every note.
+
+    The vectors are kept twice: as a note x term matrix to look up a note's
+    vector, and as its transpose, a term x note inverted index, so scoring a
+    query against every note only touches the postings of the query terms.
+    """
+
+    def __init__(
+        self,
+        paths: List[str],
+        idf: np.ndarray,
+        matrix: CSRMatrix,
+        postings: CSRMatrix,
+        terms: Optional[List[str]] = None,
+        terms_path: Optional[Path] = None,
+    ) -> None:
+        """Initialize the index from its matrices.
+
+        Args:
+            paths: Note paths, indexed by row.
+            idf: Inverse document frequency of each term.
+            matrix: Note x term matrix with unit-length rows.
+            postings: The transpose of ``matrix``.
+            terms: Terms, indexed by column.
+            terms_path: File to load the terms from when they are needed.
+        """
+        self.paths = paths
+        self.idf = idf
+        self.matrix = matrix
+        self.postings = postings
+        self._terms = terms
+        self._terms_path = terms_path
+        self._positions = {path: i for i, path in enumerate(paths)}
+
+    @classmethod
+    def build(cls, notes: Iterable[Note]) -> "TfidfIndex":
+        """Tokenize every note once and build the index.
+
+        Terms are the words returned by :func:`~pyobsidian.text.tokenize`
+        plus the note's tags, prefixed with ``#``. Term frequencies are
+        dampened logarithmically.
+
+        Args:
+            notes: The notes to index.
+
+        Returns:
+            The index.
+        """
+        vocabulary: Dict[str, int] = {}
+        paths = []
+        rows = []
+        for note in notes:
+            counts = Counter(tokenize(note.content))
+            counts.update(f"#{tag.lower()}" for tag in note.tags)
+            ids = np.fromiter(
+                (vocabulary.setdefault(term, len(vocabulary)) for term in counts),
+                dtype=np.int32,
+                count=len(counts),
+            )
+            tf = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+            paths.append(note.path)
+            rows.append((ids, 1.0 + np.log(tf)))
+
+        matrix = CSRMatrix.from_rows(rows, len(vocabulary))
+        document_frequency = np.bincount(matrix.indices, minlength=len(vocabulary))
+        idf = np.log((1 + len(paths)) / (1 + document_frequency)) + 1.0
+        matrix = matrix.scale_columns(idf).normalize_rows()
+        matrix.data = matrix.data.astype(np.float32)
+        return cls(paths, idf, matrix, matrix.transpose(), terms=list(vocabulary))
+
+    @property
+    def terms(self) -> List[str]:
+        """Get the indexed terms, indexed by column."""
+        if self._terms is None:
+            if self._terms_path is None:
+                return []
+            self._terms = json.loads(self._terms_path.read_text(encoding="utf-8"))
+        return self._terms
+
+    def __contains__(self, path: object) -> bool:
+        """Check if a note is in the index."""
+        return path in self._positions
+
+    def __len__(self) -> int:
+        """Get the number of indexed notes."""
+        return len(self.paths)
+
+    def position(self, path: str) -> Optional[int]:
+        """Get the row of a note, or None if it is not indexed."""
+        return self._positions.get(path)
+
+    def scores(self, path: str) -> np.ndarray:
+        """Get the cosine similarity of a note to every note.
+
+        This is one sparse matrix-vector product over the inverted index.
+
+        Args:
+            path: The path of an indexed note.
+
+        Returns:
+            One similarity per note; the note itself scores zero.
+        """
+        i = self._positions[path]
+        indices, values = self.matrix.row(i)
+        scores = self.postings.vecmat(indices, values)
+        scores[i] = 0.0
+        return scores
+
+    def similar(
+        self, path: str, limit: int = 10, min_similarity: float = 0.0
+    ) -> List[Tuple[str, float]]:
+        """Find the notes most similar to a note.
+
+        Args:
+            path: The path of the note.
+            limit: Maximum number of results.
+            min_similarity: Minimum cosine similarity of a result.
+
+        Returns:
+            ``(path, similarity)`` pairs, most similar first. Empty if the
+            note is not indexed.
+        """
+        if path not in self._positions:
+            return []
+        scores = self.scores(path)
+        candidates = np.flatnonzero((scores > 0) & (scores >= min_similarity))
+        if candidates.size > limit:
+            # Cut the candidates down to the top scores before the heap
+            top = np.argpartition(scores[candidates], -limit)[-limit:]
+            candidates = np.sort(candidates[top])
+        best = heapq.nlargest(
+            limit, candidates.tolist(), key=lambda j: (scores[j], -j)
+        )
+        return [(self.paths[j], float(scores[j])) for j in best]
+
+    def save(self, directory: Path, generation: str) -> None:
+        """Write the index to a directory.
+
+        The metadata file is written last, so an interrupted save leaves an
+        index that :meth:`load` rejects.
+
+        Args:
+            directory: The directory to write to.
+            generation: The vault generation the index was built from.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        meta = directory / "meta.json"
+        if meta.exists():
+            meta.unlink()
+        for prefix, matrix in (("matrix", self.matrix), ("postings", self.postings)):
+            for name in _ARRAYS:
+                np.save(directory / f"{prefix}_{name}.npy", getattr(matrix, name))
+        np.save(directory / "idf.npy", self.idf)
+        (directory / "paths.json").write_text(json.dumps(self.paths), encoding="utf-8")
+        (directory / "terms.json").write_text(json.dumps(self.terms), encoding="utf-8")
+        meta.write_text(
+            json.dumps({"generation": generation, "shape": list(self.matrix.shape)}),
+            encoding="utf-8",
+        )
+
+    @classmethod
+    def load(
+        cls, directory: Path, generation: Optional[str] = None
+    ) -> Optional["TfidfIndex"]:
+        """Load an index written by :meth:`save`.
+
+        The arrays are memory-mapped, so loading is cheap and a query only
+        reads the pages it touches.
+
+        Args:
+            directory: The directory the index was saved to.
+            generation: The expected vault generation, or None to accept any.
+
+        Returns:
+            The index, or None if it is missing, stale or unreadable.
+        """
+        try:
+            meta = json.loads((directory / "meta.json").read_text(encoding="utf-8"))
+            if generation is not None and meta["generation"] != generation:
+                return None
+            n_notes, n_terms = meta["shape"]
+            matrices = {}
+            for prefix, shape in (("matrix", (n_notes, n_terms)), ("postings", (n_terms, n_notes))):
+                arrays = [
+                    np.load(directory / f"{prefix}_{name}.npy", mmap_mode="r")
+                    for name in _ARRAYS
+                ]
+                matrices[prefix] = CSRMatrix(*arrays, shape=shape)
+            idf = np.load(directory / "idf.npy")
+            paths = json.loads((directory / "paths.json").read_text(encoding="utf-8"))
+        except (OSError, EOFError, ValueError, KeyError):
+            return None
+        return cls(
+            paths,
+            idf,
+            matrices["matrix"],
+            matrices["postings"],
+            terms_path=directory / "terms.json",
+        )
+
+
+def load_tfidf_index(vault: Any) -> TfidfIndex:
+    """Get the TF-IDF index of a vault, rebuilding it only when stale.
+
+    Args:
+        vault: The vault to index.
+
+    Returns:
+        The cached index if it matches the vault's generation, otherwise a
+        freshly built one, which is cached for the next call.
+    """
+    generation = vault.generation
+    directory = cache_path(vault.vault_path, CACHE_NAME)
+    index = TfidfIndex.load(directory, generation)
+    if index is None:
+        index = TfidfIndex.build(vault.get_all_notes())
+        index.save(directory, generation)
+    return index
@@ -0,0 +1,168 @@
+"""Timeline of note modification and creation times, sorted for range queries."""
+import bisect
+import os
+from datetime import date, datetime, time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .frontmatter import split_frontmatter
+
+# Frontmatter fields holding the creation and last update date of a note
+CREATED_FIELDS = ("created", "date")
+UPDATED_FIELDS = ("updated", "modified")
+
+# (mtime, birth time, frontmatter created, frontmatter updated), as timestamps
+Dates = Tuple[Optional[float], Optional[float], Optional[float], Optional[float]]
+
+
+def _timestamp(value: Any) -> Optional[float]:
+    """Convert a frontmatter date, datetime or ISO string to a timestamp."""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, date):
+        return datetime.combine(value, time()).timestamp()
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.strip()).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+def _field(frontmatter: Dict[str, Any], names: Tuple[str, ...]) -> Optional[float]:
+    """Get the first frontmatter field of ``names`` that holds a date."""
+    for name in names:
+        if name in frontmatter:
+            stamp = _timestamp(frontmatter[name])
+            if stamp is not None:
+                return stamp
+    return None
+
+
+def note_dates(content: str, stat: Optional[os.stat_result] = None) -> Dates:
+    """Collect the dates of a note from its file stats and frontmatter.
+
+    Args:
+        content: The raw note content.
+        stat: The note file's stats, if known.
+
+    Returns:
+        ``(mtime, birth time, created, updated)``; the birth time is only
+        known on platforms reporting ``st_birthtime``.
+    """
+    frontmatter = split_frontmatter(content)[0] if content.startswith("---") else {}
+    return (
+        stat.st_mtime if stat is not None else None,
+        getattr(stat, "st_birthtime", None),
+        _field(frontmatter, CREATED_FIELDS),
+        _field(frontmatter, UPDATED_FIELDS),
+    )
+
+
+class Timeline:
+    """Dates of notes, with notes kept sorted by modification and creation.
+
+    A note's modification time is its file mtime, or its frontmatter
+    ``updated`` date when no file stats are known. Its creation time is its
+    frontmatter ``created`` date, or the file birth time. Range queries are
+    two bisections, and notes are added and removed without re-sorting.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty timeline."""
+        self._dates: Dict[str, Dates] = {}
+        self._modified: List[Tuple[float, str]] = []
+        self._created: List[Tuple[float, str]] = []
+
+    @classmethod
+    def from_dates(cls, dates: Dict[str, Dates]) -> "Timeline":
+        """Build a timeline from the dates of many notes, sorting only once."""
+        timeline = cls()
+        timeline._dates = dict(dates)
+        for path, entry in timeline._dates.items():
+            modified, created = cls._keys(entry)
+            if modified is not None:
+                timeline._modified.append((modified, path))
+            if created is not None:
+                timeline._created.append((created, path))
+        timeline._modified.sort()
+        timeline._created.sort()
+        return timeline
+
+    def __len__(self) -> int:
+        """Get the number of notes on the timeline."""
+        return len(self._dates)
+
+    @staticmethod
+    def _keys(dates: Dates) -> Tuple[Optional[float], Optional[float]]:
+        """Get the modification and creation times of some note dates."""
+        mtime, birth, created, updated = dates
+        return (
+            mtime if mtime is not None else updated,
+            created if created is not None else birth,
+        )
+
+    def add(self, path: str, dates: Dates) -> None:
+        """Add a note, replacing its previous dates if any.
+
+        Args:
+            path: The path of the note.
+            dates: The note dates, see :func:`note_dates`.
+        """
+        self.remove(path)
+        self._dates[path] = dates
+        modified, created = self._keys(dates)
+        if modified is not None:
+            bisect.insort(self._modified, (modified, path))
+        if created is not None:
+            bisect.insort(self._created, (created, path))
+
+    def remove(self, path: str) -> None:
+        """Remove a note from the timeline, if present."""
+        dates = self._dates.pop(path, None)
+        if dates is None:
+            return
+        modified, created = self._keys(dates)
+        for entries, key in ((self._modified, modified), (self._created, created)):
+            if key is not None:
+                i = bisect.bisect_left(entries, (key, path))
+                if i < len(entries) and entries[i] == (key, path):
+                    del entries[i]
+
+    def modified(self, path: str) -> Optional[float]:
+        """Get the modification time of a note."""
+        dates = self._dates.get(path)
+        return self._keys(dates)[0] if dates else None
+
+    def created(self, path: str) -> Optional[float]:
+        """Get the creation time of a note."""
+        dates = self._dates.get(path)
+        return self._keys(dates)[1] if dates else None
+
+    @staticmethod
+    def _between(
+        entries: List[Tuple[float, str]], start: float, end: Optional[float]
+    ) -> List[Tuple[float, str]]:
+        """Slice sorted ``(time, path)`` entries to ``start <= time < end``."""
+        low = bisect.bisect_left(entries, (start, ""))
+        high = len(entries) if end is None else bisect.bisect_left(entries, (end, ""))
+        return entries[low:high]
+
+    def modified_between(
+        self, start: float, end: Optional[float] = None
+    ) -> List[Tuple[float, str]]:
+        """Get the notes modified in a time range.
+
+        Args:
+            start: Start of the range, as a timestamp, inclusive.
+            end: End of the range, exclusive; None for no end.
+
+        Returns:
+            ``(modification time, path)`` pairs, oldest first.
+        """
+        return self._between(self._modified, start, end)
+
+    def created_between(
+        self, start: float, end: Optional[float] = None
+    ) -> List[Tuple[float, str]]:
+        """Get the notes created in a time range, like :meth:`modified_between`."""
+        return self._between(self._created, start, end)
@@ -0,0 +1,349 @@
+"""Latent semantic topic space of a vault, built from its TF-IDF index."""
+import json
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+from .cache import cache_path
+from .sparse import CSRMatrix
+from .tfidf import TfidfIndex, load_tfidf_index
+
+# Directory, inside the cache directory, holding the embedding
+CACHE_NAME = "topics"
+
+# Dimensions of the topic space
+DIMENSIONS = 100
+
+# Terms in fewer notes than this carry no topical signal and are dropped
+MIN_DOCUMENT_FREQUENCY = 2
+
+
+def _orthonormalize(matrix: np.ndarray) -> np.ndarray:
+    """Orthonormalize the columns of a tall matrix with Cholesky QR.
+
+    Only two matrix products and a small Cholesky factorization are needed,
+    much cheaper than Householder QR on a tall matrix; it falls back to QR
+    when the Gram matrix is too ill-conditioned to factor.
+    """
+    gram = matrix.T.astype(np.float64) @ matrix.astype(np.float64)
+    try:
+        factor = np.linalg.cholesky(gram)
+    except np.linalg.LinAlgError:
+        return np.linalg.qr(matrix)[0]
+    return (matrix @ np.linalg.inv(factor).T.astype(matrix.dtype)).astype(matrix.dtype)
+
+
+def randomized_svd(
+    matrix: CSRMatrix,
+    transpose: CSRMatrix,
+    rank: int,
+    oversample: int = 10,
+    n_iter: int = 2,
+    seed: int = 0,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Compute a truncated SVD with randomized range finding.
+
+    The range of the matrix is sampled with a Gaussian test matrix and
+    refined with a few power iterations; the small projected matrix is then
+    decomposed exactly (Halko, Martinsson and Tropp, 2011). Only sparse x
+    dense products touch the input.
+
+    Args:
+        matrix: The ``(m, n)`` matrix.
+        transpose: Its ``(n, m)`` transpose.
+        rank: Number of singular values to keep.
+        oversample: Extra samples improving the accuracy of the range.
+        n_iter: Number of power iterations.
+        seed: Seed of the test matrix.
+
+    Returns:
+        ``U`` ``(m, rank)``, ``S`` ``(rank,)`` and ``Vt`` ``(rank, n)``.
+    """
+    n_rows, n_cols = matrix.shape
+    rank = min(rank, n_rows, n_cols)
+    samples = min(rank + oversample, n_rows, n_cols)
+    rng = np.random.default_rng(seed)
+
+    omega = rng.standard_normal((n_cols, samples)).astype(np.float32)
+    q = _orthonormalize(matrix.matmat(omega))
+    for _ in range(n_iter):
+        # Re-orthonormalize at each step to keep small singular values
+        q = _orthonormalize(transpose.matmat(q))
+        q = _orthonormalize(matrix.matmat(q))
+    q, _ = np.linalg.qr(q)
+
+    projected = transpose.matmat(q).T
+    u_small, s, vt = np.linalg.svd(projected, full_matrices=False)
+    return (q @ u_small)[:, :rank], s[:rank], vt[:rank]
+
+
+def _nearest(points: np.ndarray, centers: np.ndarray, chunk: int = 8192) -> np.ndarray:
+    """Get the index of the nearest center of every point."""
+    center_norms = (centers * centers).sum(axis=1)
+    labels = np.empty(len(points), dtype=np.int64)
+    for start in range(0, len(points), chunk):
+        block = points[start:start + chunk]
+        labels[start:start + chunk] = np.argmin(center_norms - 2 * block @ centers.T, axis=1)
+    return labels
+
+
+def minibatch_kmeans(
+    points: np.ndarray,
+    n_clusters: int,
+    batch_size: int = 1024,
+    n_iter: int = 100,
+    seed: int = 0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Cluster points with mini-batch k-means (Sculley, 2010).
+
+    Centers are seeded with k-means++ on a sample, then each iteration moves
+    them towards the mean of a random batch, with a per-center learning
+    rate that decays as the center absorbs more points.
+
+    Args:
+        points: ``(n, d)`` points.
+        n_clusters: Number of clusters.
+        batch_size: Points per iteration.
+        n_iter: Number of iterations.
+        seed: Seed of the sampling.
+
+    Returns:
+        The ``(n_clusters, d)`` centers and the label of every point.
+    """
+    n_points = len(points)
+    n_clusters = min(n_clusters, n_points)
+    rng = np.random.default_rng(seed)
+
+    sample_size = min(n_points, max(20 * n_clusters, batch_size))
+    sample = points[rng.choice(n_points, sample_size, replace=False)]
+    centers = [sample[rng.integers(len(sample))]]
+    distances = ((sample - centers[0]) ** 2).sum(axis=1)
+    for _ in range(1, n_clusters):
+        # k-means++: pick far-away points with higher probability
+        total = distances.sum()
+        if total > 0:
+            choice = rng.choice(len(sample), p=distances / total)
+        else:
+            choice = rng.integers(len(sample))
+        centers.append(sample[choice])
+        distances = np.minimum(distances, ((sample - sample[choice]) ** 2).sum(axis=1))
+    centers = np.array(centers, dtype=np.float64)
+
+    counts = np.zeros(n_clusters)
+    for _ in range(n_iter):
+        batch = points[rng.integers(0, n_points, min(batch_size, n_points))]
+        labels = _nearest(batch, centers)
+        batch_counts = np.bincount(labels, minlength=n_clusters)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, batch)
+        counts += batch_counts
+        moved = batch_counts > 0
+        rate = (batch_counts[moved] / counts[moved])[:, None]
+        centers[moved] += rate * (sums[moved] / batch_counts[moved][:, None] - centers[moved])
+
+    return centers, _nearest(points, centers)
+
+
+class TopicModel:
+    """Notes embedded in a low-dimensional latent semantic space.
+
+    Each note is represented by its row of ``U * S`` from a truncated SVD of
+    the TF-IDF matrix, scaled to unit length, so cosine similarity is a dot
+    product between embeddings.
+    """
+
+    def __init__(
+        self,
+        paths: List[str],
+        embedding: np.ndarray,
+        components: np.ndarray,
+        terms: List[str],
+    ) -> None:
+        """Initialize the model.
+
+        Args:
+            paths: Note paths, indexed by row.
+            embedding: ``(n_notes, dims)`` unit-length note vectors.
+            components: ``(dims, n_terms)`` term loadings of each dimension.
+            terms: Terms, indexed by column of ``components``.
+        """
+        self.paths = paths
+        self.embedding = embedding
+        self.components = components
+        self.terms = terms
+        self._positions = {path: i for i, path in enumerate(paths)}
+
+    @classmethod
+    def build(
+        cls, index: TfidfIndex, dims: int = DIMENSIONS, seed: int = 0
+    ) -> "TopicModel":
+        """Reduce a TF-IDF index to a latent semantic space.
+
+        Args:
+            index: The TF-IDF index of the vault.
+            dims: Dimensions of the space.
+            seed: Seed of the randomized SVD.
+
+        Returns:
+            The model.
+        """
+        document_frequency = np.diff(np.asarray(index.postings.indptr))
+        columns = np.flatnonzero(document_frequency >= MIN_DOCUMENT_FREQUENCY)
+        matrix = index.matrix.select_columns(columns)
+        terms = index.terms
+        if not len(columns) or not len(index):
+            empty = np.zeros((len(index), 0), dtype=np.float32)
+            return cls(list(index.paths), empty, np.zeros((0, 0), dtype=np.float32), [])
+
+        u, s, vt = randomized_svd(matrix, matrix.transpose(), dims, seed=seed)
+        embedding = u * s
+        lengths = np.linalg.norm(embedding, axis=1, keepdims=True)
+        lengths[lengths == 0] = 1.0
+        return cls(
+            list(index.paths),
+            (embedding / lengths).astype(np.float32),
+            vt.astype(np.float32),
+            [terms[i] for i in columns.tolist()],
+        )
+
+    def similar(
+        self, path: str, limit: int = 10, min_similarity: float = 0.0
+    ) -> List[Tuple[str, float]]:
+        """Find the notes closest to a note in the topic space.
+
+        Args:
+            path: The path of the note.
+            limit: Maximum number of results.
+            min_similarity: Minimum cosine similarity of a result.
+
+        Returns:
+            ``(path, similarity)`` pairs, most similar first. Empty if the
+            note is not in the model.
+        """
+        i = self._positions.get(path)
+        if i is None or limit <= 0:
+            return []
+        scores = self.embedding @ self.embedding[i]
+        scores[i] = -np.inf
+        candidates = np.flatnonzero((scores > 0) & (scores >= min_similarity))
+        if candidates.size > limit:
+            top = np.argpartition(scores[candidates], -limit)[-limit:]
+            candidates = candidates[top]
+        order = np.lexsort((candidates, -scores[candidates]))
+        return [(self.paths[j], float(scores[j])) for j in candidates[order]]
+
+    def topics(
+        self, n_clusters: int = 10, n_terms: int = 8, seed: int = 0
+    ) -> List[Tuple[List[str], List[str]]]:
+        """Cluster the notes into topics.
+
+        Args:
+            n_clusters: Number of topics.
+            n_terms: Number of top terms to describe each topic.
+            seed: Seed of the clustering.
+
+        Returns:
+            ``(top terms, member paths)`` of each non-empty topic, largest
+            first. Members are ordered by closeness to the topic center.
+        """
+        # Notes without any shared term sit at the origin and form no topic
+        placed = np.flatnonzero(np.abs(self.embedding).sum(axis=1) > 0)
+        if not len(placed) or not self.embedding.shape[1]:
+            return []
+        points = self.embedding[placed]
+        centers, labels = minibatch_kmeans(points, n_clusters, seed=seed)
+
+        topics = []
+        # Rank terms by how much more a topic uses them than the average note
+        loadings = (centers - points.mean(axis=0)) @ self.components
+        for cluster in range(len(centers)):
+            members = np.flatnonzero(labels == cluster)
+            if not len(members):
+                continue
+            closeness = points[members] @ centers[cluster]
+            members = members[np.argsort(-closeness, kind="stable")]
+            top_terms = np.argsort(-loadings[cluster], kind="stable")[:n_terms]
+            top_terms = top_terms[loadings[cluster][top_terms] > 0]
+            topics.append((
+                [self.terms[t] for t in top_terms.tolist()],
+                [self.paths[placed[m]] for m in members.tolist()],
+            ))
+        topics.sort(key=lambda topic: -len(topic[1]))
+        return topics
+
+    def save(self, directory: Path, generation: str, dims: Optional[int] = None) -> None:
+        """Write the model to a directory, metadata last.
+
+        Args:
+            directory: The directory to write to.
+            generation: The vault generation the model was built from.
+            dims: The dimensions it was built for, which small vaults may
+                not reach; defaults to the actual dimensions.
+        """
+        if dims is None:
+            dims = int(self.embedding.shape[1])
+        directory.mkdir(parents=True, exist_ok=True)
+        meta = directory / "meta.json"
+        if meta.exists():
+            meta.unlink()
+        np.save(directory / "embedding.npy", self.embedding)
+        np.save(directory / "components.npy", self.components)
+        (directory / "paths.json").write_text(json.dumps(self.paths), encoding="utf-8")
+        (directory / "terms.json").write_text(json.dumps(self.terms), encoding="utf-8")
+        meta.write_text(
+            json.dumps({"generation": generation, "dims": dims}),
+            encoding="utf-8",
+        )
+
+    @classmethod
+    def load(
+        cls, directory: Path, generation: Optional[str] = None, dims: Optional[int] = None
+    ) -> Optional["TopicModel"]:
+        """Load a model written by :meth:`save`.
+
+        Args:
+            directory: The directory the model was saved to.
+            generation: The expected vault generation, or None to accept any.
+            dims: The dimensions it must have been built for, or None to
+                accept any.
+
+        Returns:
+            The model, or None if it is missing, stale or unreadable.
+        """
+        try:
+            meta = json.loads((directory / "meta.json").read_text(encoding="utf-8"))
+            if generation is not None and meta["generation"] != generation:
+                return None
+            if dims is not None and meta["dims"] != dims:
+                return None
+            return cls(
+                json.loads((directory / "paths.json").read_text(encoding="utf-8")),
+                np.load(directory / "embedding.npy", mmap_mode="r"),
+                np.load(directory / "components.npy", mmap_mode="r"),
+                json.loads((directory / "terms.json").read_text(encoding="utf-8")),
+            )
+        except (OSError, EOFError, ValueError, KeyError):
+            return None
+
+
+def load_topic_model(vault: Any, dims: Optional[int] = DIMENSIONS) -> TopicModel:
+    """Get the topic model of a vault, rebuilding it only when stale.
+
+    Args:
+        vault: The vault to model.
+        dims: Dimensions of the topic space, or None to accept a cached
+            model of any dimensions and build one of ``DIMENSIONS``.
+
+    Returns:
+        The cached model if it matches the vault's generation and the
+        dimensions, otherwise a freshly built one, which is cached.
+    """
+    generation = vault.generation
+    directory = cache_path(vault.vault_path, CACHE_NAME)
+    model = TopicModel.load(directory, generation, dims)
+    if model is None:
+        dims = dims or DIMENSIONS
+        model = TopicModel.build(load_tfidf_index(vault), dims)
+        model.save(directory, generation, dims)
+    return model
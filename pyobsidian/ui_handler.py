@@ -2,6 +2,7 @@
 from typing import Dict, List, Optional, Tuple, Union
 import sys
 import os
+from datetime import datetime
 
 import click
 from rich.console import Console
@@ -212,3 +213,116 @@ def display_word_cloud(word_stats: List[Tuple[str, int, float]], message: str =
     
     display_table(rows, ["Word", "Count", "Percentage"], 
                  title="Word Cloud (min length: 3, min count: 2)")
+
+
+def display_tag_suggestions(suggestions: Dict[str, List[Tuple[str, float]]]) -> None:
+    """Display suggested tags for each note."""
+    if not suggestions:
+        _echo("No untagged notes found.")
+        return
+
+    rows = []
+    for path, tags in suggestions.items():
+        suggested = ", ".join(f"#{tag} ({score:.2f})" for tag, score in tags)
+        rows.append([path, suggested or "(no suggestions)"])
+    display_table(rows, ["Note", "Suggested Tags"], title="Tag Suggestions")
+
+
+def display_duplicate_clusters(clusters: List[List[Tuple[str, float]]]) -> None:
+    """Display clusters of near-duplicate notes."""
+    if not clusters:
+        _echo("No duplicate notes found.")
+        return
+
+    rows = []
+    for number, cluster in enumerate(clusters, 1):
+        for path, similarity in cluster:
+            rows.append([str(number), path, f"{similarity * 100:.0f}%"])
+    display_table(rows, ["Cluster", "Path", "Similarity"], title="Duplicate Notes")
+
+
+def display_topics(topics: List[Tuple[List[str], List[str]]], max_notes: int = 5) -> None:
+    """Display topic clusters with their top terms and member notes."""
+    if not topics:
+        _echo("No topics found.")
+        return
+
+    rows = []
+    for number, (terms, paths) in enumerate(topics, 1):
+        examples = ", ".join(paths[:max_notes])
+        if len(paths) > max_notes:
+            examples += f", ... (+{len(paths) - max_notes})"
+        rows.append([str(number), str(len(paths)), ", ".join(terms), examples])
+    display_table(rows, ["Topic", "Size", "Top Terms", "Notes"], title="Topics")
+
+
+def display_heavy_hitters(items: List[Tuple[str, int, int]], total: int, max_error: int, title: str) -> None:
+    """Display approximate word counts with their error bounds."""
+    rows = [
+        [word, str(count), str(count - error), f"{count / total * 100:.1f}%" if total else "0.0%"]
+        for word, count, error in items
+    ]
+    display_table(rows, ["Word", "Count", "At Least", "Share"], title=title)
+    _echo(f"Approximate counts over {total} words: each count is at most {max_error} too high.")
+
+
+def _format_size(size: int) -> str:
+    """Format a byte count for display."""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+# Bars of a sparkline, from empty to full
+_SPARK_BARS = " ▁▂▃▄▅▆▇█"
+
+
+def _sparkline(counts: List[int]) -> str:
+    """Draw counts as a one-line bar chart."""
+    peak = max(counts, default=0)
+    if not peak:
+        return " " * len(counts)
+    return "".join(_SPARK_BARS[round(count / peak * (len(_SPARK_BARS) - 1))] for count in counts)
+
+
+def display_folder_report(rows: List[Dict], title: str = "Folders", histogram: bool = False) -> None:
+    """Display per-folder statistics, indenting folders by depth."""
+    table_rows = []
+    for row in rows:
+        name = row["folder"].rpartition("/")[2] or "(vault)"
+        modified = (
+            datetime.fromtimestamp(row["modified"]).strftime("%Y-%m-%d")
+            if row["modified"] is not None else "-"
+        )
+        table_row = [
+            "  " * max(row["depth"] - 1, 0) + name,
+            str(row["notes"]),
+            _format_size(row["bytes"]),
+            str(row["words"]),
+            str(row["links"]),
+            str(row["orphans"]),
+            modified,
+            "/".join(f"{value:.0f}" for value in row["percentiles"]),
+        ]
+        if histogram:
+            table_row.append(_sparkline(row["histogram"]))
+        table_rows.append(table_row)
+    headers = ["Folder", "Notes", "Size", "Words", "Links", "Orphans", "Modified", "p10/50/90"]
+    display_table(table_rows, headers + ["Histogram"] if histogram else headers, title=title)
+
+
+def display_diff(diff: str) -> None:
+    """Display a unified diff, colouring added and removed lines."""
+    for line in diff.splitlines():
+        if line.startswith(("+++", "---")):
+            click.secho(line, bold=True)
+        elif line.startswith("+"):
+            click.secho(line, fg="green")
+        elif line.startswith("-"):
+            click.secho(line, fg="red")
+        elif line.startswith("@@"):
+            click.secho(line, fg="cyan")
+        else:
+            click.echo(line)
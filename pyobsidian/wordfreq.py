@@ -0,0 +1,252 @@
+"""Word frequencies of a vault, computed as a cached map-reduce over notes."""
+import os
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import chain, islice
+from pathlib import Path
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .core import Note
+from .hashindex import bytes_digest
+from .sketch import SpaceSaving
+from .text import STOP_WORDS, tokenize
+
+# Cache file, inside the cache directory, holding the per-note counts
+WORD_COUNTS_CACHE_NAME = "wordcounts.npz"
+
+# Below this many notes to count, worker processes cost more than they save
+PARALLEL_THRESHOLD = 2000
+
+# Notes per chunk summarized by a worker process when counting approximately
+SKETCH_CHUNK_SIZE = 500
+
+
+def note_word_counts(content: str, tags: Iterable[str], min_length: int = 1) -> Counter:
+    """Count the words of one note, the map step.
+
+    By default words of every length are kept, so one cached count serves
+    any ``--min-length``; tags count once each, without their ``#``.
+
+    Args:
+        content: The raw note content.
+        tags: The note's tags.
+        min_length: Minimum length of a word to count.
+
+    Returns:
+        The word counts of the note.
+    """
+    counts = Counter(tokenize(content, min_length))
+    counts.update(
+        tag.lower() for tag in tags
+        if len(tag) >= min_length and tag.lower() not in STOP_WORDS
+    )
+    return counts
+
+
+def _count_chunk(items: List[Tuple[str, List[str]]]) -> List[Dict[str, int]]:
+    """Count the words of a chunk of ``(content, tags)`` in a worker process."""
+    return [dict(note_word_counts(content, tags)) for content, tags in items]
+
+
+def _sketch_chunk(items: List[Tuple[str, List[str]]], capacity: int, min_length: int) -> SpaceSaving:
+    """Summarize the words of a chunk of ``(content, tags)`` in a worker process."""
+    return SpaceSaving.from_counts(
+        capacity, (note_word_counts(content, tags, min_length) for content, tags in items)
+    )
+
+
+class WordCounts:
+    """Per-note word counts keyed by content digest.
+
+    Counts are stored as term ids into a shared vocabulary, so the reduce
+    step over cached notes is a single ``bincount``.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty set of counts."""
+        self.words: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self.entries: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self.dirty = False
+        # Digests summed by the last total(), i.e. the notes in the vault
+        self._used: set = set()
+
+    @classmethod
+    def load(cls, path: Path) -> "WordCounts":
+        """Load counts saved by :meth:`save`; empty if missing or broken."""
+        counts = cls()
+        try:
+            with np.load(path) as data:
+                words = data["words"].tolist()
+                digests = data["digests"].tolist()
+                indptr, ids, values = data["indptr"], data["ids"], data["counts"]
+        except (OSError, EOFError, ValueError, KeyError):
+            return counts
+        counts.words = words
+        counts._ids = {word: i for i, word in enumerate(words)}
+        for i, digest in enumerate(digests):
+            start, end = indptr[i], indptr[i + 1]
+            counts.entries[digest] = (ids[start:end], values[start:end])
+        return counts
+
+    def save(self, path: Path) -> None:
+        """Write the counts if any were added.
+
+        Only the counts summed by the last :meth:`total` are kept, so the
+        cache does not grow with deleted or edited notes.
+
+        Args:
+            path: The ``.npz`` file to write.
+        """
+        if not self.dirty:
+            return
+        if self._used:
+            self.entries = {d: e for d, e in self.entries.items() if d in self._used}
+        digests = list(self.entries)
+        lengths = [len(self.entries[d][0]) for d in digests]
+        indptr = np.zeros(len(digests) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                words=np.array(self.words, dtype=str),
+                digests=np.array(digests, dtype=str),
+                indptr=indptr,
+                ids=_concat([self.entries[d][0] for d in digests], np.int32),
+                counts=_concat([self.entries[d][1] for d in digests], np.int32),
+            )
+        self.dirty = False
+
+    def add(self, digest: str, counts: Dict[str, int]) -> None:
+        """Store the word counts of a note."""
+        ids = []
+        for word in counts:
+            i = self._ids.get(word)
+            if i is None:
+                i = self._ids[word] = len(self.words)
+                self.words.append(word)
+            ids.append(i)
+        self.entries[digest] = (
+            np.array(ids, dtype=np.int32),
+            np.fromiter(counts.values(), dtype=np.int32, count=len(counts)),
+        )
+        self.dirty = True
+
+    def total(self, digests: Iterable[str]) -> np.ndarray:
+        """Sum the counts of some notes, the reduce step.
+
+        Args:
+            digests: Content digests of the notes, which must be stored.
+
+        Returns:
+            The total count of every word in :attr:`words`.
+        """
+        digests = list(digests)
+        self._used = set(digests)
+        entries = [self.entries[d] for d in digests]
+        ids = _concat([e[0] for e in entries], np.int32)
+        values = _concat([e[1] for e in entries], np.int32)
+        return np.bincount(ids, weights=values, minlength=len(self.words)).astype(np.int64)
+
+
+def _concat(arrays: List[np.ndarray], dtype: type) -> np.ndarray:
+    """Concatenate arrays, returning an empty array for an empty list."""
+    return np.concatenate(arrays).astype(dtype) if arrays else np.zeros(0, dtype=dtype)
+
+
+def count_words(
+    notes: List[Note],
+    cache: Optional[WordCounts] = None,
+    jobs: Optional[int] = None,
+    digests: Optional[Dict[str, str]] = None,
+) -> Dict[str, int]:
+    """Count the words of every note, reusing cached per-note counts.
+
+    Notes whose content digest is not cached are counted, in worker
+    processes when there are at least ``PARALLEL_THRESHOLD`` of them, and
+    their counts are added to the cache. All counts are then summed.
+
+    Args:
+        notes: The notes to count.
+        cache: Per-note counts from earlier runs; updated in place.
+        jobs: Number of worker processes, defaults to the CPU count.
+        digests: Known content digests, by path, such as the vault's; the
+            others are computed.
+
+    Returns:
+        The total count of every word in the notes.
+    """
+    cache = WordCounts() if cache is None else cache
+    digests = digests or {}
+    keys = [digests.get(note.path) or bytes_digest(note.content.encode("utf-8")) for note in notes]
+
+    missing: Dict[str, Note] = {}
+    for digest, note in zip(keys, notes):
+        if digest not in cache.entries and digest not in missing:
+            missing[digest] = note
+    items = [(note.content, list(note.tags)) for note in missing.values()]
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(items) >= PARALLEL_THRESHOLD:
+        size = -(-len(items) // (jobs * 4))
+        chunks = [items[i:i + size] for i in range(0, len(items), size)]
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = [counts for chunk in executor.map(_count_chunk, chunks) for counts in chunk]
+    else:
+        results = _count_chunk(items)
+    for digest, counts in zip(missing, results):
+        cache.add(digest, counts)
+
+    totals = cache.total(keys)
+    return {cache.words[i]: int(totals[i]) for i in np.flatnonzero(totals).tolist()}
+
+
+def approximate_word_counts(
+    notes: Iterable[Note],
+    capacity: int,
+    min_length: int = 1,
+    jobs: Optional[int] = None,
+) -> SpaceSaving:
+    """Summarize the word counts of every note in fixed memory.
+
+    Each note is counted on its own and folded into a Space-Saving summary
+    of ``capacity`` words, so memory does not grow with the vocabulary.
+    The notes are consumed as they come, so they can be streamed from
+    disk. Large vaults are split into chunks summarized in worker
+    processes, whose summaries are merged; only a few chunks are in flight
+    at once. Nothing is cached, as the per-note counts are exactly what
+    grows with the vocabulary.
+
+    Args:
+        notes: The notes to count, such as :meth:`Vault.iter_notes`.
+        capacity: Maximum number of words tracked.
+        min_length: Minimum length of a word to count.
+        jobs: Number of worker processes, defaults to the CPU count.
+
+    Returns:
+        The summary.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    notes = iter(notes)
+    head = list(islice(notes, PARALLEL_THRESHOLD))
+    notes = chain(head, notes)
+    if jobs <= 1 or len(head) < PARALLEL_THRESHOLD:
+        return SpaceSaving.from_counts(
+            capacity,
+            (note_word_counts(note.content, note.tags, min_length) for note in notes),
+        )
+
+    items = ((note.content, list(note.tags)) for note in notes)
+    chunks = iter(lambda: list(islice(items, SKETCH_CHUNK_SIZE)), [])
+    summary = SpaceSaving(capacity)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending: Deque[Future] = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_sketch_chunk, chunk, capacity, min_length))
+            if len(pending) > jobs * 2:
+                summary = summary.merge(pending.popleft().result())
+        for future in pending:
+            summary = summary.merge(future.result())
+    return summary
@@ -64,7 +64,7 @@ class MockVault:
     def get_empty_notes(self):
         return self.empty_notes
 
-    def get_empty_folders(self):
+    def get_empty_folders(self, excluded=None, recursive=False):
         return self.empty_folders
 
     def get_small_notes(self, max_words=50):
@@ -74,4 +74,27 @@ class MockVault:
         for note in self.notes:
             if note.path == path:
                 return note
-        return None 
\ No newline at end of file
+        return None 
+
+def test_empty_folders_reads_the_vault_config(real_tmp_path, monkeypatch) -> None:
+    """Test that excluded_files come from the scanned vault's config, not the working directory."""
+    from pyobsidian import core
+    from pyobsidian.commands import empty_folders_command
+
+    vault_path = real_tmp_path / "vault"
+    for folder in ("drafts", "Archive/2020"):
+        (vault_path / folder).mkdir(parents=True)
+    (vault_path / "config.yaml").write_text(
+        'obsidian:\n  excluded_files:\n    - "**/Archive/**"\n', encoding="utf-8"
+    )
+    elsewhere = real_tmp_path / "elsewhere"
+    elsewhere.mkdir()
+    monkeypatch.chdir(elsewhere)
+    monkeypatch.setattr(empty_folders_command, "Config", core.Config)
+    monkeypatch.setattr(empty_folders_command.obsidian_context, "vault", core.Vault(vault_path))
+
+    result = CliRunner().invoke(empty_folders)
+
+    assert result.exit_code == 0
+    assert "drafts" in result.output
+    assert "Archive" not in result.output
@@ -33,7 +33,8 @@ def test_daily_stats(mock_context: "MockContext") -> None:
         assert "Daily Writing Statistics" in result.output
         assert "Words Written" in result.output
         assert "Notes Modified" in result.output
-        assert "Links Created" in result.output
+        assert "Created" in result.output
+        assert "Deleted" in result.output
         # Verify dates are shown
         assert today.strftime("%Y-%m-%d") in result.output
         assert yesterday.strftime("%Y-%m-%d") in result.output
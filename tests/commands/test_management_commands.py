@@ -1,8 +1,10 @@
 """Test management commands."""
 import pytest
 from click.testing import CliRunner
+from pytest_mock import MockerFixture
 from unittest.mock import Mock, patch, MagicMock
 from pyobsidian.commands import (
+    management_commands,
     tag_management_command,
     visualization_command,
     data_management_command,
@@ -83,4 +85,35 @@ def test_export(mock_context: "MockContext") -> None:
 
     result = runner.invoke(export_command.export_notes, ["--format", "html"])
     assert result.exit_code == 0
-    assert mock_context.vault.export_to_html.called 
\ No newline at end of file
+    assert mock_context.vault.export_to_html.called
+
+
+def test_remove_missing_tag_skips_write(mock_context: MockContext, mocker: MockerFixture) -> None:
+    """Removing a tag a note does not have leaves the note file alone."""
+    mocker.patch('pyobsidian.commands.management_commands.obsidian_context', mock_context)
+    mock_context.vault.update_note("plain.md", "# Plain\nNo tags here.")
+    mock_context.vault.update_note = Mock()
+
+    result = CliRunner().invoke(management_commands.manage, ["remove-tag", "plain.md", "#missing"])
+    assert result.exit_code == 0
+    mock_context.vault.update_note.assert_not_called()
+
+
+def test_tag_add_and_remove_where(mock_context: MockContext) -> None:
+    """Tags are added to and removed from the notes a query selects, in any case."""
+    vault = mock_context.vault
+    vault.update_note("projects/alpha.md", "Alpha plan #Project\n")
+    vault.update_note("projects/beta.md", "Beta plan\n")
+    vault.update_note("journal.md", "Diary entry\n")
+    runner = CliRunner()
+
+    result = runner.invoke(tag_management_command.tag, ["add", "project", "--where", "path:projects/"])
+    assert result.exit_code == 0
+    assert vault.get_note("projects/alpha.md").content == "Alpha plan #Project\n"
+    assert vault.get_note("projects/beta.md").content == "Beta plan #project\n"
+    assert vault.get_note("journal.md").content == "Diary entry\n"
+
+    result = runner.invoke(tag_management_command.tag, ["remove", "#PROJECT", "--where", "tag:project"])
+    assert result.exit_code == 0
+    assert vault.get_note("projects/alpha.md").content == "Alpha plan\n"
+    assert vault.get_note("projects/beta.md").content == "Beta plan\n"
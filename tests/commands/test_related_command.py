@@ -0,0 +1,54 @@
+"""Tests for the related command."""
+import pytest
+from click.testing import CliRunner
+
+from pyobsidian.cache import cache_path
+from pyobsidian.commands import related_command
+from pyobsidian.related import load_related
+from ..mock_obsidian import MockVault
+
+NOTES = {
+    "python.md": "Generators and decorators make python code concise.",
+    "decorators.md": "Decorators wrap python functions; generators yield values.",
+    "bread.md": "Flour, water, salt and yeast form a simple bread dough.",
+    "sourdough.md": "Sourdough bread rises with a wild yeast starter and flour.",
+}
+
+
+@pytest.fixture
+def vault(real_tmp_path, monkeypatch) -> MockVault:
+    """Fixture providing the command a vault on two topics, with caches on the real file system."""
+    vault = MockVault()
+    vault._notes = {}
+    for path, content in NOTES.items():
+        vault.add_note(path, content)
+    monkeypatch.setattr(related_command.obsidian_context, "vault", vault)
+    return vault
+
+
+def test_related_all_writes_frontmatter(vault: MockVault) -> None:
+    """Test that --all --frontmatter links each note to its related notes and caches them."""
+    result = CliRunner().invoke(related_command.related, ["--all", "--frontmatter", "--jobs", "1"])
+
+    assert result.exit_code == 0
+    assert "Computed related notes for 4 notes; updated the frontmatter of 4 notes" in result.output
+    assert vault.get_note("python.md").content.startswith("---\nrelated:\n- '[[decorators]]'\n")
+    assert "[[sourdough]]" in vault.get_note("bread.md").content
+    cached = load_related(cache_path(vault.vault_path, related_command.RELATED_CACHE_NAME), vault.generation)
+    assert cached is not None
+    assert [path for path, _ in cached["python.md"]][0] == "decorators.md"
+
+
+def test_related_note_reads_the_cache(vault: MockVault, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that after --all, a single note is looked up without loading the index."""
+    runner = CliRunner()
+    assert runner.invoke(related_command.related, ["--all", "--jobs", "1"]).exit_code == 0
+
+    def fail(vault):
+        raise AssertionError("the index should not be loaded")
+
+    monkeypatch.setattr(related_command, "load_tfidf_index", fail)
+    result = runner.invoke(related_command.related, ["sourdough.md"])
+
+    assert result.exit_code == 0
+    assert "bread.md" in result.output
@@ -0,0 +1,73 @@
+"""Tests for suggest tags command."""
+from typing import List
+
+import pytest
+from click.testing import CliRunner
+
+from pyobsidian.commands import suggest_tags_command
+from pyobsidian.commands.suggest_tags_command import build_tag_model
+from tests.mock_obsidian import MockContext, Note
+
+
+@pytest.fixture
+def tagged_notes() -> List[Note]:
+    """Fixture providing a small vault with two topics and untagged notes."""
+    return [
+        Note("python.md", "# Python\nDecorators and generators in python code. #python #programming"),
+        Note("django.md", "# Django\nViews and models written in python code. #python #web"),
+        Note("bread.md", "# Bread\nFlour, water and yeast make bread dough. #cooking"),
+        Note("pasta.md", "# Pasta\nBoil water, add flour dough and salt. #cooking"),
+        Note("draft.md", "Some notes on python generators and decorators code."),
+        Note("recipe.md", "Knead the dough with flour and water. See [[bread]]."),
+    ]
+
+
+def test_cooccurrence_matrix(tagged_notes: List[Note]) -> None:
+    """Test that tags sharing notes co-occur and others do not."""
+    tag_counts = {"python": 2, "programming": 1, "web": 1, "cooking": 2}
+    model = build_tag_model(tagged_notes, tag_counts)
+
+    cooccurrence = model.cooccurrence.to_dense()
+    python = model.tags.index("python")
+    web = model.tags.index("web")
+    cooking = model.tags.index("cooking")
+
+    # Every note tagged #web is also tagged #python
+    assert cooccurrence[python, web] == pytest.approx(1.0)
+    # Half of the #python notes are tagged #web
+    assert cooccurrence[web, python] == pytest.approx(0.5)
+    assert cooccurrence[python, cooking] == 0
+    assert cooccurrence[python, python] == 0
+
+
+def test_suggestions_from_terms_and_links(tagged_notes: List[Note]) -> None:
+    """Test that untagged notes get tags from similar and linked notes."""
+    tag_counts = {"python": 2, "programming": 1, "web": 1, "cooking": 2}
+    model = build_tag_model(tagged_notes, tag_counts)
+
+    assert model.suggest("draft.md", limit=1)[0][0] == "python"
+    assert model.suggest("recipe.md", limit=1)[0][0] == "cooking"
+    # Tags a note already has are never suggested
+    assert "python" not in dict(model.suggest("python.md"))
+
+
+def test_suggest_tags_requires_target(mock_context: MockContext, mocker) -> None:
+    """Test that the command asks for a note or --untagged."""
+    mocker.patch.object(suggest_tags_command, "obsidian_context", mock_context)
+    runner = CliRunner()
+    result = runner.invoke(suggest_tags_command.suggest_tags)
+
+    assert result.exit_code == 0
+    assert "Provide a note path or use --untagged" in result.output
+
+
+def test_suggest_tags_untagged(mock_context: MockContext, mocker) -> None:
+    """Test batch suggestions for every untagged note."""
+    mocker.patch.object(suggest_tags_command, "obsidian_context", mock_context)
+    runner = CliRunner()
+    result = runner.invoke(suggest_tags_command.suggest_tags, ["--untagged"])
+
+    assert result.exit_code == 0
+    assert "Tag Suggestions" in result.output
+    assert "note3.md" in result.output
+    assert "note4.md" not in result.output
@@ -4,6 +4,11 @@ from click.testing import CliRunner
 from pyobsidian.commands import word_cloud_command
 from ..mock_obsidian import MockContext
 
+@pytest.fixture(autouse=True)
+def real_file_system(real_tmp_path):
+    """Write the word counts cache, an ``.npz`` file, to the real file system."""
+    return real_tmp_path
+
 def test_word_cloud_filters(mock_context: MockContext) -> None:
     """Test word cloud filtering functionality."""
     # Add a note with various elements to filter
@@ -42,6 +42,14 @@ def mock_vault_operations(mocker, test_vault_dir):
     # Set up test environment
     os.environ['OBSIDIAN_VAULT_PATH'] = test_vault_dir
 
+@pytest.fixture
+def real_tmp_path(mocker):
+    """Create a real temporary directory, undoing the file system mocks."""
+    mocker.stopall()
+    path = Path(tempfile.mkdtemp())
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
 @pytest.fixture
 def mock_vault(mocker):
     """Create a mock vault with fully mocked file operations."""
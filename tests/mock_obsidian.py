@@ -1,12 +1,30 @@
 """Mock ObsidianContext for testing."""
 from unittest.mock import Mock, MagicMock
 from pathlib import Path
+import atexit
+from contextlib import contextmanager
+import hashlib
+import shutil
+import tempfile
 import types
-from typing import Optional, Union, List, Any, Set, Dict, Tuple
+from typing import Optional, Union, List, Any, Set, Dict, Iterable, Iterator, Tuple
 import re
 import os
 
-from pyobsidian.core import Config, Note, Vault
+import numpy as np
+
+from pyobsidian.cache import CACHE_DIR_NAME
+from pyobsidian.core import Batch, Config, ConfigError, Note, Vault
+from pyobsidian.hashindex import bytes_digest
+from pyobsidian.stattable import StatTable
+from pyobsidian.timeline import Timeline, note_dates
+
+# Root of every mock vault, holding their caches. It is created before the
+# file system mocks apply; caches are keyed by the vault generation, a
+# digest of the notes, so vaults with other notes do not share entries
+MOCK_VAULT_PATH = Path(tempfile.mkdtemp(prefix="pyobsidian-mock-vault-"))
+(MOCK_VAULT_PATH / CACHE_DIR_NAME).mkdir()
+atexit.register(shutil.rmtree, MOCK_VAULT_PATH, ignore_errors=True)
 
 # Create mock classes
 class Link:
@@ -297,7 +315,7 @@ class Note:
 
 class Config:
     """Mock configuration."""
-    def __init__(self):
+    def __init__(self, config_path: str = "config.yaml"):
         self.vault_path = "/mock/vault"
         self.excluded_patterns = []
         self.config_data = {"obsidian": {"vault_path": self.vault_path}}
@@ -313,6 +331,8 @@ class MockVault:
         """Initialize the mock vault."""
         self._notes = {}
         self.folders = {"empty_folder"}  # Add empty folder for testing
+        self.vault_path = MOCK_VAULT_PATH
+        self._batch: Optional[Batch] = None
         
         # Mock methods
         self._read_file = Mock()
@@ -321,7 +341,7 @@ class MockVault:
         self._create_tag_cloud = Mock()
         self._create_backup = Mock(return_value="/mock/backup/path")
         self._export_to_markdown = Mock()
-        self._export_to_html = Mock()
+        self._export_to_html = Mock(return_value={"rendered": 0, "unchanged": 0, "removed": 0})
 
         self._setup_test_notes()
 
@@ -381,6 +401,26 @@ class MockVault:
         else:
             self._notes[path].update_content(content)
 
+    def save_notes(self, notes: Iterable[Note], max_workers: Optional[int] = None,
+                   journal: Optional[str] = None) -> int:
+        """Keep notes edited in memory, counting them as written."""
+        notes = list(notes)
+        for note in notes:
+            self._notes[note.path] = note
+            if self._batch is not None:
+                self._batch.add(note.path, note.content)
+        return len(notes)
+
+    @contextmanager
+    def batch(self, max_workers: Optional[int] = None, journal: Optional[str] = None) -> Iterator[Batch]:
+        """Collect the notes saved in a block, counting them as written at its end."""
+        batch = self._batch = Batch()
+        try:
+            yield batch
+        finally:
+            self._batch = None
+        batch.written = len(batch.dirty)
+
     def get_orphan_notes(self) -> List[Note]:
         """Get notes that no other notes link to."""
         linked_to = set()
@@ -412,11 +452,15 @@ class MockVault:
         """Get all notes in the vault."""
         return sorted(self._notes.values())
 
+    def iter_notes(self) -> Iterator[Note]:
+        """Iterate over all notes in the vault."""
+        return iter(self.get_all_notes())
+
     def get_empty_notes(self) -> List[Note]:
         """Get notes with no content."""
         return sorted(note for note in self._notes.values() if not note.content.strip())
 
-    def get_empty_folders(self) -> List[str]:
+    def get_empty_folders(self, excluded: Optional[List[Any]] = None, recursive: bool = False) -> List[str]:
         """Get folders that contain no notes."""
         used_folders = set()
         for path in self._notes:
@@ -434,8 +478,7 @@ class MockVault:
     def get_all_tags(self) -> Dict[str, int]:
         """Get all tags and their counts from notes."""
         tag_counts = {}
-        for path, content in self._notes.items():
-            note = Note(path, content)
+        for note in self._notes.values():
             for tag in note.tags:
                 tag_counts[tag] = tag_counts.get(tag, 0) + 1
         return tag_counts
@@ -443,12 +486,49 @@ class MockVault:
     def get_notes_by_tag(self, tag: str) -> List[Note]:
         """Get all notes that contain a specific tag."""
         matching_notes = []
-        for path, content in self._notes.items():
-            note = Note(path, content)
+        for note in self._notes.values():
             if tag in note.tags:
                 matching_notes.append(note)
         return sorted(matching_notes)
 
+    @property
+    def generation(self) -> str:
+        """Get a fingerprint of the notes, which changes whenever one does."""
+        digest = hashlib.blake2b(digest_size=16)
+        for path in sorted(self._notes):
+            digest.update(f"{path}\0{self._notes[path].content}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    def get_digest(self, path: str) -> Optional[str]:
+        """Get the content digest of a note."""
+        note = self._notes.get(path)
+        return bytes_digest(note.content.encode("utf-8")) if note is not None else None
+
+    def get_file_digests(self) -> Dict[str, Tuple[int, int, str]]:
+        """Get ``(mtime_ns, size, digest)`` of every note, with a zero mtime."""
+        return {
+            path: (0, len(note.content.encode("utf-8")), self.get_digest(path))
+            for path, note in self._notes.items()
+        }
+
+    def get_stat_table(self, refresh: bool = False) -> StatTable:
+        """Get the sizes of the notes, with zero mtimes and inodes."""
+        paths = sorted(self._notes)
+        sizes = np.array([len(self._notes[path].content.encode("utf-8")) for path in paths], dtype=np.int64)
+        return StatTable(paths, sizes, np.zeros(len(paths), dtype=np.int64), np.zeros(len(paths), dtype=np.uint64))
+
+    def read_note(self, path: str) -> Optional[Tuple[Note, os.stat_result, str]]:
+        """Get a note with stats of its size only and its digest."""
+        note = self._notes.get(path)
+        if note is None:
+            return None
+        size = len(note.content.encode("utf-8"))
+        return note, os.stat_result((0o100644, 0, 0, 1, 0, 0, size, 0, 0, 0), {"st_mtime_ns": 0}), self.get_digest(path)
+
+    def get_timeline(self) -> Timeline:
+        """Get the dates of the notes, from their frontmatter."""
+        return Timeline.from_dates({path: note_dates(note.content) for path, note in self._notes.items()})
+
     def get_note(self, note_path: str) -> Note:
         """Get a note by its path."""
         if note_path not in self._notes:
@@ -553,6 +633,7 @@ mock_core = types.ModuleType('pyobsidian.core')
 mock_core.Note = Note
 mock_core.Link = Link
 mock_core.Config = Config
+mock_core.ConfigError = ConfigError
 mock_core.Vault = MockVault
 mock_core.ObsidianContext = MockContext
 mock_context = MockContext()
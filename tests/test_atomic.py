@@ -0,0 +1,77 @@
+"""Tests for atomic file writes."""
+import os
+from pathlib import Path
+
+import pytest
+
+from pyobsidian import atomic
+from pyobsidian.atomic import AtomicWriter
+
+
+def test_write_replaces_content(real_tmp_path: Path) -> None:
+    """Test that a write replaces the file, keeps its mode and leaves no temp file."""
+    path = real_tmp_path / "note.md"
+    path.write_text("old")
+    os.chmod(path, 0o640)
+
+    AtomicWriter().write(path, "new ✓")
+
+    assert path.read_text(encoding="utf-8") == "new ✓"
+    assert path.stat().st_mode & 0o777 == 0o640
+    assert os.listdir(real_tmp_path) == ["note.md"]
+
+
+def test_failed_write_keeps_old_content(real_tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that an interrupted write leaves the original file untouched."""
+    path = real_tmp_path / "note.md"
+    path.write_text("old")
+
+    def interrupted(*args: object) -> None:
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(atomic.os, "replace", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        AtomicWriter().write(path, "new")
+
+    assert path.read_text() == "old"
+    assert os.listdir(real_tmp_path) == ["note.md"]
+
+
+def test_group_commit_syncs_each_directory_once(
+    real_tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that group-commit mode defers directory syncs to the commit."""
+    synced = []
+    monkeypatch.setattr(atomic, "fsync_directory", synced.append)
+    (real_tmp_path / "sub").mkdir()
+
+    with AtomicWriter(group=True) as writer:
+        for i in range(5):
+            writer.write(real_tmp_path / f"{i}.md", "x")
+            writer.write(real_tmp_path / "sub" / f"{i}.md", "x")
+        assert synced == []
+
+    assert sorted(synced) == [str(real_tmp_path), str(real_tmp_path / "sub")]
+
+
+def test_write_keeps_symlinks_and_hard_links(real_tmp_path: Path) -> None:
+    """Test that a symlinked note stays a link and a hard-linked one keeps its other names."""
+    (real_tmp_path / "real").mkdir()
+    target = real_tmp_path / "real" / "note.md"
+    target.write_text("old")
+    link = real_tmp_path / "link.md"
+    link.symlink_to(target)
+
+    AtomicWriter().write(link, "new")
+
+    assert link.is_symlink()
+    assert target.read_text() == "new"
+    assert os.listdir(real_tmp_path / "real") == ["note.md"]
+
+    other = real_tmp_path / "other.md"
+    os.link(target, other)
+    AtomicWriter().write(target, "newer, and longer")
+    assert other.read_text() == "newer, and longer"
+    assert os.path.samefile(target, other)
+    AtomicWriter().write(other, "short")
+    assert target.read_text() == "short"
@@ -0,0 +1,51 @@
+"""Tests for the SQLite export."""
+import json
+import sqlite3
+from pathlib import Path
+
+from pyobsidian.database import export_sqlite, note_headings
+from tests.mock_obsidian import Note
+
+
+def test_note_headings_skip_code_and_frontmatter() -> None:
+    """Test that headings are collected outside frontmatter and code blocks."""
+    content = "---\ntitle: x\n---\n# One\ntext\n```\n# not a heading\n```\n### Three ###\n"
+    assert note_headings(content) == [(1, "One"), (3, "Three")]
+
+
+def test_export_writes_tables_and_updates_incrementally(real_tmp_path: Path) -> None:
+    """Test that the tables are filled and re-exports only touch what changed."""
+    db = real_tmp_path / "vault.db"
+    notes = [
+        Note("index.md", "---\nstatus: draft\nn: 2\n---\n# Index\nSee [[plan|the plan]] and [[missing]]. #home"),
+        Note("Projects/plan.md", "# Plan\n## Next\nBack to [[index]]."),
+        Note("other.md", "# Other"),
+    ]
+    assert export_sqlite(notes, db) == {"added": 3, "updated": 0, "deleted": 0, "unchanged": 0}
+
+    connection = sqlite3.connect(str(db))
+    assert connection.execute("SELECT tag FROM tags").fetchall() == [("home",)]
+    assert set(connection.execute("SELECT target, alias, target_path FROM links")) == {
+        ("plan", "the plan", "Projects/plan.md"),
+        ("missing", None, None),
+        ("index", None, "index.md"),
+    }
+    fields = dict(connection.execute("SELECT key, value FROM frontmatter"))
+    assert {key: json.loads(value) for key, value in fields.items()} == {"status": "draft", "n": 2}
+    assert connection.execute(
+        "SELECT level, text FROM headings JOIN notes ON notes.id = note_id "
+        "WHERE path = 'Projects/plan.md' ORDER BY position"
+    ).fetchall() == [(1, "Plan"), (2, "Next")]
+    connection.close()
+
+    assert export_sqlite(notes, db) == {"added": 0, "updated": 0, "deleted": 0, "unchanged": 3}
+
+    # Creating the missing note resolves the link to it; removing a note
+    # removes its rows
+    notes = [Note("index.md", notes[0].content + " #more"), notes[1], Note("missing.md", "# Found")]
+    assert export_sqlite(notes, db) == {"added": 1, "updated": 1, "deleted": 1, "unchanged": 1}
+    connection = sqlite3.connect(str(db))
+    assert connection.execute("SELECT target_path FROM links WHERE target = 'missing'").fetchone() == ("missing.md",)
+    assert sorted(connection.execute("SELECT tag FROM tags")) == [("home",), ("more",)]
+    assert connection.execute("SELECT count(*) FROM headings").fetchone() == (4,)
+    connection.close()
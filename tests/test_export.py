@@ -0,0 +1,48 @@
+"""Tests for the incremental HTML export."""
+from pathlib import Path
+
+from pyobsidian.export import MANIFEST_NAME, export_html, link_targets
+from tests.mock_obsidian import Note
+
+
+def test_link_targets_skip_code_and_frontmatter() -> None:
+    """Test that only wikilinks of the prose are collected, once each."""
+    content = "---\nup: '[[meta]]'\n---\n[[a]] and [[b#Part|B]] `[[code]]` [[a]]\n```\n[[fenced]]\n```\n"
+    assert link_targets(content) == ["a", "b"]
+
+
+def test_export_renders_links_and_only_changed_pages(real_tmp_path: Path) -> None:
+    """Test that pages link to each other and re-exports only touch what changed."""
+    output = real_tmp_path / "site"
+    notes = [
+        Note("index.md", "# Index\nSee [[Projects/plan#Next Steps|the plan]] and [[missing]]."),
+        Note("Projects/plan.md", "# Plan\n## Next Steps\nBack to [[index]]."),
+        Note("other.md", "# Other\nNo links."),
+    ]
+    assert export_html(notes, output, jobs=1) == {"rendered": 3, "unchanged": 0, "removed": 0}
+    assert (output / MANIFEST_NAME).exists()
+
+    index_page = (output / "index.html").read_text(encoding="utf-8")
+    assert '<a class="internal-link" href="Projects/plan.html#next-steps">the plan</a>' in index_page
+    assert '<span class="broken-link">missing</span>' in index_page
+    plan_page = (output / "Projects" / "plan.html").read_text(encoding="utf-8")
+    assert 'href="../index.html"' in plan_page
+    assert 'href="../style.css"' in plan_page
+
+    assert export_html(notes, output, jobs=1) == {"rendered": 0, "unchanged": 3, "removed": 0}
+
+    # Creating the missing note re-renders the page linking to it; removing
+    # a note removes its page
+    notes = [notes[0], notes[1], Note("missing.md", "# Found")]
+    assert export_html(notes, output, jobs=1) == {"rendered": 2, "unchanged": 1, "removed": 1}
+    assert 'href="missing.html"' in (output / "index.html").read_text(encoding="utf-8")
+    assert not (output / "other.html").exists()
+
+
+def test_forced_export_removes_pages_of_deleted_notes(real_tmp_path: Path) -> None:
+    """Test that --force renders every page and still removes the pages of deleted notes."""
+    output = real_tmp_path / "site"
+    notes = [Note("a.md", "# A"), Note("b.md", "# B")]
+    export_html(notes, output, jobs=1)
+    assert export_html(notes[:1], output, force=True, jobs=1) == {"rendered": 1, "unchanged": 0, "removed": 1}
+    assert not (output / "b.html").exists()
@@ -0,0 +1,53 @@
+"""Tests for the per-folder roll-up and the empty folder walk."""
+import re
+from pathlib import Path
+
+from pyobsidian.folders import find_empty_folders, find_orphans, folder_report
+
+
+def test_folder_report() -> None:
+    """Test that folders aggregate their subfolders and respect the depth."""
+    rows = folder_report(
+        paths=["a.md", "x/b.md", "x/y/c.md", "x-z/d.md"],
+        sizes=[10, 20, 30, 40],
+        words=[0, 100, 300, 1000],
+        links=[1, 2, 3, 4],
+        orphans=[True, False, True, False],
+        mtimes=[1.0, None, 5.0, 2.0],
+    )
+    by_folder = {row["folder"]: row for row in rows}
+
+    assert [row["folder"] for row in rows] == ["", "x", "x-z", "x/y"]
+    assert by_folder[""]["notes"] == 4
+    assert by_folder[""]["bytes"] == 100
+    assert by_folder["x"]["words"] == 400  # "x-z" is not under "x"
+    assert by_folder["x"]["orphans"] == 1
+    assert by_folder["x"]["modified"] == 5.0
+    assert by_folder["x"]["percentiles"][1] == 200
+    assert by_folder[""]["histogram"] == [1, 0, 1, 1, 0, 1, 0]
+
+    shallow = folder_report(["x/y/c.md"], [1], [1], [0], [False], [None], max_depth=1)
+    assert [row["folder"] for row in shallow] == ["", "x"]
+    assert shallow[0]["modified"] is None
+
+
+def test_find_empty_folders(real_tmp_path: Path) -> None:
+    """Test strict and recursive emptiness, exclusions and hidden folders."""
+    for folder in ("a", "b/c", "d/e", "f", ".hidden/x", "tmp/y"):
+        (real_tmp_path / folder).mkdir(parents=True)
+    (real_tmp_path / "d" / "note.md").write_text("x")
+    (real_tmp_path / "f" / ".DS_Store").write_text("")
+    excluded = [re.compile(r"(.*/)?tmp(/.*)?")]
+
+    assert find_empty_folders(real_tmp_path, excluded) == ["a", "b/c", "d/e"]
+    assert find_empty_folders(real_tmp_path, excluded, recursive=True) == ["a", "b", "d/e", "f"]
+
+
+def test_find_orphans_resolves_links() -> None:
+    """Test that links by bare name or full path count, and self-links do not."""
+    orphans = find_orphans({
+        "a/one.md": [],
+        "b/two.md": ["one"],
+        "three.md": ["b/two", "three", "missing"],
+    })
+    assert orphans == {"three.md"}
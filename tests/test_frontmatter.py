@@ -0,0 +1,41 @@
+"""Tests for the frontmatter helpers."""
+from pyobsidian.frontmatter import set_frontmatter_field, split_frontmatter
+
+
+def test_split_frontmatter() -> None:
+    """Test parsing notes with, without and with broken frontmatter."""
+    assert split_frontmatter("---\ntitle: A\ntags: [x]\n---\nBody\n") == (
+        {"title": "A", "tags": ["x"]},
+        "Body\n",
+    )
+    assert split_frontmatter("# Title\n---\n") == ({}, "# Title\n---\n")
+    assert split_frontmatter("---\n: [\n---\nBody") == ({}, "---\n: [\n---\nBody")
+
+
+def test_set_frontmatter_field() -> None:
+    """Test adding, replacing and removing a field."""
+    content = set_frontmatter_field("Body\n", "related", ["[[a]]"])
+    assert content == "---\nrelated:\n- '[[a]]'\n---\nBody\n"
+
+    content = set_frontmatter_field("---\ntitle: A\n---\nBody\n", "related", ["[[b]]"])
+    assert split_frontmatter(content) == ({"title": "A", "related": ["[[b]]"]}, "Body\n")
+
+    assert set_frontmatter_field(content, "related", None) == "---\ntitle: A\n---\nBody\n"
+    assert set_frontmatter_field("---\nrelated: []\n---\nBody\n", "related", None) == "Body\n"
+
+
+def test_set_frontmatter_field_keeps_other_lines() -> None:
+    """Test that only the lines of the field change, comments and flow lists included."""
+    content = (
+        "---\n# my comment\ntags: [a, b]\ntitle: \"Quoted\"\nrelated:\n- '[[old]]'\n  # nested\n"
+        "status: 'done'\n---\nBody\n"
+    )
+    updated = set_frontmatter_field(content, "related", ["[[new]]"])
+    assert updated == (
+        "---\n# my comment\ntags: [a, b]\ntitle: \"Quoted\"\nrelated:\n- '[[new]]'\n"
+        "status: 'done'\n---\nBody\n"
+    )
+    assert set_frontmatter_field(updated, "related", None) == (
+        "---\n# my comment\ntags: [a, b]\ntitle: \"Quoted\"\nstatus: 'done'\n---\nBody\n"
+    )
+    assert set_frontmatter_field("---\r\na: 1\r\n---\r\nBody", "b", 2) == "---\r\na: 1\r\nb: 2\r\n---\r\nBody"
@@ -0,0 +1,47 @@
+"""Tests for the content hash index."""
+import os
+from pathlib import Path
+
+from pyobsidian.hashindex import HashIndex, bytes_digest, file_digest
+
+
+def test_refresh_only_hashes_changed_files(real_tmp_path: Path) -> None:
+    """Test that files are rehashed only when their mtime or size changes."""
+    (real_tmp_path / "a.md").write_bytes(b"same")
+    (real_tmp_path / "b.png").write_bytes(b"same")
+    (real_tmp_path / "c.md").write_bytes(b"other")
+
+    index = HashIndex()
+    assert index.refresh(real_tmp_path, ["a.md", "b.png", "c.md", "missing.md"]) == 3
+    assert index.digest("a.md") == bytes_digest(b"same") == file_digest(real_tmp_path / "b.png")
+    assert index.digest("missing.md") is None
+    assert index.refresh(real_tmp_path, ["a.md", "b.png", "c.md"]) == 0
+
+    (real_tmp_path / "c.md").write_bytes(b"changed")
+    os.utime(real_tmp_path / "c.md", ns=(1, 1))
+    assert index.refresh(real_tmp_path, ["a.md", "c.md"]) == 1
+    assert set(index.entries) == {"a.md", "c.md"}
+
+
+def test_known_digests_are_trusted(real_tmp_path: Path) -> None:
+    """Test that digests computed elsewhere are used without reading the file."""
+    index = HashIndex()
+    assert index.refresh(real_tmp_path, ["note.md"], {"note.md": (1, 2, "abc")}) == 0
+    assert index.digest("note.md") == "abc"
+
+
+def test_duplicates_and_persistence(real_tmp_path: Path) -> None:
+    """Test grouping identical files and saving the index."""
+    index = HashIndex({
+        "b.md": (1, 1, "x"),
+        "a.md": (1, 1, "x"),
+        "img/c.png": (1, 1, "y"),
+        "d.png": (1, 1, "y"),
+        "e.md": (1, 1, "z"),
+    })
+    assert index.duplicates() == [["a.md", "b.md"], ["d.png", "img/c.png"]]
+
+    path = real_tmp_path / "hashes.json"
+    index.save(path)
+    assert HashIndex.load(path).entries == index.entries
+    assert HashIndex.load(real_tmp_path / "missing.json").entries == {}
@@ -0,0 +1,95 @@
+"""Tests for the word count history."""
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from pyobsidian import core
+from pyobsidian.history import WordCountHistory, record_history
+from tests.mock_obsidian import Note
+
+
+def _ts(day: int, hour: int = 12) -> float:
+    """Get a timestamp on a day of January 2024."""
+    return datetime(2024, 1, day, hour).timestamp()
+
+
+def test_daily_deltas(real_tmp_path: Path) -> None:
+    """Test that snapshots turn into per-day word and note deltas."""
+    path = real_tmp_path / "history.tsv"
+    history = WordCountHistory(path)
+    # The first snapshot is a baseline and counts as no writing
+    assert history.snapshot([Note("a.md", "one two three")], now=_ts(1)) == 1
+    assert history.daily_stats(_ts(1, 0)) == {}
+
+    notes = [Note("a.md", "one"), Note("b.md", "four five")]
+    assert history.snapshot(notes, now=_ts(2)) == 2
+    assert history.snapshot(notes, now=_ts(2, 13)) == 0  # nothing changed
+    assert history.snapshot([Note("b.md", "four five six")], now=_ts(3)) == 2
+
+    stats = WordCountHistory(path).daily_stats(_ts(1, 0))
+    assert stats["2024-01-02"] == {
+        "added": 2, "removed": 2, "created": 1, "modified": 1, "deleted": 0,
+    }
+    assert stats["2024-01-03"] == {
+        "added": 1, "removed": 1, "created": 0, "modified": 1, "deleted": 1,
+    }
+    assert list(WordCountHistory(path).daily_stats(_ts(3, 0))) == ["2024-01-03"]
+
+
+def test_times_and_digests_are_used() -> None:
+    """Test that records are stamped with modification times and keyed by digest."""
+    history = WordCountHistory()
+    history.snapshot([Note("a.md", "x")], digests={"a.md": "d1"}, now=_ts(1))
+    history.snapshot(
+        [Note("a.md", "x y")], digests={"a.md": "d1"}, now=_ts(5)
+    )  # same digest, not recounted
+    assert len(history.records) == 1
+
+    history.snapshot(
+        [Note("a.md", "x y")], digests={"a.md": "d2"}, times={"a.md": _ts(4)}, now=_ts(5)
+    )
+    assert [record[0] for record in history.between(_ts(2))] == [_ts(4)]
+
+
+def test_record_history_reads_only_changed_files(
+    real_tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that snapshots of a vault read only the files added or changed since the last one."""
+    for name in ("a", "b", "c"):
+        (real_tmp_path / f"{name}.md").write_text(f"{name} words", encoding="utf-8")
+    read = []
+    read_note = core.Vault.read_note
+    monkeypatch.setattr(core.Vault, "read_note", lambda self, path: read.append(path) or read_note(self, path))
+
+    vault = core.Vault(real_tmp_path)
+    first = dict(record_history(vault).latest)
+    assert len(first) == 3
+    assert sorted(read) == ["a.md", "b.md", "c.md"]
+    assert vault._notes is None
+
+    read.clear()
+    (real_tmp_path / "b.md").write_text("b has more words now", encoding="utf-8")
+    (real_tmp_path / "c.md").unlink()
+    (real_tmp_path / "d.md").write_text("d", encoding="utf-8")
+    history = record_history(core.Vault(real_tmp_path))
+    assert sorted(read) == ["b.md", "d.md"]
+    assert sorted(history.latest) == ["a.md", "b.md", "d.md"]
+    assert history.latest["a.md"] == first["a.md"]
+    assert history.latest["b.md"][0] > first["b.md"][0]
+
+    read.clear()
+    record_history(core.Vault(real_tmp_path))
+    assert read == []
+
+
+def test_loading_the_vault_records_a_snapshot(real_tmp_path: Path) -> None:
+    """Test that each load of the notes snapshots the edits made since the last one."""
+    (real_tmp_path / "a.md").write_text("alpha beta", encoding="utf-8")
+    core.Vault(real_tmp_path).get_all_notes()
+    (real_tmp_path / "a.md").write_text("alpha beta gamma", encoding="utf-8")
+    core.Vault(real_tmp_path).get_all_notes()
+    (real_tmp_path / "a.md").unlink()
+    records = record_history(core.Vault(real_tmp_path)).records
+    # The baseline, the edit between the two loads, then the deletion
+    assert [(before, after) for _, before, after, _, _ in records] == [(None, 2), (2, 3), (3, -1)]
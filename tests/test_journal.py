@@ -0,0 +1,61 @@
+"""Tests for the write-ahead journal of bulk edits."""
+from pathlib import Path
+
+from pyobsidian.journal import APPLIED, CONFLICT, PENDING, Journal, plan_entry
+
+
+def test_plan_records_contents_and_states(real_tmp_path: Path) -> None:
+    """Test that planned edits are judged applied, pending or conflicting from their files."""
+    (real_tmp_path / "a.md").write_text("a")
+    (real_tmp_path / "b.md").write_text("b")
+    (real_tmp_path / "c.md").write_text("c")
+    entries = [
+        plan_entry(real_tmp_path, "a.md", "a2"),
+        plan_entry(real_tmp_path, "b.md", None),
+        plan_entry(real_tmp_path, "c.md", "c2"),
+        plan_entry(real_tmp_path, "new.md", "new"),
+    ]
+    assert entries[1].original == "b" and entries[1].after is None
+    assert entries[3].before is None and entries[3].original is None
+
+    journal = Journal.begin(real_tmp_path / "journal", "edit", entries)
+    (real_tmp_path / "a.md").write_text("a2")
+    (real_tmp_path / "b.md").unlink()
+    (real_tmp_path / "c.md").write_text("changed elsewhere")
+
+    states = journal.states(real_tmp_path)
+    assert [entry.path for entry in states[APPLIED]] == ["a.md", "b.md"]
+    assert [entry.path for entry in states[PENDING]] == ["new.md"]
+    assert [entry.path for entry in states[CONFLICT]] == ["c.md"]
+
+
+def test_load_round_trip_and_torn_tail(real_tmp_path: Path) -> None:
+    """Test that a reloaded journal keeps its plan and applied edits, ignoring a torn line."""
+    path = real_tmp_path / "journal"
+    entries = [plan_entry(real_tmp_path, f"{name}.md", name) for name in "xyz"]
+    journal = Journal.begin(path, "rename", entries)
+    journal.mark_applied(["x.md", "y.md"])
+    with open(path, "a") as f:
+        f.write('{"applied": ["z.m')
+
+    loaded = Journal.load(path)
+    assert loaded.name == "rename"
+    assert loaded.complete
+    assert loaded.entries == entries
+    assert loaded.applied == ["x.md", "y.md"]
+
+    loaded.finish()
+    assert Journal.load(path) is None
+
+
+def test_incomplete_plan_is_all_pending(real_tmp_path: Path) -> None:
+    """Test that a journal cut off while planning reports every edit as pending."""
+    path = real_tmp_path / "journal"
+    (real_tmp_path / "a.md").write_text("a")
+    Journal.begin(path, "edit", [plan_entry(real_tmp_path, "a.md", "a")])
+    lines = path.read_text().splitlines(keepends=True)
+    path.write_text("".join(lines[:-1]))
+
+    loaded = Journal.load(path)
+    assert not loaded.complete
+    assert [entry.path for entry in loaded.states(real_tmp_path)[PENDING]] == ["a.md"]
@@ -0,0 +1,51 @@
+"""Tests for the metadata index and its aggregates."""
+from typing import List
+
+import pytest
+
+from pyobsidian.metadata import MetadataIndex
+from tests.mock_obsidian import Note
+
+
+@pytest.fixture
+def notes() -> List[Note]:
+    """Fixture providing notes in nested folders."""
+    return [
+        Note("a.md", "Alpha beta #one [[b]]"),
+        Note("x/b.md", "Gamma delta epsilon #one #two"),
+        Note("x/y/c.md", "Zeta [[a]] [[b]]"),
+    ]
+
+
+def _fresh(notes: List[Note]) -> MetadataIndex:
+    """Build an index by counting every note."""
+    index = MetadataIndex()
+    index.refresh(notes, {})
+    return index
+
+
+def test_aggregates(notes: List[Note]) -> None:
+    """Test that totals, tags and folder roll-ups add up."""
+    index = _fresh(notes)
+
+    assert index.totals == {
+        "notes": 3,
+        "words": sum(note.word_count for note in notes),
+        "links": 3,
+    }
+    assert index.tags == {"one": 2, "two": 1}
+    assert index.folders["x"][0] == 2  # subfolders roll up
+    assert index.folders["x/y"] == [1, notes[2].word_count, 2]
+
+
+def test_incremental_refresh(notes: List[Note]) -> None:
+    """Test that only changed notes are recounted and the sums stay exact."""
+    index = _fresh(notes)
+    assert index.refresh(notes, {}) == 0
+
+    edited = [Note("a.md", "Alpha #three"), notes[1]]
+    assert index.refresh(edited, {}) == 1
+
+    assert index.compare(_fresh(edited)) == []
+    assert "x/y" not in index.folders
+    assert index.tags == {"one": 1, "two": 1, "three": 1}
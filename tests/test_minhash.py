@@ -0,0 +1,95 @@
+"""Tests for MinHash near-duplicate detection."""
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+
+from pyobsidian.minhash import (
+    MinHasher,
+    SignatureCache,
+    cluster_pairs,
+    estimate_jaccard,
+    find_duplicates,
+    lsh_parameters,
+    shingle_hashes,
+)
+from tests.mock_obsidian import Note
+
+TEXT = (
+    "Obsidian stores every note as a plain markdown file inside the vault folder, "
+    "so notes can be edited with any text editor and synced with ordinary tools "
+    "while links between notes are written as double square brackets"
+)
+
+
+@pytest.fixture
+def notes() -> List[Note]:
+    """Fixture providing a note, two near copies and unrelated notes."""
+    return [
+        Note("original.md", TEXT),
+        Note("copy.md", TEXT.replace("ordinary", "common")),
+        Note("archive/copy2.md", TEXT + " and tags"),
+        Note("recipe.md", "Mix flour water salt and yeast then knead the dough for ten minutes"),
+        Note("empty.md", ""),
+        Note("blank.md", "   "),
+    ]
+
+
+def test_shingle_hashes_are_stable() -> None:
+    """Test that shingles ignore case and do not depend on Python's hash seed."""
+    hashes = shingle_hashes("One two three four five six", size=5)
+    assert len(hashes) == 2
+    assert np.array_equal(hashes, shingle_hashes("one TWO three four five six", size=5))
+    assert len(shingle_hashes("one two", size=5)) == 1
+    assert len(shingle_hashes("", size=5)) == 0
+
+
+def test_signature_estimates_jaccard() -> None:
+    """Test that signature agreement tracks the true Jaccard similarity."""
+    hasher = MinHasher(num_perm=256)
+    a = np.arange(1000, dtype=np.uint64)
+    b = np.arange(500, 1500, dtype=np.uint64)
+    estimate = estimate_jaccard(hasher.signature(a), hasher.signature(b))
+    assert abs(estimate - 1 / 3) < 0.1
+    assert estimate_jaccard(hasher.signature(a), hasher.signature(a)) == 1.0
+
+
+def test_lsh_parameters() -> None:
+    """Test that the banding threshold sits at or below the target."""
+    for threshold in (0.5, 0.8, 0.9):
+        bands, rows = lsh_parameters(128, threshold)
+        assert bands * rows == 128
+        assert (1 / bands) ** (1 / rows) <= threshold
+
+
+def test_cluster_pairs() -> None:
+    """Test that linked pairs are merged into connected clusters."""
+    assert cluster_pairs(6, [(0, 1), (4, 5), (1, 3)]) == [[0, 1, 3], [4, 5]]
+    assert cluster_pairs(3, []) == []
+
+
+def test_find_duplicates(notes: List[Note]) -> None:
+    """Test that near copies form one cluster and other notes are left out."""
+    clusters = find_duplicates(notes, threshold=0.6)
+
+    assert len(clusters) == 1
+    paths = [path for path, _ in clusters[0]]
+    assert paths == ["archive/copy2.md", "copy.md", "original.md"]
+    assert clusters[0][0][1] == 1.0
+    assert all(0.6 <= similarity <= 1.0 for _, similarity in clusters[0])
+
+
+def test_signature_cache(notes: List[Note], real_tmp_path: Path) -> None:
+    """Test that cached signatures are reused and stale parameters are ignored."""
+    path = real_tmp_path / "minhash.npz"
+    cache = SignatureCache(path, MinHasher(), 5)
+    signatures = cache.signatures(notes)
+    cache.save(keep=notes[:2])
+
+    reloaded = SignatureCache(path, MinHasher(), 5)
+    assert len(reloaded._signatures) == 2
+    assert np.array_equal(reloaded.signatures(notes[:2]), signatures[:2])
+    assert not reloaded._dirty
+
+    assert SignatureCache(path, MinHasher(), 3)._signatures == {}
@@ -0,0 +1,102 @@
+"""Tests for the PDF export, with WeasyPrint and pypdf replaced by stubs."""
+import importlib
+import sys
+import types
+from pathlib import Path
+from typing import Any, Iterator, List
+
+import pytest
+
+from tests.mock_obsidian import Note
+
+
+class StubHTML:
+    """Stands in for ``weasyprint.HTML``, writing the document itself as the PDF."""
+
+    documents: List[str] = []
+
+    def __init__(self, string: str, base_url: str = None) -> None:
+        self.string = string
+
+    def write_pdf(self, target: Any, stylesheets: Any = None, font_config: Any = None) -> None:
+        StubHTML.documents.append(self.string)
+        target.write(self.string.encode("utf-8"))
+
+
+class StubPdfWriter:
+    """Stands in for ``pypdf.PdfWriter``, concatenating the appended files."""
+
+    def __init__(self) -> None:
+        self.parts: List[bytes] = []
+
+    def append(self, path: str) -> None:
+        self.parts.append(Path(path).read_bytes())
+
+    def write(self, target: Any) -> None:
+        target.write(b"".join(self.parts))
+
+
+@pytest.fixture
+def pdf(monkeypatch: pytest.MonkeyPatch) -> Iterator[types.ModuleType]:
+    """Fixture providing the pdf module imported on top of the stubs."""
+    weasyprint = types.ModuleType("weasyprint")
+    weasyprint.HTML = StubHTML
+    weasyprint.CSS = lambda string, font_config=None: string
+    fonts = types.ModuleType("weasyprint.fonts")
+    fonts.FontConfiguration = object
+    pypdf = types.ModuleType("pypdf")
+    pypdf.PdfWriter = StubPdfWriter
+    for name, module in (("weasyprint", weasyprint), ("weasyprint.fonts", fonts), ("pypdf", pypdf)):
+        monkeypatch.setitem(sys.modules, name, module)
+    sys.modules.pop("pyobsidian.pdf", None)
+    StubHTML.documents = []
+    yield importlib.import_module("pyobsidian.pdf")
+    sys.modules.pop("pyobsidian.pdf", None)
+
+
+def test_per_note_pdfs_are_laid_out_only_when_changed(pdf: types.ModuleType, real_tmp_path: Path) -> None:
+    """Test that note PDFs link to each other and re-exports skip unchanged notes."""
+    output = real_tmp_path / "pdf"
+    notes = [Note("a.md", "# A\nSee [[b]]."), Note("b.md", "# B"), Note("c.md", "# C")]
+    counts = pdf.export_pdf(notes, real_tmp_path, output, jobs=1)
+    assert counts == {"notes": 3, "files": 3, "unchanged": 0, "removed": 0}
+    assert 'href="b.pdf"' in (output / "a.pdf").read_text(encoding="utf-8")
+
+    assert pdf.export_pdf(notes, real_tmp_path, output, jobs=1)["unchanged"] == 3
+    assert len(StubHTML.documents) == 3
+
+    notes = [Note("a.md", "# A\nSee [[b]] again."), notes[1]]
+    counts = pdf.export_pdf(notes, real_tmp_path, output, jobs=1)
+    assert counts == {"notes": 2, "files": 1, "unchanged": 1, "removed": 1}
+    assert not (output / "c.pdf").exists()
+
+
+def test_book_merges_parts_in_order(
+    pdf: types.ModuleType, real_tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a book concatenates its parts and is only laid out again when a note changes."""
+    monkeypatch.setattr(pdf, "BOOK_PART_NOTES", 2)
+    output = real_tmp_path / "pdf"
+    notes = [Note(f"{name}.md", f"# {name.upper()}\nSee [[a]].") for name in ("a", "b", "c")]
+    counts = pdf.export_pdf(notes, real_tmp_path, output, book=True, jobs=1)
+    assert counts["files"] == 1
+    assert len(StubHTML.documents) == 2
+    book = (output / pdf.BOOK_NAME).read_text(encoding="utf-8")
+    assert book.index('id="note-a"') < book.index('id="note-b"') < book.index('id="note-c"')
+    assert book.count("<!DOCTYPE html>") == 2
+    # Links to notes of another part are kept as text
+    assert 'href="#note-a"' in book and '<span class="broken-link">a</span>' in book
+    assert not list(output.glob(".book-*"))
+
+    assert pdf.export_pdf(notes, real_tmp_path, output, book=True, jobs=1)["files"] == 0
+    assert pdf.export_pdf(notes[::-1], real_tmp_path, output, book=True, jobs=1)["files"] == 1
+
+
+def test_forced_export_removes_pdfs_of_deleted_notes(pdf: types.ModuleType, real_tmp_path: Path) -> None:
+    """Test that forcing lays out every PDF and still removes those of deleted notes."""
+    output = real_tmp_path / "pdf"
+    notes = [Note("a.md", "# A"), Note("b.md", "# B")]
+    pdf.export_pdf(notes, real_tmp_path, output, jobs=1)
+    counts = pdf.export_pdf(notes[:1], real_tmp_path, output, jobs=1, force=True)
+    assert counts == {"notes": 1, "files": 1, "unchanged": 0, "removed": 1}
+    assert not (output / "b.pdf").exists()
@@ -0,0 +1,66 @@
+"""Tests for the static site publisher."""
+import json
+from pathlib import Path
+
+from pyobsidian.publish import MANIFEST_NAME, SITE_DIR, note_terms, publish_site, shard_key
+from tests.mock_obsidian import Note
+
+
+def _search(output: Path, word: str) -> set:
+    """Get the pages whose notes contain a word, from the search index."""
+    search = output / SITE_DIR / "search"
+    docs = json.loads((search / "docs.json").read_text(encoding="utf-8"))["docs"]
+    shard = search / f"{shard_key(word)}.json"
+    flat = json.loads(shard.read_text(encoding="utf-8")).get(word, []) if shard.exists() else []
+    doc_ids = [sum(flat[:i + 1:2]) for i in range(0, len(flat), 2)]
+    return {docs[doc_id][0] for doc_id in doc_ids}
+
+
+def test_note_terms_weigh_titles() -> None:
+    """Test that title words count more and stop words are left out."""
+    assert note_terms("Garden", "---\nkey: hidden\n---\nThe garden and a pond") == {"garden": 6, "pond": 1}
+
+
+def test_publish_backlinks_tags_and_search(real_tmp_path: Path) -> None:
+    """Test that pages list backlinks and tags, and rebuilds only touch what changed."""
+    output = real_tmp_path / "site"
+    notes = [
+        Note("index.md", "# Home\nSee [[plan]] about gardening. #garden"),
+        Note("plan.md", "# Plan\nDig a pond."),
+        Note("other.md", "# Other\nNothing."),
+    ]
+    counts = publish_site(notes, output, jobs=1)
+    assert counts == {"rendered": 3, "unchanged": 0, "removed": 0, "indexed": 3}
+    assert (output / MANIFEST_NAME).exists()
+
+    plan_page = (output / "plan.html").read_text(encoding="utf-8")
+    assert "<h2>Backlinks</h2>" in plan_page and 'href="index.html">Home</a>' in plan_page
+    assert 'href="_site/tags/garden.html"' in (output / "index.html").read_text(encoding="utf-8")
+    assert "../../index.html" in (output / SITE_DIR / "tags" / "garden.html").read_text(encoding="utf-8")
+    graph = json.loads((output / SITE_DIR / "graph.json").read_text(encoding="utf-8"))
+    assert graph["links"] == [{"source": "index.md", "target": "plan.md"}]
+    assert _search(output, "pond") == {"plan.html"}
+
+    assert publish_site(notes, output, jobs=1) == {"rendered": 0, "unchanged": 3, "removed": 0, "indexed": 0}
+
+    # Linking to a note from another re-renders both; removed notes leave
+    # the pages, tag pages and search index
+    notes = [Note("index.md", "# Home\nSee [[plan]]."), notes[1], Note("new.md", "# New\nA [[plan]] with a pond.")]
+    counts = publish_site(notes, output, jobs=1)
+    assert counts == {"rendered": 3, "unchanged": 0, "removed": 1, "indexed": 2}
+    assert 'href="new.html">New</a>' in (output / "plan.html").read_text(encoding="utf-8")
+    assert not (output / "other.html").exists()
+    assert not (output / SITE_DIR / "tags" / "garden.html").exists()
+    assert _search(output, "pond") == {"plan.html", "new.html"}
+    assert _search(output, "nothing") == set()
+
+
+def test_forced_publish_removes_pages_of_deleted_notes(real_tmp_path: Path) -> None:
+    """Test that forcing rebuilds every page and the index, and still removes deleted notes."""
+    output = real_tmp_path / "site"
+    notes = [Note("a.md", "# A\nA pond."), Note("b.md", "# B\nA pond too.")]
+    publish_site(notes, output, jobs=1)
+    counts = publish_site(notes[:1], output, force=True, jobs=1)
+    assert counts == {"rendered": 1, "unchanged": 0, "removed": 1, "indexed": 1}
+    assert not (output / "b.html").exists()
+    assert _search(output, "pond") == {"a.html"}
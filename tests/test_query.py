@@ -0,0 +1,52 @@
+"""Tests for the note query language."""
+from typing import List
+
+import pytest
+
+from pyobsidian.query import QueryError, select_notes
+from tests.mock_obsidian import Note
+
+
+@pytest.fixture
+def notes() -> List[Note]:
+    """Fixture providing notes with different tags, folders and content."""
+    return [
+        Note("projects/alpha.md", "# Alpha Plan\nShip the release. #project #active"),
+        Note("projects/beta.md", "# Beta\nParked for now. #project"),
+        Note("daily/2024-01-01.md", "Met with the team about [[alpha]]."),
+        Note("inbox.md", "Random thought about the release"),
+    ]
+
+
+def _paths(notes: List[Note]) -> List[str]:
+    """Return the paths of a list of notes."""
+    return [note.path for note in notes]
+
+
+def test_tag_and_negation(notes: List[Note]) -> None:
+    """Test selecting by tag and excluding by tag."""
+    assert _paths(select_notes(notes, "tag:project")) == ["projects/alpha.md", "projects/beta.md"]
+    assert _paths(select_notes(notes, "tag:#project -tag:active")) == ["projects/beta.md"]
+
+
+def test_path_prefix_and_glob(notes: List[Note]) -> None:
+    """Test selecting by path prefix and by glob."""
+    assert _paths(select_notes(notes, "path:daily/")) == ["daily/2024-01-01.md"]
+    assert _paths(select_notes(notes, "path:*/a*.md")) == ["projects/alpha.md"]
+
+
+def test_text_title_and_has(notes: List[Note]) -> None:
+    """Test content phrases, titles and structural filters."""
+    assert _paths(select_notes(notes, '"the release"')) == ["projects/alpha.md", "inbox.md"]
+    assert _paths(select_notes(notes, "title:plan")) == ["projects/alpha.md"]
+    assert _paths(select_notes(notes, "-has:tags has:links")) == ["daily/2024-01-01.md"]
+
+
+def test_invalid_queries(notes: List[Note]) -> None:
+    """Test that malformed queries raise QueryError."""
+    with pytest.raises(QueryError):
+        select_notes(notes, 'tag:')
+    with pytest.raises(QueryError):
+        select_notes(notes, 'has:everything')
+    with pytest.raises(QueryError):
+        select_notes(notes, '"unterminated')
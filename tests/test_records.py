@@ -0,0 +1,62 @@
+"""Tests for the streaming note record exporters."""
+import csv
+import io
+import json
+from typing import List
+
+import pytest
+
+from pyobsidian import records
+from pyobsidian.records import export_records, parse_fields
+from tests.mock_obsidian import Note
+
+
+@pytest.fixture
+def notes() -> List[Note]:
+    """Fixture providing notes with tags and links."""
+    return [
+        Note("a.md", "# Alpha\nSee [[b]] and [[c|C]]. #one #two"),
+        Note("b.md", "# Beta\nNo links here."),
+    ]
+
+
+def test_parse_fields() -> None:
+    """Test that field lists default to all fields and reject unknown names."""
+    assert parse_fields(None) == list(records.FIELDS)
+    assert parse_fields("path, tags") == ["path", "tags"]
+    with pytest.raises(ValueError, match="nope"):
+        parse_fields("path,nope")
+
+
+def test_json_formats_round_trip(notes: List[Note]) -> None:
+    """Test that NDJSON and the JSON array hold one record per note."""
+    out = io.StringIO()
+    assert export_records(notes, out, "ndjson", ["path", "links"]) == 2
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert lines[0] == {"path": "a.md", "links": [{"target": "b", "alias": None}, {"target": "c", "alias": "C"}]}
+
+    out = io.StringIO()
+    export_records(notes, out, "json", ["path", "title"])
+    assert json.loads(out.getvalue()) == {
+        "notes": [{"path": "a.md", "title": "Alpha"}, {"path": "b.md", "title": "Beta"}]
+    }
+    out = io.StringIO()
+    export_records([], out, "json", ["path"])
+    assert json.loads(out.getvalue()) == {"notes": []}
+
+
+def test_csv_flattens_lists(notes: List[Note]) -> None:
+    """Test that list fields become separated cells and links keep their targets."""
+    out = io.StringIO()
+    export_records(notes, out, "csv", ["path", "tags", "links"])
+    rows = list(csv.reader(io.StringIO(out.getvalue())))
+    assert rows == [["path", "tags", "links"], ["a.md", "one;two", "b;c"], ["b.md", "", ""]]
+
+
+def test_only_requested_fields_are_computed(notes: List[Note], monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that unrequested fields are never evaluated."""
+    def fail(note: Note) -> None:
+        raise AssertionError("word_count computed")
+
+    monkeypatch.setitem(records.FIELDS, "word_count", fail)
+    export_records(notes, io.StringIO(), "ndjson", ["path"])
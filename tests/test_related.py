@@ -0,0 +1,76 @@
+"""Tests for the all-pairs related notes job."""
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+
+from pyobsidian.related import _DENSE_FILE, dense_postings, related_notes
+from pyobsidian.tfidf import TfidfIndex
+from tests.mock_obsidian import Note
+
+
+@pytest.fixture
+def index() -> TfidfIndex:
+    """Fixture providing an index over notes on a few topics."""
+    notes: List[Note] = [
+        Note("python.md", "Generators and decorators make python code concise. #python"),
+        Note("decorators.md", "Decorators wrap python functions; generators yield values. #python"),
+        Note("asyncio.md", "Python coroutines and generators power asyncio event loops."),
+        Note("bread.md", "Flour, water, salt and yeast form a simple bread dough."),
+        Note("sourdough.md", "Sourdough bread rises with a wild yeast starter and flour."),
+        Note("empty.md", ""),
+    ]
+    return TfidfIndex.build(notes)
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 100])
+def test_related_matches_similar(index: TfidfIndex, block_size: int) -> None:
+    """Test that the blocked job agrees with per-note queries."""
+    related = related_notes(index, k=3, block_size=block_size)
+
+    assert set(related) == set(index.paths)
+    for path, pairs in related.items():
+        expected = index.similar(path, 3)
+        assert [p for p, _ in pairs] == [p for p, _ in expected]
+        assert np.allclose([s for _, s in pairs], [s for _, s in expected], atol=1e-6)
+    assert related["empty.md"] == []
+
+
+def test_related_with_dense_terms(index: TfidfIndex, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that routing terms through the dense product gives the same result."""
+    sparse = related_notes(index, k=3, min_similarity=0.05, block_size=2)
+
+    monkeypatch.setattr("pyobsidian.related.DENSE_MIN_DF", 1)
+    dense = related_notes(index, k=3, min_similarity=0.05, block_size=2)
+
+    assert dense.keys() == sparse.keys()
+    for path in sparse:
+        assert [p for p, _ in dense[path]] == [p for p, _ in sparse[path]]
+        assert all(s >= 0.05 for _, s in dense[path])
+
+
+def test_dense_postings(index: TfidfIndex) -> None:
+    """Test that the dense columns hold the postings of the chosen terms."""
+    terms = np.arange(len(index.terms))
+    dense = dense_postings(index, terms)
+
+    assert dense.shape == (len(index), len(terms))
+    assert np.allclose(dense.T, index.postings.to_dense())
+
+
+def test_related_in_worker_processes(
+    index: TfidfIndex, real_tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that blocks spread over worker processes agree with the serial job."""
+    monkeypatch.setattr("pyobsidian.related.DENSE_MIN_DF", 1)
+    index.save(real_tmp_path, "generation")
+    serial = related_notes(index, k=3, min_similarity=0.05, block_size=2)
+
+    pooled = related_notes(index, k=3, min_similarity=0.05, directory=real_tmp_path, jobs=2, block_size=2)
+
+    assert (real_tmp_path / _DENSE_FILE).exists()
+    assert pooled.keys() == serial.keys()
+    for path in serial:
+        assert [p for p, _ in pooled[path]] == [p for p, _ in serial[path]]
+        assert np.allclose([s for _, s in pooled[path]], [s for _, s in serial[path]])
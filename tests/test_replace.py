@@ -0,0 +1,57 @@
+"""Tests for vault-wide find and replace."""
+import re
+
+import pytest
+
+from pyobsidian import replace
+from pyobsidian.replace import find_replacements, required_literal, substitute, unified_diff
+from tests.mock_obsidian import Note
+
+
+def test_required_literal() -> None:
+    """Test that only literals every match needs are used to prefilter notes."""
+    assert required_literal(r"foo\d+barbaz") == "barbaz"
+    assert required_literal(r"(?i)Hello \w+") == "hello "
+    assert required_literal(r"cat|dog") is None
+    assert required_literal(r"\d+") is None
+
+
+def test_required_literal_without_private_parser(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a missing or changed regex parser disables the prefilter instead of failing."""
+    monkeypatch.setattr(replace, "sre_parse", None)
+    assert required_literal("foo") is None
+    monkeypatch.setattr(replace, "sre_parse", object())
+    assert required_literal("foo") is None
+
+
+def test_substitute_skips_protected_regions() -> None:
+    """Test that code and frontmatter are left alone when asked."""
+    content = "---\ntitle: foo\n---\nfoo `foo`\n```\nfoo\n```\nfoo"
+    regex = re.compile("foo")
+
+    assert substitute(content, regex, "bar") == (content.replace("foo", "bar"), 5)
+    new, count = substitute(content, regex, "bar", skip_code=True, skip_frontmatter=True)
+    assert new == "---\ntitle: foo\n---\nbar `foo`\n```\nfoo\n```\nbar"
+    assert count == 2
+
+
+def test_find_replacements_and_diff() -> None:
+    """Test that only notes that change are yielded, with group references expanded."""
+    notes = [
+        Note("a.md", "see w12 and w3"),
+        Note("b.md", "nothing here"),
+        Note("c.md", "`w7` only in code"),
+    ]
+    results = list(find_replacements(notes, r"\bw(\d+)", r"v\1", skip_code=True, jobs=1))
+    assert results == [("a.md", "see v12 and v3", 2)]
+
+    diff = unified_diff("a.md", notes[0].content, results[0][1])
+    assert "--- a/a.md" in diff
+    assert "-see w12 and w3" in diff
+    assert "+see v12 and v3" in diff
+
+
+def test_unified_diff_marks_missing_final_newline() -> None:
+    """Test that a last line without a newline does not run into the next one."""
+    diff = unified_diff("a.md", "one\ntwo", "one\nthree")
+    assert diff.endswith("-two\n\\ No newline at end of file\n+three\n\\ No newline at end of file\n")
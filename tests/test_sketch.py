@@ -0,0 +1,66 @@
+"""Tests for the Space-Saving heavy hitters sketch."""
+from collections import Counter
+from typing import List
+
+import numpy as np
+import pytest
+
+from pyobsidian.sketch import SpaceSaving
+
+
+@pytest.fixture
+def stream() -> List[str]:
+    """Fixture providing a Zipf-distributed stream of words."""
+    rng = np.random.default_rng(0)
+    return [f"w{rank}" for rank in rng.zipf(1.3, size=20000).tolist()]
+
+
+def test_exact_below_capacity() -> None:
+    """Test that counts are exact while every item fits."""
+    sketch = SpaceSaving.from_counts(10, [{"a": 3, "b": 1}, {"a": 2, "c": 4}])
+
+    assert sketch.top(3) == [("a", 5, 0), ("c", 4, 0), ("b", 1, 0)]
+    assert sketch.total == 10
+    assert sketch.floor == 0
+
+
+def test_error_bounds(stream: List[str]) -> None:
+    """Test that every count is within its error and N / capacity of the truth."""
+    capacity = 50
+    sketch = SpaceSaving(capacity)
+    for word in stream:
+        sketch.update(word)
+    truth = Counter(stream)
+
+    assert len(sketch) == capacity
+    assert sketch.max_error <= len(stream) / capacity
+    for word, count, error in sketch.top(capacity):
+        assert count - error <= truth[word] <= count
+    # Every item above N / capacity must be tracked
+    frequent = {word for word, count in truth.items() if count > len(stream) / capacity}
+    assert frequent <= {word for word, _, _ in sketch.top(capacity)}
+
+
+def test_merge(stream: List[str]) -> None:
+    """Test that merged summaries keep the guarantees of the whole stream."""
+    capacity = 50
+    half = len(stream) // 2
+    left = SpaceSaving.from_counts(capacity, [Counter(stream[:half])])
+    right = SpaceSaving.from_counts(capacity, [Counter(stream[half:])])
+    merged = left.merge(right)
+    truth = Counter(stream)
+
+    assert merged.total == len(stream)
+    assert len(merged) == capacity
+    for word, count, error in merged.top(capacity):
+        assert count - error <= truth[word] <= count
+    assert merged.top(1)[0][0] == truth.most_common(1)[0][0]
+
+
+def test_for_error() -> None:
+    """Test that the capacity follows from the error bound."""
+    assert SpaceSaving.for_error(0.01).capacity == 100
+    with pytest.raises(ValueError):
+        SpaceSaving.for_error(0)
+    with pytest.raises(ValueError):
+        SpaceSaving(0)
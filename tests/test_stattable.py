@@ -0,0 +1,28 @@
+"""Tests for the stat-only note table."""
+import os
+from pathlib import Path
+
+from pyobsidian.stattable import StatTable
+
+
+def test_scan(real_tmp_path: Path) -> None:
+    """Test that the walk records note stats and skips hidden folders."""
+    (real_tmp_path / "sub").mkdir()
+    (real_tmp_path / ".obsidian").mkdir()
+    (real_tmp_path / "a.md").write_text("a" * 10)
+    (real_tmp_path / "sub" / "b.md").write_text("b" * 30)
+    (real_tmp_path / "sub" / "image.png").write_bytes(b"png")
+    (real_tmp_path / ".obsidian" / "c.md").write_text("hidden")
+    os.link(real_tmp_path / "a.md", real_tmp_path / "sub" / "link.md")
+    os.utime(real_tmp_path / "a.md", ns=(0, 2_000_000_000))
+    os.utime(real_tmp_path / "sub" / "b.md", ns=(0, 1_000_000_000))
+
+    table = StatTable.scan(real_tmp_path)
+
+    assert sorted(table.paths) == ["a.md", "sub/b.md", "sub/link.md"]
+    assert [table.paths[i] for i in table.largest(1)] == ["sub/b.md"]
+    assert table.total_size() == 40  # the hard link counts once
+    assert sorted(table.paths[i] for i in table.in_folder("sub")) == ["sub/b.md", "sub/link.md"]
+    # Hard links share their mtime
+    assert sorted(table.paths[i] for i in table.newest(2)) == ["a.md", "sub/link.md"]
+    assert sorted(table.paths[i] for i in table.modified_since(1.5)) == ["a.md", "sub/link.md"]
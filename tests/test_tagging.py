@@ -0,0 +1,32 @@
+"""Tests for adding and removing inline tags."""
+from pyobsidian.tagging import insert_tag, strip_tag
+
+
+def test_insert_tag_skips_frontmatter_headings_and_code() -> None:
+    """Test that the tag lands on the first prose line and nothing else moves."""
+    content = "---\ntitle: A\n---\n# Title\n```\ncode\n```\nFirst line  \n    indented\n"
+    assert insert_tag(content, "reviewed") == (
+        "---\ntitle: A\n---\n# Title\n```\ncode\n```\nFirst line #reviewed  \n    indented\n"
+    )
+    assert insert_tag("---\na: 1\n---\n# Only a heading", "x") == "---\na: 1\n---\n# Only a heading\n#x\n"
+    assert insert_tag("Text #x here\n", "x") == "Text #x here\n"
+
+
+def test_strip_tag_removes_only_the_token() -> None:
+    """Test that removal keeps spacing, code, nested tags and the frontmatter."""
+    content = (
+        "---\ntags: '#x'\n---\nText #x and  two spaces  \n#x\n`#x` #x/sub #xy\n"
+        "    indented   code\nEnd #x\n"
+    )
+    assert strip_tag(content, "x") == (
+        "---\ntags: '#x'\n---\nText and  two spaces  \n`#x` #x/sub #xy\n"
+        "    indented   code\nEnd\n"
+    )
+    added = insert_tag("---\na: 1\n---\nBody\n", "x")
+    assert strip_tag(added, "x") == "---\na: 1\n---\nBody\n"
+
+
+def test_tags_match_in_any_case() -> None:
+    """Test that a tag is found whatever its case, as tag queries find it."""
+    assert insert_tag("Text #Project here\n", "project") == "Text #Project here\n"
+    assert strip_tag("Text #Project and #PROJECT\n", "project") == "Text and\n"
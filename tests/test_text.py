@@ -0,0 +1,15 @@
+"""Tests for the shared markdown text helpers."""
+from pyobsidian.text import code_spans, tokenize
+
+
+def test_code_spans() -> None:
+    """Test that fenced blocks, unclosed fences and inline code are found."""
+    content = "a `x` b\n```py\ncode\n```\nc\n~~~~\nopen"
+    spans = [content[start:end] for start, end in code_spans(content)]
+    assert spans == ["`x`", "```py\ncode\n```", "~~~~\nopen"]
+
+
+def test_tokenize_drops_code_links_and_tags() -> None:
+    """Test that only the prose words of a note are kept."""
+    content = "# Title\nGardens need `water` and [[Soil]] #plants, daily."
+    assert tokenize(content) == ["gardens", "need", "daily"]
@@ -0,0 +1,60 @@
+"""Tests for the TF-IDF index."""
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from pyobsidian.tfidf import TfidfIndex
+from tests.mock_obsidian import Note
+
+
+@pytest.fixture
+def notes() -> List[Note]:
+    """Fixture providing notes on two unrelated topics."""
+    return [
+        Note("python.md", "# Python\nGenerators and decorators make python code concise. #python"),
+        Note("decorators.md", "Decorators wrap python functions; generators yield values. #python"),
+        Note("asyncio.md", "Python coroutines and generators power asyncio event loops."),
+        Note("bread.md", "# Bread\nFlour, water, salt and yeast form a simple bread dough."),
+        Note("empty.md", ""),
+    ]
+
+
+def test_similar_ranks_related_notes(notes: List[Note]) -> None:
+    """Test that notes on the same topic rank above unrelated ones."""
+    index = TfidfIndex.build(notes)
+    results = index.similar("python.md", limit=10)
+    paths = [path for path, _ in results]
+
+    assert paths[0] == "decorators.md"
+    assert "asyncio.md" in paths
+    assert "bread.md" not in paths
+    assert "python.md" not in paths
+    assert all(0 < score <= 1 for _, score in results)
+    assert [score for _, score in results] == sorted((s for _, s in results), reverse=True)
+
+
+def test_similar_limit_and_threshold(notes: List[Note]) -> None:
+    """Test the result limit, the similarity threshold and unknown notes."""
+    index = TfidfIndex.build(notes)
+
+    assert len(index.similar("python.md", limit=1)) == 1
+    assert index.similar("python.md", min_similarity=1.0) == []
+    assert index.similar("empty.md") == []
+    assert index.similar("missing.md") == []
+
+
+def test_save_and_load(notes: List[Note], real_tmp_path: Path) -> None:
+    """Test that a saved index loads back only for the same generation."""
+    index = TfidfIndex.build(notes)
+    directory = real_tmp_path / "tfidf"
+    index.save(directory, "gen-1")
+
+    loaded = TfidfIndex.load(directory, "gen-1")
+    assert loaded is not None
+    assert loaded.paths == index.paths
+    assert loaded.terms == index.terms
+    assert loaded.similar("python.md") == index.similar("python.md")
+
+    assert TfidfIndex.load(directory, "gen-2") is None
+    assert TfidfIndex.load(real_tmp_path / "missing", "gen-1") is None
@@ -0,0 +1,51 @@
+"""Tests for the note timeline."""
+from datetime import date, datetime
+
+from pyobsidian.timeline import Timeline, note_dates
+
+
+def _ts(day: int) -> float:
+    """Get the timestamp of midnight on a day of January 2024."""
+    return datetime(2024, 1, day).timestamp()
+
+
+def test_note_dates_from_frontmatter() -> None:
+    """Test that created and updated dates are read from the frontmatter."""
+    content = "---\ncreated: 2024-01-02\nupdated: '2024-01-05T10:00'\n---\nBody"
+
+    mtime, _, created, updated = note_dates(content)
+
+    assert mtime is None
+    assert created == datetime.combine(date(2024, 1, 2), datetime.min.time()).timestamp()
+    assert updated == datetime(2024, 1, 5, 10).timestamp()
+    assert note_dates("No frontmatter")[2:] == (None, None)
+
+
+def test_range_queries() -> None:
+    """Test that range queries return notes in time order, end excluded."""
+    timeline = Timeline.from_dates({
+        "a.md": (_ts(1), None, None, None),
+        "b.md": (_ts(3), None, _ts(2), None),
+        "c.md": (_ts(5), None, None, None),
+        "d.md": (None, None, None, _ts(4)),  # no stats, frontmatter only
+    })
+
+    assert timeline.modified_between(_ts(2)) == [
+        (_ts(3), "b.md"), (_ts(4), "d.md"), (_ts(5), "c.md")
+    ]
+    assert timeline.modified_between(_ts(1), _ts(3)) == [(_ts(1), "a.md")]
+    assert timeline.created_between(_ts(1)) == [(_ts(2), "b.md")]
+
+
+def test_add_and_remove() -> None:
+    """Test that updating a note moves it on the timeline."""
+    timeline = Timeline()
+    timeline.add("a.md", (_ts(1), None, None, None))
+    timeline.add("b.md", (_ts(2), None, None, None))
+    timeline.add("a.md", (_ts(3), None, None, None))
+
+    assert timeline.modified_between(_ts(1)) == [(_ts(2), "b.md"), (_ts(3), "a.md")]
+    timeline.remove("b.md")
+    assert timeline.modified_between(_ts(1)) == [(_ts(3), "a.md")]
+    assert len(timeline) == 1
+    assert timeline.modified("b.md") is None
@@ -0,0 +1,124 @@
+"""Tests for the latent semantic topic model."""
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+
+from pyobsidian.sparse import CSRMatrix
+from pyobsidian.tfidf import TfidfIndex
+from pyobsidian.topics import TopicModel, load_topic_model, minibatch_kmeans, randomized_svd
+from tests.mock_obsidian import Note
+
+
+def _random_sparse(rng: np.random.Generator, shape: tuple, density: float) -> CSRMatrix:
+    """Build a random sparse matrix with the given density."""
+    dense = rng.random(shape) * (rng.random(shape) < density)
+    rows, cols = np.nonzero(dense)
+    return CSRMatrix.from_coo(rows, cols, dense[rows, cols], shape)
+
+
+@pytest.fixture
+def notes() -> List[Note]:
+    """Fixture providing notes on two topics, with some shared filler words."""
+    cooking = ["flour", "yeast", "dough", "oven", "bread", "knead", "salt"]
+    coding = ["python", "function", "class", "module", "import", "variable", "loop"]
+    filler = ["today", "notes", "idea"]
+    rng = np.random.default_rng(1)
+    notes = []
+    for i in range(30):
+        words = cooking if i % 2 else coding
+        content = " ".join(rng.choice(words, 12).tolist() + rng.choice(filler, 3).tolist())
+        notes.append(Note(f"{'cooking' if i % 2 else 'coding'}{i}.md", content))
+    return notes
+
+
+def test_matmat_matches_dense() -> None:
+    """Test the chunked sparse x dense product, including empty rows."""
+    rng = np.random.default_rng(0)
+    matrix = _random_sparse(rng, (40, 30), 0.2)
+    dense = rng.random((30, 5))
+    expected = matrix.to_dense() @ dense
+
+    assert np.allclose(matrix.matmat(dense), expected)
+    assert np.allclose(matrix.matmat(dense, chunk_nnz=3), expected)
+
+
+def test_randomized_svd_recovers_singular_values() -> None:
+    """Test that the leading singular values match an exact SVD."""
+    rng = np.random.default_rng(0)
+    # A rank-5 matrix plus sparse noise has a clear spectral gap
+    dense = rng.random((120, 5)) @ rng.random((5, 80))
+    dense += _random_sparse(rng, (120, 80), 0.05).to_dense() * 0.01
+    rows, cols = np.nonzero(dense)
+    matrix = CSRMatrix.from_coo(rows, cols, dense[rows, cols], dense.shape)
+    u, s, vt = randomized_svd(matrix, matrix.transpose(), 5)
+    exact = np.linalg.svd(dense, compute_uv=False)[:5]
+
+    assert u.shape == (120, 5) and vt.shape == (5, 80)
+    assert np.allclose(s, exact, rtol=1e-2)
+    assert np.allclose(u.T @ u, np.eye(5), atol=1e-4)
+
+
+def test_minibatch_kmeans_separates_blobs() -> None:
+    """Test that well-separated blobs end up in separate clusters."""
+    rng = np.random.default_rng(0)
+    points = np.concatenate([rng.normal(center, 0.1, (50, 2)) for center in (0, 5, 10)])
+    _, labels = minibatch_kmeans(points, 3, batch_size=32, n_iter=50)
+
+    for blob in range(3):
+        assert len(set(labels[blob * 50:(blob + 1) * 50].tolist())) == 1
+    assert len(set(labels.tolist())) == 3
+
+
+def test_topics_and_semantic_similarity(notes: List[Note], real_tmp_path: Path) -> None:
+    """Test topic clustering, dense similarity and the on-disk cache."""
+    model = TopicModel.build(TfidfIndex.build(notes), dims=4)
+    topics = model.topics(2, n_terms=3)
+
+    assert len(topics) == 2
+    for terms, paths in topics:
+        prefix = "cooking" if paths[0].startswith("cooking") else "coding"
+        assert all(path.startswith(prefix) for path in paths)
+        assert not {"today", "notes", "idea"} & set(terms)
+
+    similar = model.similar("coding0.md", limit=5)
+    assert len(similar) == 5
+    assert all(path.startswith("coding") for path, _ in similar)
+
+    model.save(real_tmp_path, "gen-1", dims=4)
+    loaded = TopicModel.load(real_tmp_path, "gen-1", dims=4)
+    assert loaded is not None
+    assert loaded.similar("coding0.md", limit=5) == similar
+    assert TopicModel.load(real_tmp_path, "gen-1", dims=8) is None
+    assert TopicModel.load(real_tmp_path, "gen-2") is None
+
+
+class _Vault:
+    """A vault of fixed notes, with a generation and a cache directory."""
+
+    def __init__(self, notes: List[Note], vault_path: Path) -> None:
+        """Initialize the vault."""
+        self.notes = notes
+        self.vault_path = vault_path
+        self.generation = "gen-1"
+
+    def get_all_notes(self) -> List[Note]:
+        """Get the notes."""
+        return self.notes
+
+
+def test_any_dimensions_reuse_the_cached_model(
+    notes: List[Note], real_tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a model loaded without required dimensions reuses the cache instead of replacing it."""
+    vault = _Vault(notes, real_tmp_path)
+    assert load_topic_model(vault, dims=4).embedding.shape[1] == 4
+
+    def build(*args: object) -> TopicModel:
+        """Fail, as nothing should be built."""
+        raise AssertionError("the cached model should be used")
+
+    monkeypatch.setattr(TopicModel, "build", build)
+    assert load_topic_model(vault, dims=None).embedding.shape[1] == 4
+    assert load_topic_model(vault, dims=4).embedding.shape[1] == 4
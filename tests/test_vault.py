@@ -0,0 +1,174 @@
+"""Tests for the batched, journaled note writes of the vault."""
+import os
+from pathlib import Path
+
+import pytest
+
+# The command tests replace pyobsidian.core with a mock module; the real
+# one, imported first, stays reachable as an attribute of the package
+from pyobsidian import core
+from pyobsidian.atomic import AtomicWriter
+from pyobsidian.journal import CONFLICT, PENDING
+
+
+@pytest.fixture
+def vault(real_tmp_path: Path) -> "core.Vault":
+    """Fixture providing a real vault of three notes on disk."""
+    for name in ("a", "b", "c"):
+        (real_tmp_path / f"{name}.md").write_text(f"# {name}\n", encoding="utf-8")
+    return core.Vault(real_tmp_path)
+
+
+def test_identical_update_is_elided(vault: "core.Vault") -> None:
+    """Test that writing a note's own content leaves the file and its mtime alone."""
+    path = vault.vault_path / "a.md"
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+    assert vault.update_note("a.md", "# a\n") is False
+    assert path.stat().st_mtime_ns == 1_000_000_000
+    assert vault.elided_writes == 1
+
+
+def test_changed_update_is_written(vault: "core.Vault") -> None:
+    """Test that new content is written, and that writing it again is then elided."""
+    assert vault.update_note("a.md", "# a\nnew\n") is True
+    assert (vault.vault_path / "a.md").read_text(encoding="utf-8") == "# a\nnew\n"
+    assert vault.update_note("a.md", "# a\nnew\n") is False
+
+
+def test_update_of_a_file_changed_behind_the_vault_is_written(vault: "core.Vault") -> None:
+    """Test that a file edited outside the vault is written even if the vault's copy matches."""
+    vault.get_all_notes()
+    (vault.vault_path / "a.md").write_text("# a\nelsewhere\n", encoding="utf-8")
+    assert vault.update_note("a.md", "# a\n") is True
+    assert (vault.vault_path / "a.md").read_text(encoding="utf-8") == "# a\n"
+
+
+def test_generation_is_kept_by_loading_with_an_undecodable_file(vault: "core.Vault") -> None:
+    """Test that a file that is not UTF-8 counts towards the generation before and after loading."""
+    (vault.vault_path / "latin1.md").write_bytes("caf\xe9\n".encode("latin-1"))
+    before = vault.generation
+
+    assert "latin1.md" not in vault.notes
+    assert vault.generation == before
+
+    (vault.vault_path / "latin1.md").write_bytes("caf\xe9 au lait\n".encode("latin-1"))
+    assert core.Vault(vault.vault_path).generation != before
+
+
+def test_iter_notes_does_not_load_the_vault(vault: "core.Vault") -> None:
+    """Test that iterating over the notes reads them without keeping them."""
+    assert sorted(note.path for note in vault.iter_notes()) == ["a.md", "b.md", "c.md"]
+    assert vault._notes is None
+    vault.get_all_notes()
+    assert [note.content for note in vault.iter_notes()] == [note.content for note in vault.get_all_notes()]
+
+
+def test_batch_coalesces_edits_of_a_note(vault: "core.Vault") -> None:
+    """Test that several edits of a note in a batch are written once."""
+    with vault.batch() as batch:
+        for i in range(3):
+            vault.update_note("a.md", f"# a\nedit {i}\n")
+        assert (vault.vault_path / "a.md").read_text(encoding="utf-8") == "# a\n"
+    assert (batch.edits, batch.written) == (3, 1)
+    assert (vault.vault_path / "a.md").read_text(encoding="utf-8") == "# a\nedit 2\n"
+
+
+def test_nested_batch_joins_the_outer_one(vault: "core.Vault") -> None:
+    """Test that an inner batch writes nothing until the outer one ends."""
+    with vault.batch() as outer:
+        with vault.batch() as inner:
+            vault.update_note("a.md", "# a\ninner\n")
+        assert inner is outer
+        assert (vault.vault_path / "a.md").read_text(encoding="utf-8") == "# a\n"
+        vault.update_note("b.md", "# b\nouter\n")
+    assert outer.written == 2
+    assert (vault.vault_path / "a.md").read_text(encoding="utf-8") == "# a\ninner\n"
+
+
+def test_raising_block_discards_edits(vault: "core.Vault") -> None:
+    """Test that nothing is written and memory is restored if the block raises."""
+    with pytest.raises(RuntimeError):
+        with vault.batch():
+            vault.update_note("a.md", "# a\nlost\n")
+            vault.delete_note("b.md")
+            raise RuntimeError("boom")
+    assert (vault.vault_path / "a.md").read_text(encoding="utf-8") == "# a\n"
+    assert vault.get_note("a.md").content == "# a\n"
+    assert vault.get_note("b.md").content == "# b\n"
+
+
+def test_failed_flush_restores_unwritten_notes(vault: "core.Vault", monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that notes whose write failed show their content on disk, not the edit."""
+    write = AtomicWriter.write
+
+    def failing_write(self: AtomicWriter, path: Path, content: str) -> None:
+        if Path(path).name == "b.md":
+            raise OSError("disk full")
+        write(self, path, content)
+
+    monkeypatch.setattr(AtomicWriter, "write", failing_write)
+    with pytest.raises(OSError):
+        with vault.batch(max_workers=1):
+            for name in ("a", "b", "c"):
+                vault.update_note(f"{name}.md", f"# {name}\nedited\n")
+
+    for name in ("a", "b", "c"):
+        on_disk = (vault.vault_path / f"{name}.md").read_text(encoding="utf-8")
+        assert vault.get_note(f"{name}.md").content == on_disk
+    assert vault.get_note("a.md").content == "# a\nedited\n"
+    assert vault.get_note("b.md").content == "# b\n"
+
+
+def _interrupted_edit(vault: "core.Vault", monkeypatch: pytest.MonkeyPatch) -> None:
+    """Edit four notes through a journal, one per group, crashing on the third."""
+    (vault.vault_path / "d.md").write_text("# d\n", encoding="utf-8")
+    write = AtomicWriter.write
+
+    def crashing_write(self: AtomicWriter, path: Path, content: str) -> None:
+        if Path(path).name == "c.md":
+            raise OSError("power cut")
+        write(self, path, content)
+
+    monkeypatch.setattr(vault, "JOURNAL_CHUNK", 1)
+    with monkeypatch.context() as patch:
+        patch.setattr(AtomicWriter, "write", crashing_write)
+        notes = [vault.get_note(f"{name}.md") for name in "abcd"]
+        for note in notes:
+            note.update_content(note.content + "edited\n")
+        with pytest.raises(OSError):
+            vault.save_notes(notes, max_workers=1, journal="edit")
+
+
+def _contents(vault: "core.Vault") -> dict:
+    """Read the notes from disk."""
+    return {name: (vault.vault_path / f"{name}.md").read_text(encoding="utf-8") for name in "abcd"}
+
+
+def test_interrupted_journal_is_resumed(vault: "core.Vault", monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that resuming writes the pending edits and leaves a file edited since alone."""
+    _interrupted_edit(vault, monkeypatch)
+    assert _contents(vault) == {"a": "# a\nedited\n", "b": "# b\nedited\n", "c": "# c\n", "d": "# d\n"}
+    (vault.vault_path / "d.md").write_text("# d\nby hand\n", encoding="utf-8")
+    states = vault.get_journal().states(vault.vault_path)
+    assert [entry.path for entry in states[PENDING]] == ["c.md"]
+    assert [entry.path for entry in states[CONFLICT]] == ["d.md"]
+
+    vault = core.Vault(vault.vault_path)
+    assert vault.resume_journal() == {"applied": 1, "done": 2, "elided": 0, "conflicts": 1}
+    assert _contents(vault) == {
+        "a": "# a\nedited\n", "b": "# b\nedited\n", "c": "# c\nedited\n", "d": "# d\nby hand\n",
+    }
+    assert vault.get_note("c.md").content == "# c\nedited\n"
+    assert vault.get_journal() is None
+
+
+def test_interrupted_journal_is_rolled_back(vault: "core.Vault", monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that rolling back restores the applied edits and leaves a file edited since alone."""
+    _interrupted_edit(vault, monkeypatch)
+    (vault.vault_path / "a.md").write_text("# a\nby hand\n", encoding="utf-8")
+
+    vault = core.Vault(vault.vault_path)
+    assert vault.rollback_journal() == {"reverted": 1, "pending": 2, "conflicts": 1}
+    assert _contents(vault) == {"a": "# a\nby hand\n", "b": "# b\n", "c": "# c\n", "d": "# d\n"}
+    assert vault.get_note("b.md").content == "# b\n"
+    assert vault.get_journal() is None
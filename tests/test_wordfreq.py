@@ -0,0 +1,70 @@
+"""Tests for the cached word frequency map-reduce."""
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from pyobsidian.wordfreq import WordCounts, approximate_word_counts, count_words
+from tests.mock_obsidian import Note
+
+
+@pytest.fixture
+def notes() -> List[Note]:
+    """Fixture providing a few notes with repeated words and tags."""
+    return [
+        Note("a.md", "# Garden\nTomatoes and basil grow in the garden. #garden"),
+        Note("b.md", "Basil pesto needs basil, garlic and pine nuts."),
+        Note("c.md", "Tomatoes ripen late. #garden #food"),
+    ]
+
+
+def test_count_words(notes: List[Note]) -> None:
+    """Test that words and tags of all notes are summed."""
+    counts = count_words(notes)
+
+    assert counts["basil"] == 3
+    assert counts["tomatoes"] == 2
+    assert counts["garden"] == 3  # once in prose, twice as a tag
+    assert counts["food"] == 1
+    assert "and" not in counts
+
+
+def test_cached_counts_are_reused(notes: List[Note], real_tmp_path: Path) -> None:
+    """Test that only new or edited notes are counted again."""
+    path = real_tmp_path / "wordcounts.npz"
+    cache = WordCounts.load(path)
+    expected = count_words(notes, cache)
+    cache.save(path)
+
+    reloaded = WordCounts.load(path)
+    assert len(reloaded.entries) == 3
+    assert count_words(notes, reloaded) == expected
+    assert not reloaded.dirty
+
+    notes[1].update_content("Only garlic now.")
+    counts = count_words(notes, reloaded)
+    assert reloaded.dirty
+    assert counts["basil"] == 1
+    assert counts["garlic"] == 1
+
+    reloaded.save(path)
+    assert len(WordCounts.load(path).entries) == 3
+
+
+def test_known_digests_key_the_cache(notes: List[Note]) -> None:
+    """Test that digests passed in, such as the vault's, are used as cache keys."""
+    digests = {note.path: f"{i:032x}" for i, note in enumerate(notes)}
+    cache = WordCounts()
+    counts = count_words(notes, cache, digests=digests)
+
+    assert set(cache.entries) == set(digests.values())
+    assert counts == count_words(notes)
+
+
+def test_approximate_counts_stream_notes(notes: List[Note]) -> None:
+    """Test that the sketch consumes a stream of notes and matches the exact counts."""
+    summary = approximate_word_counts(iter(notes), capacity=100, min_length=3)
+
+    exact = {word: count for word, count in count_words(notes).items() if len(word) >= 3}
+    assert summary.total == sum(exact.values())
+    assert {word: count for word, count, _ in summary.top(100)} == exact